@@ -0,0 +1,54 @@
+"""
+The `json_file_cache` module contains the `_POGGJSONFileCache` class, the on-disk storage shared by
+`POGGParseCache` and `POGGEvaluationCache`.
+"""
+import os
+import json
+import tempfile
+from pathlib import Path
+
+
+class _POGGJSONFileCache:
+    """
+    A `_POGGJSONFileCache` object stores one JSON file per key in a directory.
+    Subclasses decide what the keys are and what goes in the files.
+
+    Each file is written to a temporary file first and then moved into place, so other runs reading the cache
+    never see a partly written file.
+    """
+    def __init__(self, cache_dir):
+        """
+        Initialize the `_POGGJSONFileCache` object.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `cache_dir` | `str` or `Path` | directory the files are stored in; created if it doesn't exist |
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _get_path(self, key):
+        # spread the files over subdirectories so no single directory gets too large
+        return Path(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_json(self, key):
+        # returns None if there's no file for the key, or it can't be read, in which case it will be replaced
+        try:
+            with open(self._get_path(key), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_json(self, key, contents):
+        path = self._get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(contents, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,5 @@
+from pogg.ace_processing._ace_pool import POGGACEPool
+from pogg.ace_processing._ace_util import POGGACEUtil
+from pogg.ace_processing._parse_cache import POGGParseCache
+
+__all__ = ["POGGACEPool", "POGGACEUtil", "POGGParseCache"]
\ No newline at end of file
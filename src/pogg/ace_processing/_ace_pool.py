@@ -0,0 +1,190 @@
+"""
+The `ace_pool` module contains the `POGGACEPool` class, which keeps long-lived ACE processes open
+so that many inputs can be sent to the same grammar without paying the process startup and grammar loading cost each time.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from delphin import ace
+
+
+class POGGACEPool:
+    """
+    A `POGGACEPool` object holds one or more long-lived ACE processes (e.g. `ACEGenerator` or `ACEParser` objects)
+    for a single grammar and set of command line flags.
+    Processes are started on first use, restarted if they crash, and shut down when `close` is called.
+    """
+    def __init__(self, grammar_location, process_class=ace.ACEGenerator, cmdargs=None, pool_size=1):
+        """
+        Initialize the `POGGACEPool` object.
+
+        Each parameter may also be accessed as an instance attribute.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `grammar_location` | `str` | path to the compiled grammar image | -- |
+        | `process_class` | `type` | ACE process class from PyDelphin to start | `ace.ACEGenerator` |
+        | `cmdargs` | `list` of `str` | command line arguments passed to each ACE process | `None` |
+        | `pool_size` | `int` | maximum number of ACE processes kept open at once | `1` |
+        """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+
+        self.grammar_location = grammar_location
+        self.process_class = process_class
+        self.cmdargs = list(cmdargs) if cmdargs else []
+        self.pool_size = pool_size
+
+        # processes that are open and not currently in use
+        self._idle_processes = queue.LifoQueue()
+        # every open process, used when closing the pool
+        self._open_processes = []
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _start_process(self):
+        # ACEProcess appends to the list it's given, so give each process its own copy
+        return self.process_class(self.grammar_location, list(self.cmdargs))
+
+    def _acquire_process(self):
+        if self.closed:
+            raise RuntimeError("ACE pool has already been closed")
+
+        while True:
+            try:
+                return self._idle_processes.get_nowait()
+            except queue.Empty:
+                pass
+
+            # start a new process if the pool isn't full yet
+            with self._lock:
+                if len(self._open_processes) < self.pool_size:
+                    process = self._start_process()
+                    self._open_processes.append(process)
+                    return process
+
+            # otherwise wait for one to free up
+            # (with a timeout, since a crashed process frees up a slot instead of returning to the queue)
+            try:
+                return self._idle_processes.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _release_process(self, process):
+        self._idle_processes.put(process)
+
+    def _discard_process(self, process):
+        # close a broken process (if possible) and free up its slot in the pool
+        with self._lock:
+            if process in self._open_processes:
+                self._open_processes.remove(process)
+        try:
+            process.close()
+        except Exception:
+            pass
+
+    def interact(self, datum):
+        """
+        Send a single input (e.g. a SEMENT string or a sentence) to one of the pool's ACE processes and return the response.
+
+        If the process has crashed, it is restarted and the input is sent once more.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `datum` | `str` | input to send to ACE |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `Response` | PyDelphin response object for the input |
+        """
+        process = self._acquire_process()
+        try:
+            response = process.interact(datum)
+        except (ace.ACEProcessError, OSError, ValueError):
+            # the process crashed, so replace it and try once more
+            self._discard_process(process)
+            process = self._acquire_process()
+            try:
+                response = process.interact(datum)
+            except BaseException:
+                self._discard_process(process)
+                raise
+        except BaseException:
+            # e.g. interrupted mid-response, don't hand a process in an unknown state back to the pool
+            self._discard_process(process)
+            raise
+
+        self._release_process(process)
+        return response
+
+    def interact_batch(self, data):
+        """
+        Send several inputs to the pool's ACE processes, up to `pool_size` of them at once, and return the responses.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `data` | iterable of `str` | inputs to send to ACE |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | PyDelphin response object for each input, in the same order as the inputs |
+        """
+        data = list(data)
+        if self.pool_size == 1 or len(data) < 2:
+            return [self.interact(datum) for datum in data]
+
+        # each thread takes a process from the pool for each input, so at most pool_size inputs are sent at once
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(data))) as executor:
+            return list(executor.map(self.interact, data))
+
+    def _close_processes(self):
+        with self._lock:
+            processes = self._open_processes
+            self._open_processes = []
+
+        for process in processes:
+            try:
+                process.close()
+            except Exception:
+                pass
+
+        self._idle_processes = queue.LifoQueue()
+
+    def restart(self):
+        """
+        Close every ACE process in the pool, so fresh ones are started the next time an input is sent
+        (e.g. after the grammar image was recompiled). Shouldn't be called while inputs are being sent.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        if self.closed:
+            raise RuntimeError("ACE pool has already been closed")
+        self._close_processes()
+
+    def close(self):
+        """
+        Close every ACE process in the pool.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self.closed = True
+        self._close_processes()
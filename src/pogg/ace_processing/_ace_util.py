@@ -0,0 +1,44 @@
+"""
+The `ace_util` module contains the `POGGACEUtil` class, which has static helper functions for working with ACE grammars.
+"""
+import hashlib
+import os
+import threading
+
+
+class POGGACEUtil:
+    """Provides static functions for working with compiled ACE grammar images."""
+    # (path, size, modification time) -> fingerprint, so each grammar image is only read once per process
+    _fingerprints = {}
+    _fingerprint_lock = threading.Lock()
+
+    @staticmethod
+    def grammar_fingerprint(grammar_location):
+        """
+        Get a fingerprint of a compiled grammar image (or any other file) based on its contents.
+
+        The fingerprint is only recomputed if the file's size or modification time changes.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `grammar_location` | `str` | path to the compiled grammar image |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | SHA-256 hex digest of the file, or `None` if the file doesn't exist |
+        """
+        if grammar_location is None or not os.path.isfile(grammar_location):
+            return None
+
+        stat = os.stat(grammar_location)
+        key = (os.path.abspath(grammar_location), stat.st_size, stat.st_mtime_ns)
+        with POGGACEUtil._fingerprint_lock:
+            if key not in POGGACEUtil._fingerprints:
+                file_hash = hashlib.sha256()
+                with open(grammar_location, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        file_hash.update(chunk)
+                POGGACEUtil._fingerprints[key] = file_hash.hexdigest()
+            return POGGACEUtil._fingerprints[key]
@@ -0,0 +1,105 @@
+"""
+The `parse_cache` module contains the `POGGParseCache` class, which stores ACE parse results on disk
+so a string doesn't have to be parsed again with the same grammar and parser options.
+"""
+import json
+import hashlib
+import threading
+
+from pogg._json_file_cache import _POGGJSONFileCache
+
+
+class POGGParseCache(_POGGJSONFileCache):
+    """
+    A `POGGParseCache` object stores the MRS strings of the parses of each string in a directory,
+    one JSON file per string, named after a key that is a hash of the string, the grammar fingerprint,
+    and the parser options (see `make_key`).
+    Parses found during a session are also kept in memory, so repeated strings don't even read the file again.
+
+    The MRS strings are stored rather than MRS objects since they're plain text, and callers that change
+    the MRS objects (e.g. `POGGLexiconAutoFiller` replacing quantifiers) get their own objects each time.
+    """
+    def __init__(self, cache_dir):
+        """
+        Initialize the `POGGParseCache` object.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `cache_dir` | `str` or `Path` | directory the cached parses are stored in; created if it doesn't exist |
+        """
+        super().__init__(cache_dir)
+        # key -> MRS strings, for parses read or stored during this session
+        self._parses = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(to_parse, grammar_fingerprint, parser_options):
+        """
+        Make a cache key for a string parsed with a grammar and set of parser options.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `to_parse` | `str` | string that was parsed |
+        | `grammar_fingerprint` | `str` | fingerprint of the grammar image (see `POGGACEUtil.grammar_fingerprint`) |
+        | `parser_options` | `list` of `str` | command line arguments the parser was started with |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | SHA-256 hex digest of the information |
+        """
+        key_json = json.dumps([to_parse, grammar_fingerprint, list(parser_options)])
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Get the cached parses for a key, if there are any.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `key` | `str` | cache key (see `make_key`) |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | MRS strings of the parses (empty if the string had none), or `None` if the key isn't in the cache |
+        """
+        with self._lock:
+            if key in self._parses:
+                return self._parses[key]
+
+        cached_json = self._read_json(key)
+        if cached_json is None or "mrs_strings" not in cached_json:
+            # a file that can't be read is treated as missing and will be replaced
+            return None
+        mrs_strings = cached_json["mrs_strings"]
+
+        with self._lock:
+            self._parses[key] = mrs_strings
+        return mrs_strings
+
+    def put(self, key, mrs_strings):
+        """
+        Store the parses of a string in the cache.
+
+        Other runs reading the cache never see a partly written file (see `_POGGJSONFileCache`).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `key` | `str` | cache key (see `make_key`) |
+        | `mrs_strings` | `list` of `str` | MRS strings of the parses |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        mrs_strings = list(mrs_strings)
+        with self._lock:
+            self._parses[key] = mrs_strings
+
+        self._write_json(key, {"mrs_strings": mrs_strings})
@@ -1,4 +1,8 @@
 from pogg.data_handling._pogg_dataset import POGGDataset, POGGDataSplit
-from pogg.data_handling._graph_util import POGGGraphUtil
+from pogg.data_handling._graph_util import POGGGraphUtil, POGGGraphAnalysis
+from pogg.data_handling._graph_store import POGGGraphStore, POGGSplitGraphs
+from pogg.data_handling._pogg_graph import POGGGraph
+from pogg.data_handling._packed_dataset import POGGPackedSplit, POGGPackedGraphRef
 
-__all__ = ["POGGDataset", "POGGGraphUtil"]
\ No newline at end of file
+__all__ = ["POGGDataset", "POGGGraphUtil", "POGGGraphAnalysis", "POGGGraphStore", "POGGSplitGraphs", "POGGPackedSplit",
+           "POGGPackedGraphRef", "POGGGraph"]
\ No newline at end of file
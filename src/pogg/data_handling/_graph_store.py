@@ -0,0 +1,491 @@
+"""
+The `graph_store` module contains the `POGGGraphStore` class, which loads graph files on demand and keeps recently used
+graphs in memory, and the `POGGSplitGraphs` class, the mapping of graph names to graphs that a `POGGDataSplit` holds.
+"""
+import os
+import json
+import hashlib
+import time
+import weakref
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections.abc import MutableMapping
+
+import networkx as nx
+
+from pogg.data_handling._graph_util import POGGGraphUtil
+from pogg.data_handling._pogg_graph import POGGGraph
+from pogg.data_handling._packed_dataset import POGGPackedSplit, POGGPackedGraphRef
+
+
+class _POGGGraphInfo(dict):
+    # the graph information dict for one file; a subclass so it can be weakly referenced and keep its `json_digest`
+    __slots__ = ("__weakref__", "json_digest")
+
+
+def _parse_graph_file_contents(contents):
+    # module level so it can run in a worker process (see POGGGraphStore.load_graphs)
+    graph_json = json.loads(contents)
+    # hashed before build_graph adds to the JSON, though the hash doesn't change either way
+    return graph_json, POGGGraphUtil.hash_graph_json(graph_json)
+
+
+def _get_json_digest(graph_json):
+    # unlike the content hash, this depends on the order of the nodes and edges, which decides the order of the successors
+    return hashlib.sha256(json.dumps(graph_json).encode("utf-8")).hexdigest()
+
+
+def _fill_property_lexicon_keys(graph_json):
+    # build_graph adds each lexicon key to the node and edge properties in the JSON, this does the same without building
+    for node_name, node_info in graph_json["nodes"].items():
+        if "node_properties" in node_info:
+            node_info["node_properties"]["lexicon_key"] = node_info.get("lexicon_key", node_name)
+    for edge_info in graph_json["edges"]:
+        if "edge_properties" in edge_info:
+            edge_info["edge_properties"]["lexicon_key"] = edge_info.get("lexicon_key", edge_info["edge_name"])
+
+
+class POGGGraphStore:
+    """
+    A `POGGGraphStore` object loads graph files when they're first needed and keeps the most recently used ones in memory.
+
+    A `POGGDataset` shares one store between all its data splits, so a file that appears in several splits
+    is only loaded once while it's in memory.
+    Graphs are also looked up by content hash, so files with the same JSON (e.g. copies of a file in the directories of
+    a split and its sub-splits) share one graph object as long as it's in use. Each file keeps its own `graph_json`.
+    Since the graph object is shared, it's frozen (see `networkx.freeze`) so it can't be changed by accident.
+    With `compact_graphs`, graphs are built as `POGGGraph` objects instead, which take less memory and can't be changed at all.
+
+    Graphs in packed data split files (see `POGGPackedSplit`) are given as a `POGGPackedGraphRef` in place of a file path,
+    and each packed data split file is only opened once.
+    """
+    # number of graphs kept in memory if no other limit is given
+    default_max_cached_graphs = 10000
+
+    def __init__(self, max_cached_graphs=default_max_cached_graphs, compact_graphs=False):
+        """
+        Initialize the `POGGGraphStore` object.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `max_cached_graphs` | `int` | maximum number of graphs to keep in memory; `None` keeps every graph that's loaded | `10000` |
+        | `compact_graphs` | `bool` | whether to build graphs as `POGGGraph` objects instead of NetworkX `DiGraph` objects | `False` |
+        """
+        self.max_cached_graphs = max_cached_graphs
+        self.compact_graphs = compact_graphs
+        # file path -> graph information, least recently used first
+        self._graphs = OrderedDict()
+        # file path -> content hash, kept after the graph itself is dropped since it's small
+        self._graph_hashes = {}
+        # content hash -> graph information of a file with that graph, for as long as something holds on to it
+        self._graphs_by_hash = weakref.WeakValueDictionary()
+        # packed data split file path -> open POGGPackedSplit
+        self._packed_splits = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(graph_path):
+        if isinstance(graph_path, POGGPackedGraphRef):
+            return POGGPackedGraphRef(os.path.abspath(graph_path.pack_path), graph_path.graph_name)
+        return os.path.abspath(graph_path)
+
+    def get_packed_split(self, pack_path):
+        """
+        Get a packed data split file, opening it if it isn't open yet.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `pack_path` | `str` or `Path` | path of the packed data split file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGPackedSplit` | the opened packed data split file |
+        """
+        key = os.path.abspath(pack_path)
+        with self._lock:
+            packed_split = self._packed_splits.get(key)
+            if packed_split is None:
+                packed_split = POGGPackedSplit(key)
+                self._packed_splits[key] = packed_split
+        return packed_split
+
+    def _read_graph(self, graph_path):
+        if isinstance(graph_path, POGGPackedGraphRef):
+            packed_split = self.get_packed_split(graph_path.pack_path)
+            return packed_split.get_graph_json(graph_path.graph_name), packed_split.get_graph_hash(graph_path.graph_name)
+        return self._read_graph_file(graph_path)
+
+    @staticmethod
+    def load_graph(graph_path, compact_graph=False):
+        """
+        Read a graph file and build its graph, without looking in or adding to any store.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `graph_path` | `str` or `Path` | path of the graph's JSON file | -- |
+        | `compact_graph` | `bool` | whether to build a `POGGGraph` instead of a NetworkX `DiGraph` | `False` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | graph information (`graph_json`, `graph`, `graph_directory`, `gold_outputs`, and `graph_hash`) |
+        """
+        graph_json, graph_hash = POGGGraphStore._read_graph_file(graph_path)
+        return POGGGraphStore._build_graph_info(graph_path, graph_json, graph_hash, compact_graph)
+
+    @staticmethod
+    def _read_graph_file(graph_path):
+        return _parse_graph_file_contents(POGGGraphStore._read_graph_file_contents(graph_path))
+
+    @staticmethod
+    def _read_graph_file_contents(graph_path):
+        with open(graph_path, 'rb') as f:
+            return f.read()
+
+    @staticmethod
+    def _build_graph_info(graph_path, graph_json, graph_hash, compact_graph=False, json_digest=None):
+        if json_digest is None:
+            # taken before build_graph adds to the JSON
+            json_digest = _get_json_digest(graph_json)
+        if compact_graph:
+            graph = POGGGraph.from_json(graph_json)
+        else:
+            graph = nx.freeze(POGGGraphUtil.build_graph(graph_json))
+        graph_info = _POGGGraphInfo({
+            "graph_json": graph_json,
+            "graph": graph,
+            "graph_directory": str(graph_path),
+            "gold_outputs": graph_json["gold_outputs"],
+            # used to find the same graph in other data splits without comparing the JSON
+            "graph_hash": graph_hash,
+        })
+        graph_info.json_digest = json_digest
+        return graph_info
+
+    def _load_graph_info(self, graph_path):
+        graph_json, graph_hash = self._read_graph(graph_path)
+        return self._create_graph_info(graph_path, graph_json, graph_hash)
+
+    def _create_graph_info(self, graph_path, graph_json, graph_hash):
+        with self._lock:
+            shared_graph_info = self._graphs_by_hash.get(graph_hash)
+        json_digest = _get_json_digest(graph_json)
+        # the content hash ignores the order of the nodes and edges, so only share if the JSON itself is the same
+        if shared_graph_info is not None and shared_graph_info.json_digest == json_digest:
+            # same JSON as a file that's already loaded, so share its graph instead of building another copy
+            if not self.compact_graphs:
+                _fill_property_lexicon_keys(graph_json)
+            graph_info = _POGGGraphInfo(shared_graph_info)
+            graph_info.json_digest = json_digest
+            graph_info["graph_json"] = graph_json
+            graph_info["gold_outputs"] = graph_json["gold_outputs"]
+            graph_info["graph_directory"] = str(graph_path)
+            return graph_info
+
+        return self._build_graph_info(graph_path, graph_json, graph_hash, self.compact_graphs, json_digest)
+
+    def get_graph(self, graph_path):
+        """
+        Get the information for a graph file, loading it if it isn't in memory.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_path` | `str`, `Path`, or `POGGPackedGraphRef` | path of the graph's JSON file, or the graph in a packed data split file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | graph information (see `load_graph`) |
+        """
+        key = self._get_key(graph_path)
+        with self._lock:
+            graph_info = self._graphs.get(key)
+            if graph_info is not None:
+                self._graphs.move_to_end(key)
+                return graph_info
+
+        # load outside the lock so other graphs can be read in the meantime
+        graph_info = self._load_graph_info(graph_path)
+
+        with self._lock:
+            # another thread may have loaded it first, use theirs so there's only one copy
+            if key in self._graphs:
+                self._graphs.move_to_end(key)
+                return self._graphs[key]
+
+            self._add_graph_info(key, graph_info)
+        return graph_info
+
+    def _add_graph_info(self, key, graph_info):
+        # must be called while holding the lock
+        self._graphs[key] = graph_info
+        self._graph_hashes[key] = graph_info["graph_hash"]
+        self._graphs_by_hash.setdefault(graph_info["graph_hash"], graph_info)
+        if self.max_cached_graphs is not None:
+            while len(self._graphs) > self.max_cached_graphs:
+                self._graphs.popitem(last=False)
+
+    def load_graphs(self, graph_paths, workers=8, large_file_size=1024 * 1024):
+        """
+        Load many graph files into the store at once, instead of one at a time as they're accessed.
+
+        Files are read in a pool of threads, so waiting on slow (e.g. network) storage overlaps.
+        Files of at least `large_file_size` bytes are parsed in a pool of processes, the rest in the threads.
+        Graphs are added to the store in the order given, so the result is the same as loading them one by one.
+        Files that are already loaded are skipped, and at most `max_cached_graphs` files are loaded,
+        since loading more would only push the first ones back out.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `graph_paths` | iterable of `str` or `Path` | paths of the graphs' JSON files | -- |
+        | `workers` | `int` | number of threads (and processes, if any files are large) to load files with | `8` |
+        | `large_file_size` | `int` | size in bytes from which a file is parsed in a separate process | `1048576` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `int` | number of files loaded |
+        """
+        start_time = time.perf_counter()
+
+        paths_to_load = []
+        keys_to_load = set()
+        with self._lock:
+            for graph_path in graph_paths:
+                key = self._get_key(graph_path)
+                if key not in self._graphs and key not in keys_to_load:
+                    paths_to_load.append(graph_path)
+                    keys_to_load.add(key)
+        if self.max_cached_graphs is not None:
+            paths_to_load = paths_to_load[:self.max_cached_graphs]
+        if not paths_to_load:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=workers) as thread_pool:
+            # map keeps the order of the paths
+            file_contents = list(thread_pool.map(self._read_graph_file_contents, paths_to_load))
+
+            process_pool = None
+            if any(len(contents) >= large_file_size for contents in file_contents):
+                process_pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                parse_futures = []
+                for contents in file_contents:
+                    pool = process_pool if len(contents) >= large_file_size else thread_pool
+                    parse_futures.append(pool.submit(_parse_graph_file_contents, contents))
+                # drop each file's contents once it's been handed off
+                file_contents = None
+                parsed_graphs = [parse_future.result() for parse_future in parse_futures]
+            finally:
+                if process_pool is not None:
+                    process_pool.shutdown()
+
+        # graphs are built and added in the given order, so which files share a graph doesn't depend on timing
+        for graph_path, (graph_json, graph_hash) in zip(paths_to_load, parsed_graphs):
+            graph_info = self._create_graph_info(graph_path, graph_json, graph_hash)
+            with self._lock:
+                self._add_graph_info(self._get_key(graph_path), graph_info)
+
+        elapsed = time.perf_counter() - start_time
+        print(f"Loaded {len(paths_to_load)} graph files in {elapsed:.2f}s ({elapsed and len(paths_to_load) / elapsed:.1f} files/s)...")
+        return len(paths_to_load)
+
+    def get_graph_json(self, graph_path):
+        """
+        Get the JSON of a graph file without building its graph.
+
+        If the graph isn't in memory, the file is read but not kept, so going over every graph's JSON
+        (e.g. to collect lexicon keys) doesn't push the graphs that are in use out of memory.
+        The JSON should not be changed.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_path` | `str`, `Path`, or `POGGPackedGraphRef` | path of the graph's JSON file, or the graph in a packed data split file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | JSON of the graph |
+        """
+        key = self._get_key(graph_path)
+        with self._lock:
+            graph_info = self._graphs.get(key)
+        if graph_info is not None:
+            return graph_info["graph_json"]
+
+        graph_json, graph_hash = self._read_graph(graph_path)
+        with self._lock:
+            self._graph_hashes.setdefault(key, graph_hash)
+        return graph_json
+
+    def get_graph_hash(self, graph_path):
+        """
+        Get the content hash of a graph file (see `POGGGraphUtil.hash_graph_json`).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_path` | `str`, `Path`, or `POGGPackedGraphRef` | path of the graph's JSON file, or the graph in a packed data split file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | content hash of the graph |
+        """
+        if isinstance(graph_path, POGGPackedGraphRef):
+            # stored in the packed data split file's index
+            return self.get_packed_split(graph_path.pack_path).get_graph_hash(graph_path.graph_name)
+        key = self._get_key(graph_path)
+        with self._lock:
+            graph_hash = self._graph_hashes.get(key)
+        if graph_hash is None:
+            # stores the hash as well
+            self.get_graph_json(graph_path)
+            graph_hash = self._graph_hashes[key]
+        return graph_hash
+
+
+class POGGSplitGraphs(MutableMapping):
+    """
+    A `POGGSplitGraphs` object maps the graph names of a data split to graph information, like a `dict`.
+
+    Graphs added with `add_file` or `add_packed_graph` are only loaded from the `POGGGraphStore` when they're accessed.
+    Graphs can also be assigned directly (e.g. `graphs[graph_name] = graph_info`), in which case they're kept as given.
+    Iterating over the names doesn't load anything, and names stay in the order they were added.
+    `version` goes up every time a graph is added, replaced, or removed, so indexes built from the graphs can tell when they're out of date.
+    """
+    def __init__(self, graph_store):
+        """
+        Initialize an empty `POGGSplitGraphs` object.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_store` | `POGGGraphStore` | store that graph files are loaded from |
+        """
+        self.graph_store = graph_store
+        # graph name -> file path (str), graph in a packed data split file (POGGPackedGraphRef),
+        # or graph information (dict) for graphs assigned directly
+        self._entries = {}
+        # changes every time _entries does
+        self.version = 0
+
+    def add_file(self, graph_name, graph_path):
+        """
+        Add a graph that's loaded from its file when it's first accessed.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph in the data split |
+        | `graph_path` | `str` or `Path` | path of the graph's JSON file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self._entries[graph_name] = str(graph_path)
+        self.version += 1
+
+    def add_packed_graph(self, graph_name, pack_path, packed_graph_name):
+        """
+        Add a graph from a packed data split file (see `POGGPackedSplit`) that's loaded when it's first accessed.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph in the data split |
+        | `pack_path` | `str` or `Path` | path of the packed data split file |
+        | `packed_graph_name` | `str` | name of the graph in the packed data split file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self._entries[graph_name] = POGGPackedGraphRef(str(pack_path), packed_graph_name)
+        self.version += 1
+
+    def get_graph_paths(self):
+        """
+        Get the file paths of the graphs added with `add_file`.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | file paths, in the order the graphs were added |
+        """
+        return [entry for entry in self._entries.values() if isinstance(entry, str)]
+
+    def get_graph_json(self, graph_name):
+        """
+        Get the JSON of a graph without building the graph (see `POGGGraphStore.get_graph_json`).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | JSON of the graph |
+        """
+        entry = self._entries[graph_name]
+        if isinstance(entry, dict):
+            return entry["graph_json"]
+        return self.graph_store.get_graph_json(entry)
+
+    def get_graph_hash(self, graph_name):
+        """
+        Get the content hash of a graph without building the graph.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | content hash of the graph |
+        """
+        entry = self._entries[graph_name]
+        if isinstance(entry, dict):
+            if "graph_hash" not in entry:
+                entry["graph_hash"] = POGGGraphUtil.hash_graph_json(entry["graph_json"])
+            return entry["graph_hash"]
+        return self.graph_store.get_graph_hash(entry)
+
+    def __getitem__(self, graph_name):
+        entry = self._entries[graph_name]
+        if isinstance(entry, dict):
+            return entry
+        return self.graph_store.get_graph(entry)
+
+    def __setitem__(self, graph_name, graph_info):
+        self._entries[graph_name] = graph_info
+        self.version += 1
+
+    def __delitem__(self, graph_name):
+        del self._entries[graph_name]
+        self.version += 1
+
+    def __contains__(self, graph_name):
+        # checked without loading the graph
+        return graph_name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
@@ -6,9 +6,56 @@ prints graphs to various filetypes (`.dot`, `.png`, and `.svg`)
 """
 import json
 import copy
+import hashlib
 
 import networkx as nx
 
+from pogg.data_handling._pogg_graph import POGGGraph
+
+
+class POGGGraphAnalysis:
+    """
+    A `POGGGraphAnalysis` object stores structural information about a graph that is needed on every step of
+    graph-to-SEMENT conversion and inclusion checking, so it only has to be computed once per graph.
+    """
+    def __init__(self, graph):
+        """
+        Analyze a graph.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph` | NetworkX `DiGraph` or `POGGGraph` | graph to analyze |
+
+        Once the object is created, the instance attributes shown in the below table will be accessible.
+
+        **Instance Attributes**
+        | Attribute | Description |
+        | --------- | ----------- |
+        | `acyclic` | whether the graph has no cycles |
+        | `topological_order` | `list` of node names in topological order, or `None` if the graph has cycles |
+        | `root` | root of the graph as a tuple of name and properties (see `POGGGraphUtil.find_root`), or `None` |
+        | `root_error` | message explaining why the root couldn't be determined, if applicable |
+        """
+        if isinstance(graph, POGGGraph):
+            self.topological_order = graph.topological_sort()
+            self.acyclic = self.topological_order is not None
+        else:
+            self.acyclic = nx.is_directed_acyclic_graph(graph)
+            if self.acyclic:
+                self.topological_order = list(nx.topological_sort(graph))
+            else:
+                self.topological_order = None
+
+        self.root = None
+        self.root_error = None
+        try:
+            # hand over the order so the graph isn't sorted a second time
+            self.root = POGGGraphUtil.find_root(graph, self.topological_order)
+        except ValueError as err:
+            self.root_error = err.args[0]
+
+
 class POGGGraphUtil:
     """Provides static functions for building and writing graphs to files."""
     @staticmethod
@@ -111,7 +158,50 @@ class POGGGraphUtil:
         return graph
 
     @staticmethod
-    def find_root(graph):
+    def hash_graph_json(graph_json):
+        """
+        Get a hash of a graph's content in the POGG JSON format.
+
+        The hash doesn't depend on the order of the nodes, edges, gold outputs, or properties.
+        Lexicon keys are filled in the same way `build_graph` fills them in, so the hash is the same before and after
+        `build_graph` has been called on the JSON object (and for nodes or edges whose lexicon key is left out because it matches their name).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_json` | `JSON` | JSON object containing the graph data |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | SHA-256 hex digest of the graph's content |
+        """
+        canonical_json = {key: val for key, val in graph_json.items() if key not in ("nodes", "edges", "gold_outputs")}
+
+        canonical_json["nodes"] = {}
+        for node_name, node_info in graph_json["nodes"].items():
+            node = dict(node_info)
+            node["lexicon_key"] = node_info.get("lexicon_key", node_name)
+            node["node_properties"] = {key: val for key, val in node_info.get("node_properties", {}).items()
+                                       if key != "lexicon_key"}
+            canonical_json["nodes"][node_name] = node
+
+        edges = []
+        for edge_info in graph_json["edges"]:
+            edge = dict(edge_info)
+            edge["lexicon_key"] = edge_info.get("lexicon_key", edge_info["edge_name"])
+            edge["edge_properties"] = {key: val for key, val in edge_info.get("edge_properties", {}).items()
+                                       if key != "lexicon_key"}
+            edges.append(json.dumps(edge, sort_keys=True))
+        canonical_json["edges"] = sorted(edges)
+
+        if "gold_outputs" in graph_json:
+            canonical_json["gold_outputs"] = sorted(graph_json["gold_outputs"])
+
+        return hashlib.sha256(json.dumps(canonical_json, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def find_root(graph, topological_order=None):
         """
         Find the root of a given graph.
 
@@ -125,7 +215,8 @@ class POGGGraphUtil:
          **Parameters**
         | Parameter | Type | Description |
         | --------- | ---- | ----------- |
-        | `graph` | NetworkX `DiGraph` | Graph to find root for |
+        | `graph` | NetworkX `DiGraph` or `POGGGraph` | Graph to find root for |
+        | `topological_order` | `list` | node names of the graph in topological order, if they've already been sorted (see `POGGGraphAnalysis`); the graph is sorted here if not given |
 
         **Returns**
         | Type | Description |
@@ -143,11 +234,21 @@ class POGGGraphUtil:
             root_candidate = root_node_list[0]
 
         # ensure graph is weakly connected (i.e. when edge direction is ignored, there is a possible path between any two nodes)
-        if root_candidate is None and not nx.is_weakly_connected(graph):
+        if isinstance(graph, POGGGraph):
+            weakly_connected = root_candidate is not None or graph.is_weakly_connected()
+        else:
+            weakly_connected = root_candidate is not None or nx.is_weakly_connected(graph)
+        if not weakly_connected:
             raise ValueError("Graph is not weakly connected, can't determine root")
 
         # try topological sort (only works if there are no cycles)
-        if root_candidate is None:
+        if root_candidate is None and topological_order is not None:
+            root_candidate = topological_order[0]
+        elif root_candidate is None and isinstance(graph, POGGGraph):
+            root_node_list = graph.topological_sort()
+            if root_node_list is not None:
+                root_candidate = root_node_list[0]
+        elif root_candidate is None:
             try:
                 root_node_list = list(nx.topological_sort(graph))
 
@@ -209,7 +310,7 @@ class POGGGraphUtil:
         **Parameters**
         | Parameter | Type | Description |
         | --------- | ---- | ----------- |
-        | `graph` | NetworkX `DiGraph` | graph to be written to file |
+        | `graph` | NetworkX `DiGraph` or `POGGGraph` | graph to be written to file; a `POGGGraph` is converted to a `DiGraph` first |
         | `filepath` | `str` | path to the output file |
 
         **Returns**
@@ -217,6 +318,8 @@ class POGGGraphUtil:
         | ---- | ----------- |
         | `None` | -- |
         """
+        if isinstance(graph, POGGGraph):
+            graph = graph.to_networkx()
         nx.nx_pydot.write_dot(graph, filepath)
 
     @staticmethod
@@ -227,7 +330,7 @@ class POGGGraphUtil:
         **Parameters**
         | Parameter | Type | Description |
         | --------- | ---- | ----------- |
-        | `graph` | NetworkX `DiGraph` | graph to be written to file |
+        | `graph` | NetworkX `DiGraph` or `POGGGraph` | graph to be written to file; a `POGGGraph` is converted to a `DiGraph` first |
         | `filepath` | `str` | path to the output file |
 
         **Returns**
@@ -235,6 +338,8 @@ class POGGGraphUtil:
         | ---- | ----------- |
         | `None` | -- |
         """
+        if isinstance(graph, POGGGraph):
+            graph = graph.to_networkx()
         png_graph = nx.drawing.nx_pydot.to_pydot(graph)
         png_graph.write_png(filepath)
 
@@ -246,7 +351,7 @@ class POGGGraphUtil:
         **Parameters**
         | Parameter | Type | Description |
         | --------- | ---- | ----------- |
-        | `graph` | NetworkX `DiGraph` | graph to be written to file |
+        | `graph` | NetworkX `DiGraph` or `POGGGraph` | graph to be written to file; a `POGGGraph` is converted to a `DiGraph` first |
         | `filepath` | `str` | path to the output file |
 
         **Returns**
@@ -254,6 +359,8 @@ class POGGGraphUtil:
         | ---- | ----------- |
         | `None` | -- |
         """
+        if isinstance(graph, POGGGraph):
+            graph = graph.to_networkx()
         png_graph = nx.drawing.nx_pydot.to_pydot(graph)
         png_graph.write_svg(filepath)
 
@@ -0,0 +1,460 @@
+"""
+The `packed_dataset` module contains the `POGGPackedSplit` class, which reads and writes packed data split files.
+
+A packed data split file holds every graph of a data split (i.e. the contents of a directory of graph JSON files)
+in a single binary file, which is memory-mapped when it's read, instead of one small JSON file per graph.
+A packed data split file can be listed in a data split's `data_directories` in place of a directory.
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from collections import namedtuple
+
+
+class POGGPackedGraphRef(namedtuple("POGGPackedGraphRef", ["pack_path", "graph_name"])):
+    """
+    Reference to one graph in a packed data split file, used in place of a graph file path (see `POGGGraphStore`).
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.pack_path}::{self.graph_name}"
+
+
+class POGGPackedSplit:
+    """
+    A `POGGPackedSplit` object reads the graphs of a packed data split file.
+
+    The file is laid out as:
+    * a header with the file's format version and the positions of the other sections
+    * a string table holding each node name, edge name, lexicon key, property key and value, and gold output once
+    * an index with the name, content hash, and position of each graph, so any graph can be read without reading the others
+    * one block of 32-bit integers per graph, with string IDs for its nodes, edges, properties, and gold outputs,
+    the parent and child of each edge in the order they were given, and CSR-style adjacency (each node's outgoing edges)
+
+    The file is memory-mapped, so only the parts that are used are read from disk, and opening it is quick
+    no matter how many graphs it holds.
+    """
+    # file extension that marks a packed data split file in a data split's data_directories
+    file_extension = ".poggpack"
+    # first bytes of a packed data split file
+    _magic = b"POGGPACK"
+    _format_version = 1
+    # magic, format version, byte order, graph count, string count, string offsets position, string data position, index position
+    _header_struct = struct.Struct("<8sIIQQQQQ")
+    # string ID that stands for "not given"
+    _no_string = 0xFFFFFFFF
+    # graph block header: node count, nodes listed in "nodes", edge count, property count, gold output count, graph-level extra JSON
+    _block_header_size = 6
+    # property value types
+    _string_value = 0
+    _json_value = 1
+
+    def __init__(self, pack_path):
+        """
+        Open a packed data split file.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `pack_path` | `str` or `Path` | path of the packed data split file |
+        """
+        self.pack_path = str(pack_path)
+        with open(self.pack_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, format_version, byte_order, graph_count, string_count,
+         string_offsets_pos, string_data_pos, index_pos) = self._header_struct.unpack_from(self._mmap, 0)
+        if magic != self._magic:
+            raise ValueError(f"{self.pack_path} is not a packed data split file")
+        if format_version != self._format_version:
+            raise ValueError(f"{self.pack_path} has format version {format_version}, expected {self._format_version}")
+        if byte_order != self._get_byte_order():
+            raise ValueError(f"{self.pack_path} was written on a machine with a different byte order")
+
+        view = memoryview(self._mmap)
+        self._string_offsets = view[string_offsets_pos:string_offsets_pos + 8 * (string_count + 1)].cast("Q")
+        self._string_data_pos = string_data_pos
+        # string ID -> decoded string, so each string is only decoded (and kept) once
+        self._strings = {}
+
+        # graph name -> (block position, block length, hash string ID), in the order the graphs were written
+        index = view[index_pos:index_pos + 8 * 4 * graph_count].cast("Q")
+        self._index = {}
+        for i in range(0, len(index), 4):
+            name_id, block_pos, block_length, hash_id = index[i:i + 4]
+            self._index[self._get_string(name_id)] = (block_pos, block_length, hash_id)
+
+    @staticmethod
+    def _get_byte_order():
+        # arrays are written and read in the machine's byte order
+        return 0 if sys.byteorder == "little" else 1
+
+    @staticmethod
+    def is_packed_split(path):
+        """
+        Check whether a path is a packed data split file (by its extension).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `path` | `str` or `Path` | path from a data split's `data_directories` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `bool` | `True` if the path is a packed data split file |
+        """
+        return str(path).endswith(POGGPackedSplit.file_extension) and os.path.isfile(path)
+
+    def _get_string(self, string_id):
+        string = self._strings.get(string_id)
+        if string is None:
+            start = self._string_data_pos + self._string_offsets[string_id]
+            end = self._string_data_pos + self._string_offsets[string_id + 1]
+            string = self._mmap[start:end].decode("utf-8")
+            self._strings[string_id] = string
+        return string
+
+    def _get_optional_string(self, string_id):
+        return None if string_id == self._no_string else self._get_string(string_id)
+
+    def get_graph_names(self):
+        """
+        Get the names of the graphs in the packed data split file.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | graph names, in the order they were written |
+        """
+        return list(self._index)
+
+    def get_graph_hash(self, graph_name):
+        """
+        Get the content hash of a graph (see `POGGGraphUtil.hash_graph_json`), which is stored in the index,
+        so the graph itself isn't read.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph in the packed data split file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | content hash of the graph |
+        """
+        return self._get_string(self._index[graph_name][2])
+
+    def _get_graph_block(self, graph_name):
+        block_pos, block_length, hash_id = self._index[graph_name]
+        block = memoryview(self._mmap)[block_pos:block_pos + 4 * block_length].cast("I")
+
+        node_count, listed_node_count, edge_count, property_count, gold_count, extra_id = block[:self._block_header_size]
+        # position of each array in the block, in the order they're written (see _pack_graph)
+        sections = {}
+        pos = self._block_header_size
+        for section, length in (("node_names", node_count), ("node_lexicon_keys", node_count),
+                                ("node_extras", listed_node_count), ("node_property_ptr", listed_node_count + 1),
+                                ("edge_names", edge_count), ("edge_lexicon_keys", edge_count),
+                                ("edge_parents", edge_count), ("edge_children", edge_count),
+                                ("edge_extras", edge_count), ("edge_property_ptr", edge_count + 1),
+                                ("property_keys", property_count), ("property_values", property_count),
+                                ("property_types", property_count),
+                                ("adjacency_ptr", node_count + 1), ("adjacency_edges", edge_count),
+                                ("gold_outputs", gold_count)):
+            sections[section] = block[pos:pos + length]
+            pos += length
+        return block, sections, listed_node_count, extra_id
+
+    def _get_properties(self, sections, start, end):
+        properties = {}
+        for i in range(start, end):
+            value = self._get_string(sections["property_values"][i])
+            if sections["property_types"][i] == self._json_value:
+                value = json.loads(value)
+            properties[self._get_string(sections["property_keys"][i])] = value
+        return properties
+
+    def get_graph_json(self, graph_name):
+        """
+        Get a graph in the POGG JSON format (see `POGGGraphUtil.build_graph`).
+
+        Every node listed in `nodes` and every edge gets a `lexicon_key` and a properties dict, even if the original JSON left them out,
+        the same way `POGGGraphUtil.build_graph` fills them in, so the content hash is the same as the original's.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph in the packed data split file |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | JSON of the graph |
+        """
+        block, sections, listed_node_count, extra_id = self._get_graph_block(graph_name)
+
+        extra = self._get_optional_string(extra_id)
+        graph_json = json.loads(extra) if extra is not None else {}
+
+        nodes = {}
+        node_names = [self._get_string(name_id) for name_id in sections["node_names"]]
+        for i in range(listed_node_count):
+            extra = self._get_optional_string(sections["node_extras"][i])
+            node = json.loads(extra) if extra is not None else {}
+            node["lexicon_key"] = self._get_string(sections["node_lexicon_keys"][i])
+            node["node_properties"] = self._get_properties(sections, sections["node_property_ptr"][i],
+                                                           sections["node_property_ptr"][i + 1])
+            nodes[node_names[i]] = node
+        graph_json["nodes"] = nodes
+
+        edges = []
+        for i in range(len(sections["edge_names"])):
+            extra = self._get_optional_string(sections["edge_extras"][i])
+            edge = json.loads(extra) if extra is not None else {}
+            edge["edge_name"] = self._get_string(sections["edge_names"][i])
+            edge["parent_node"] = node_names[sections["edge_parents"][i]]
+            edge["child_node"] = node_names[sections["edge_children"][i]]
+            edge["lexicon_key"] = self._get_string(sections["edge_lexicon_keys"][i])
+            edge["edge_properties"] = self._get_properties(sections, sections["edge_property_ptr"][i],
+                                                           sections["edge_property_ptr"][i + 1])
+            edges.append(edge)
+        graph_json["edges"] = edges
+
+        # a graph without gold outputs has a gold output count of _no_string
+        if block[4] != self._no_string:
+            graph_json["gold_outputs"] = [self._get_string(string_id) for string_id in sections["gold_outputs"]]
+        return graph_json
+
+    def get_successors(self, graph_name, node_name):
+        """
+        Get the children of a node and the edges to them, using the adjacency section, without rebuilding the graph.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph in the packed data split file |
+        | `node_name` | `str` | name of the parent node |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | (child node name, edge name) tuples, in the order the edges were given |
+        """
+        block, sections, listed_node_count, extra_id = self._get_graph_block(graph_name)
+        node_names = [self._get_string(name_id) for name_id in sections["node_names"]]
+        node_index = node_names.index(node_name)
+        successors = []
+        for i in range(sections["adjacency_ptr"][node_index], sections["adjacency_ptr"][node_index + 1]):
+            edge_index = sections["adjacency_edges"][i]
+            successors.append((node_names[sections["edge_children"][edge_index]],
+                               self._get_string(sections["edge_names"][edge_index])))
+        return successors
+
+    def close(self):
+        """
+        Close the packed data split file. Graph JSON already read from it can still be used.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self._string_offsets.release()
+        self._mmap.close()
+
+    @staticmethod
+    def write(pack_path, graphs):
+        """
+        Write graphs to a packed data split file.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `pack_path` | `str` or `Path` | path of the packed data split file to write (should end in `.poggpack`) |
+        | `graphs` | iterable of (`str`, `dict`) | graph names and their JSON, in the order they should be read; names must be unique |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `int` | number of graphs written |
+        """
+        # imported here since POGGGraphUtil isn't needed to read a packed data split file
+        from pogg.data_handling._graph_util import POGGGraphUtil
+
+        string_ids = {}
+        strings = []
+
+        def intern(string):
+            string_id = string_ids.get(string)
+            if string_id is None:
+                string_id = len(strings)
+                string_ids[string] = string_id
+                strings.append(string)
+            return string_id
+
+        blocks = []
+        index = []
+        block_pos = 0
+        graph_names = set()
+        for graph_name, graph_json in graphs:
+            # graphs are looked up by name when the file is read, so a second graph with a name would be lost
+            if graph_name in graph_names:
+                raise ValueError(f"Graph name {graph_name} is used more than once")
+            graph_names.add(graph_name)
+            block = POGGPackedSplit._pack_graph(graph_json, intern)
+            index.append((intern(graph_name), block_pos, len(block),
+                          intern(POGGGraphUtil.hash_graph_json(graph_json))))
+            blocks.append(block)
+            block_pos += len(block) * 4
+
+        encoded_strings = [string.encode("utf-8") for string in strings]
+        string_offsets = array("Q", [0])
+        for encoded_string in encoded_strings:
+            string_offsets.append(string_offsets[-1] + len(encoded_string))
+        string_data = b"".join(encoded_strings)
+
+        # sections are 8-byte aligned so the arrays can be read straight from the memory map
+        string_offsets_pos = POGGPackedSplit._align(POGGPackedSplit._header_struct.size)
+        string_data_pos = string_offsets_pos + len(string_offsets) * 8
+        index_pos = POGGPackedSplit._align(string_data_pos + len(string_data))
+        blocks_pos = index_pos + len(index) * 4 * 8
+
+        with open(pack_path, "wb") as f:
+            f.write(POGGPackedSplit._header_struct.pack(POGGPackedSplit._magic, POGGPackedSplit._format_version,
+                                                        POGGPackedSplit._get_byte_order(), len(index), len(strings),
+                                                        string_offsets_pos, string_data_pos, index_pos))
+            f.write(b"\0" * (string_offsets_pos - f.tell()))
+            string_offsets.tofile(f)
+            f.write(string_data)
+            f.write(b"\0" * (index_pos - f.tell()))
+            array("Q", [val for (name_id, pos, length, hash_id) in index
+                        for val in (name_id, blocks_pos + pos, length, hash_id)]).tofile(f)
+            for block in blocks:
+                block.tofile(f)
+        return len(index)
+
+    @staticmethod
+    def _align(pos):
+        return (pos + 7) // 8 * 8
+
+    @staticmethod
+    def _pack_graph(graph_json, intern):
+        def intern_extra(info, known_keys):
+            # anything beyond the keys POGG uses is kept as a JSON string
+            extra = {key: val for key, val in info.items() if key not in known_keys}
+            return intern(json.dumps(extra)) if extra else POGGPackedSplit._no_string
+
+        property_keys = array("I")
+        property_values = array("I")
+        property_types = array("I")
+
+        def add_properties(properties, property_ptr):
+            for key, val in properties.items():
+                # build_graph adds the lexicon key to the properties, it's stored separately
+                if key == "lexicon_key":
+                    continue
+                property_keys.append(intern(key))
+                if isinstance(val, str):
+                    property_values.append(intern(val))
+                    property_types.append(POGGPackedSplit._string_value)
+                else:
+                    property_values.append(intern(json.dumps(val)))
+                    property_types.append(POGGPackedSplit._json_value)
+            property_ptr.append(len(property_keys))
+
+        # nodes listed in "nodes" come first, then nodes only named by edges, in the order build_graph would add them
+        node_indices = {}
+        node_names = array("I")
+        node_lexicon_keys = array("I")
+        node_extras = array("I")
+        node_property_ptr = array("I", [0])
+        for node_name, node_info in graph_json["nodes"].items():
+            node_indices[node_name] = len(node_names)
+            node_names.append(intern(node_name))
+            node_lexicon_keys.append(intern(node_info.get("lexicon_key", node_name)))
+            node_extras.append(intern_extra(node_info, ("lexicon_key", "node_properties")))
+            add_properties(node_info.get("node_properties", {}), node_property_ptr)
+        listed_node_count = len(node_names)
+
+        edge_names = array("I")
+        edge_lexicon_keys = array("I")
+        edge_parents = array("I")
+        edge_children = array("I")
+        edge_extras = array("I")
+        edge_property_ptr = array("I", [len(property_keys)])
+        for edge_info in graph_json["edges"]:
+            for node_name in (edge_info["parent_node"], edge_info["child_node"]):
+                if node_name not in node_indices:
+                    node_indices[node_name] = len(node_names)
+                    node_names.append(intern(node_name))
+                    node_lexicon_keys.append(intern(node_name))
+            edge_names.append(intern(edge_info["edge_name"]))
+            edge_lexicon_keys.append(intern(edge_info.get("lexicon_key", edge_info["edge_name"])))
+            edge_parents.append(node_indices[edge_info["parent_node"]])
+            edge_children.append(node_indices[edge_info["child_node"]])
+            edge_extras.append(intern_extra(edge_info, ("edge_name", "parent_node", "child_node",
+                                                        "lexicon_key", "edge_properties")))
+            add_properties(edge_info.get("edge_properties", {}), edge_property_ptr)
+
+        # CSR-style adjacency: the edges of node i are adjacency_edges[adjacency_ptr[i]:adjacency_ptr[i + 1]],
+        # kept in the order they were given since conversion follows that order
+        node_edges = [[] for _ in range(len(node_names))]
+        for edge_index, parent_index in enumerate(edge_parents):
+            node_edges[parent_index].append(edge_index)
+        adjacency_ptr = array("I", [0])
+        adjacency_edges = array("I")
+        for edges in node_edges:
+            adjacency_edges.extend(edges)
+            adjacency_ptr.append(len(adjacency_edges))
+
+        if "gold_outputs" in graph_json:
+            gold_outputs = array("I", [intern(gold_output) for gold_output in graph_json["gold_outputs"]])
+            gold_count = len(gold_outputs)
+        else:
+            gold_outputs = array("I")
+            gold_count = POGGPackedSplit._no_string
+
+        block = array("I", [len(node_names), listed_node_count, len(edge_names), len(property_keys), gold_count,
+                            intern_extra(graph_json, ("nodes", "edges", "gold_outputs"))])
+        for section in (node_names, node_lexicon_keys, node_extras, node_property_ptr,
+                        edge_names, edge_lexicon_keys, edge_parents, edge_children, edge_extras, edge_property_ptr,
+                        property_keys, property_values, property_types, adjacency_ptr, adjacency_edges, gold_outputs):
+            block.extend(section)
+        return block
+
+    @staticmethod
+    def pack_directory(graph_json_dir, pack_path):
+        """
+        Write the graph JSON files in a directory to a packed data split file.
+
+        Graphs are named after their files (without the `.json` extension) and written in the order the directory lists them,
+        so a data split reading the packed file names and orders its graphs the same way as one reading the directory.
+        The whole file name is kept, so files like `a.json` and `a.v2.json` don't get the same name.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_json_dir` | `str` or `Path` | directory of graph JSON files |
+        | `pack_path` | `str` or `Path` | path of the packed data split file to write (should end in `.poggpack`) |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `int` | number of graphs written |
+        """
+        def read_graphs():
+            # same files as POGGDataSplit._build_graphs
+            for dir_elem in os.scandir(graph_json_dir):
+                if dir_elem.is_file() and dir_elem.name.endswith(".json"):
+                    with open(dir_elem.path, "r") as f:
+                        yield dir_elem.name[:-len(".json")], json.load(f)
+
+        graph_count = POGGPackedSplit.write(pack_path, read_graphs())
+        print(f"Packed {graph_count} graphs from {graph_json_dir} into {pack_path}...")
+        return graph_count
@@ -12,18 +12,28 @@ import copy
 from typing import List, Dict, overload
 from pathlib import Path
 from pogg.data_handling._graph_util import POGGGraphUtil
+from pogg.data_handling._graph_store import POGGGraphStore, POGGSplitGraphs, _get_json_digest
+from pogg.data_handling._packed_dataset import POGGPackedSplit
 
 
 class POGGDataSplit:
-    def __init__(self, full_data_split_name: str, data_directories: List[Path | str], leaf:bool=False):
+    def __init__(self, full_data_split_name: str, data_directories: List[Path | str], leaf:bool=False,
+                 graph_store: POGGGraphStore=None):
         self.full_data_split_name = full_data_split_name
         self.leaf = leaf
-        self.graphs = {}
-        self.node_keys = None
-        self.edge_keys = None
-        # store original names here (i.e. not lexicon keys)
-        # used when checking if parent/child nodes of edges have already been added, even if the name != lexicon key
-        self.original_element_names = None
+        # graphs are only loaded from their files when they're accessed
+        # splits of the same dataset share a graph store, so graphs in several splits are only loaded once
+        if graph_store is None:
+            graph_store = POGGGraphStore()
+        self.graphs = POGGSplitGraphs(graph_store)
+        # node keys, edge keys, and original element names, collected the first time one of them is needed
+        self._element_keys = None
+        # graph hash -> graph names (see get_graph_names_by_hash)
+        self._graph_hash_index = None
+        self._graph_hash_index_version = None
+        # lexicon key -> names of the graphs that use it (see get_graphs_using_lexicon_keys)
+        self._lexicon_key_index = None
+        self._lexicon_key_index_version = None
 
         # sometimes a DataSplit is created without data_directories provided
         # specifically when creating an on-the-fly split with a set operation
@@ -31,32 +41,185 @@ class POGGDataSplit:
             for data_dir in data_directories:
                 self._build_graphs(data_dir)
 
-        self._set_node_and_edge_keys()
+    @property
+    def node_keys(self):
+        """`set` of lexicon keys of the nodes in this data split"""
+        if self._element_keys is None:
+            self._set_node_and_edge_keys()
+        return self._element_keys[0]
+
+    @property
+    def edge_keys(self):
+        """`set` of lexicon keys of the edges in this data split"""
+        if self._element_keys is None:
+            self._set_node_and_edge_keys()
+        return self._element_keys[1]
+
+    @property
+    def original_element_names(self):
+        """
+        `set` of the original names of the nodes and edges in this data split (i.e. not lexicon keys).
+
+        Used when checking if parent/child nodes of edges have already been added, even if the name != lexicon key.
+        """
+        if self._element_keys is None:
+            self._set_node_and_edge_keys()
+        return self._element_keys[2]
+
+    def get_graph_names_by_hash(self, graph_hash):
+        """
+        Get the names of the graphs in this data split with the given content hash (see `POGGGraphUtil.hash_graph_json`).
+
+        The content hash doesn't depend on the order of the nodes and edges, so graphs with the same hash can still be
+        converted differently; use `get_graph_json_digest` to tell them apart.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_hash` | `str` | content hash of the graph |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | names of the graphs with the given hash, in the order they're stored (empty if there aren't any) |
+        """
+        # built on first use, and again if graphs were added, replaced, or removed since
+        if self._graph_hash_index is None or self._graph_hash_index_version != self.graphs.version:
+            self._graph_hash_index = {}
+            for graph_name in self.graphs:
+                self._graph_hash_index.setdefault(self.graphs.get_graph_hash(graph_name), []).append(graph_name)
+            self._graph_hash_index_version = self.graphs.version
+        return self._graph_hash_index.get(graph_hash, [])
+
+    def get_graphs_using_lexicon_keys(self, lexicon_keys):
+        """
+        Get the names of the graphs in this data split that use any of the given lexicon keys for a node or edge.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `lexicon_keys` | iterable of `str` | node and/or edge lexicon keys |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | names of the graphs that use at least one of the keys, in data split order |
+        """
+        # built on first use, and again if graphs were added, replaced, or removed since
+        if self._lexicon_key_index is None or self._lexicon_key_index_version != self.graphs.version:
+            self._lexicon_key_index = {}
+            for graph_name in self.graphs:
+                for lexicon_key in self._get_graph_lexicon_keys(self.graphs.get_graph_json(graph_name)):
+                    self._lexicon_key_index.setdefault(lexicon_key, set()).add(graph_name)
+            self._lexicon_key_index_version = self.graphs.version
+
+        graph_names = set()
+        for lexicon_key in lexicon_keys:
+            graph_names.update(self._lexicon_key_index.get(lexicon_key, ()))
+        return [graph_name for graph_name in self.graphs if graph_name in graph_names]
+
+    @staticmethod
+    def _get_graph_lexicon_keys(graph_json):
+        # same keys as _set_node_and_edge_keys, for a single graph
+        lexicon_keys = set()
+        for node_name, node_info in graph_json["nodes"].items():
+            lexicon_keys.add(node_info.get("lexicon_key", node_name))
+        for edge_info in graph_json["edges"]:
+            lexicon_keys.add(edge_info.get("lexicon_key", edge_info["edge_name"]))
+            # parent and child nodes that aren't listed in "nodes" use their name as their key
+            for node_name in (edge_info["parent_node"], edge_info["child_node"]):
+                if node_name not in graph_json["nodes"]:
+                    lexicon_keys.add(node_name)
+        return lexicon_keys
+
+    @staticmethod
+    def get_graph_hash(graph_dict):
+        """
+        Get the content hash of a graph in a data split, computing and storing it if the graph doesn't have one yet.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_dict` | `dict` | graph information from a data split's `graphs` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | content hash of the graph |
+        """
+        if "graph_hash" not in graph_dict:
+            graph_dict["graph_hash"] = POGGGraphUtil.hash_graph_json(graph_dict["graph_json"])
+        return graph_dict["graph_hash"]
+
+    @staticmethod
+    def get_graph_json_digest(graph_dict):
+        """
+        Get a digest of the JSON of a graph in a data split, computing and storing it if the graph doesn't have one yet.
+
+        Unlike the content hash (see `get_graph_hash`), the digest depends on the order of the nodes and edges,
+        which decides the order the graph is converted in, so graphs with the same digest get the same SEMENTs.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_dict` | `dict` | graph information from a data split's `graphs` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | digest of the graph's JSON |
+        """
+        # graphs from a graph store keep the digest taken when the file was read
+        json_digest = getattr(graph_dict, "json_digest", None)
+        if json_digest is not None:
+            return json_digest
+        # otherwise it's taken from the JSON as it is now, which build_graph may have added lexicon keys to,
+        # so at worst the same graph gets a different digest here and a match is missed
+        if "json_digest" not in graph_dict:
+            graph_dict["json_digest"] = _get_json_digest(graph_dict["graph_json"])
+        return graph_dict["json_digest"]
+
+    def load_graphs(self, workers=8):
+        """
+        Load every graph in this data split now, reading and parsing the files in parallel (see `POGGGraphStore.load_graphs`),
+        instead of one at a time as they're accessed.
+        Graphs from packed data split files aren't included, since they're already quick to load from the memory map.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `workers` | `int` | number of threads (and processes, for large files) to load files with | `8` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `int` | number of files loaded |
+        """
+        return self.graphs.graph_store.load_graphs(self.graphs.get_graph_paths(), workers)
 
     def _build_graphs(self, graph_json_dir):
+        # only list the files here, each graph is loaded the first time it's accessed (see POGGGraphStore)
         graph_counter = len(self.graphs.keys())
+        if POGGPackedSplit.is_packed_split(graph_json_dir):
+            # graphs in a packed data split file are named after the files they were packed from (see POGGPackedSplit.pack_directory)
+            for packed_graph_name in self.graphs.graph_store.get_packed_split(graph_json_dir).get_graph_names():
+                graph_name = f"{self.full_data_split_name}_{packed_graph_name.split('.')[0]}_{graph_counter}"
+                graph_counter += 1
+                self.graphs.add_packed_graph(graph_name, graph_json_dir, packed_graph_name)
+            return
+
         for dir_elem in os.scandir(graph_json_dir):
             if dir_elem.is_file() and dir_elem.name.endswith(".json"):
                 graph_name = f"{self.full_data_split_name}_{dir_elem.name.split('.')[0]}_{graph_counter}"
                 graph_counter += 1
-
-                with open(dir_elem.path, 'r') as f:
-                    graph_json = json.load(f)
-
-                graph = POGGGraphUtil.build_graph(graph_json)
-                self.graphs[graph_name] = {
-                    "graph_json": graph_json,
-                    "graph": graph,
-                    "graph_directory": dir_elem.path,
-                    "gold_outputs": graph_json["gold_outputs"],
-                }
+                self.graphs.add_file(graph_name, dir_elem.path)
 
     def _set_node_and_edge_keys(self):
         nodes = set()
         edges = set()
         original_element_names = set()
-        for graph_name, graph in self.graphs.items():
-            graph_json = graph["graph_json"]
+        for graph_name in self.graphs:
+            graph_json = self.graphs.get_graph_json(graph_name)
             for node_name, node_info in graph_json["nodes"].items():
                 original_element_names.add(node_name)
                 if "lexicon_key" in node_info:
@@ -78,9 +241,7 @@ class POGGDataSplit:
                 if not edge_info["child_node"] in original_element_names:
                     nodes.add(edge_info["child_node"])
 
-        self.node_keys = nodes
-        self.edge_keys = edges
-        self.original_element_names = original_element_names
+        self._element_keys = (nodes, edges, original_element_names)
 
 
 class POGGDataset:
@@ -126,27 +287,84 @@ class POGGDataset:
         """
 
         self.data_splits = {}
-        # will be updated during POGGDataSplit object creation
-        self.node_keys = set()
-        self.edge_keys = set()
-        self.original_element_names = set()
+        # every split object, for collecting the overall node and edge keys
+        self._data_split_objects = []
+        # overall node keys, edge keys, and original element names, collected the first time one of them is needed
+        self._element_keys = None
+        # shared by all splits, so graphs that are in several splits are only loaded once
+        # "compact_graphs" builds each graph as a POGGGraph instead of a NetworkX DiGraph, to hold more graphs in memory
+        self.graph_store = POGGGraphStore(config_json.get("max_cached_graphs", POGGGraphStore.default_max_cached_graphs),
+                                          config_json.get("compact_graphs", False))
         self._create_data_split_objects(config_json["splits"], self.data_splits)
 
+        # load every graph up front in parallel, rather than one at a time as they're accessed
+        if config_json.get("graph_loader_workers"):
+            self.load_graphs(config_json["graph_loader_workers"])
+
+    def load_graphs(self, workers=8):
+        """
+        Load the graphs of every data split now, reading and parsing the files in parallel (see `POGGGraphStore.load_graphs`).
+        Files listed in several data splits are only loaded once.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `workers` | `int` | number of threads (and processes, for large files) to load files with | `8` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `int` | number of files loaded |
+        """
+        graph_paths = []
+        for split_object in self._data_split_objects:
+            graph_paths.extend(split_object.graphs.get_graph_paths())
+        return self.graph_store.load_graphs(graph_paths, workers)
+
+    @property
+    def node_keys(self):
+        """`set` of lexicon keys of the nodes in every data split"""
+        if self._element_keys is None:
+            self._set_node_and_edge_keys()
+        return self._element_keys[0]
+
+    @property
+    def edge_keys(self):
+        """`set` of lexicon keys of the edges in every data split"""
+        if self._element_keys is None:
+            self._set_node_and_edge_keys()
+        return self._element_keys[1]
+
+    @property
+    def original_element_names(self):
+        """`set` of the original names of the nodes and edges in every data split"""
+        if self._element_keys is None:
+            self._set_node_and_edge_keys()
+        return self._element_keys[2]
+
+    def _set_node_and_edge_keys(self):
+        nodes = set()
+        edges = set()
+        original_element_names = set()
+        for split_object in self._data_split_objects:
+            nodes.update(split_object.node_keys)
+            edges.update(split_object.edge_keys)
+            original_element_names.update(split_object.original_element_names)
+        self._element_keys = (nodes, edges, original_element_names)
+
 
 
     def _create_data_split_objects(self, current_config_split, current_data_split_dict):
         for split_name, split_value in current_config_split.items():
             # "split_value" includes three sub dictionaries: experiments, split_info, and splits
             split_info = split_value["split_info"]
-            split_object = POGGDataSplit(split_info["full_data_split_name"], split_info["data_directories"], split_info["leaf"])
+            split_object = POGGDataSplit(split_info["full_data_split_name"], split_info["data_directories"], split_info["leaf"],
+                                         self.graph_store)
             current_data_split_dict[split_name] = {
                 "data_split_object": split_object,
                 "splits": {}
             }
-            # update overall nodes and edges
-            self.node_keys.update(split_object.node_keys)
-            self.edge_keys.update(split_object.edge_keys)
-            self.original_element_names.update(split_object.original_element_names)
+            self._data_split_objects.append(split_object)
 
             if "splits" in split_value:
                 self._create_data_split_objects(split_value["splits"], current_data_split_dict[split_name]["splits"])
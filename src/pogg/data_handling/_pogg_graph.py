@@ -0,0 +1,341 @@
+"""
+The `pogg_graph` module contains the `POGGGraph` class, a compact, read-only graph that can be used in place of
+a NetworkX `DiGraph` for graph-to-SEMENT conversion and evaluation.
+"""
+import sys
+from array import array
+
+import networkx as nx
+
+
+class _POGGNodeView:
+    # the part of the NetworkX node view API that POGG uses: graph.nodes(data=True), graph.nodes[name], name in graph.nodes
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, data=False):
+        if data:
+            return list(zip(self._graph._node_names, self._graph._node_data))
+        return self
+
+    def __getitem__(self, node_name):
+        return self._graph._node_data[self._graph._node_indices[node_name]]
+
+    def __contains__(self, node_name):
+        return node_name in self._graph._node_indices
+
+    def __iter__(self):
+        return iter(self._graph._node_names)
+
+    def __len__(self):
+        return len(self._graph._node_names)
+
+
+class _POGGEdgeView:
+    # the part of the NetworkX edge view API that POGG uses: graph.edges(data=True), len(graph.edges())
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, data=False):
+        if data:
+            return [(parent, child, edge_data) for parent, child, edge_data in self._graph._iter_edges()]
+        return self
+
+    def __iter__(self):
+        return ((parent, child) for parent, child, edge_data in self._graph._iter_edges())
+
+    def __len__(self):
+        return len(self._graph._edge_data)
+
+
+class POGGGraph:
+    """
+    A `POGGGraph` object holds a directed graph in a few flat lists and arrays instead of the nested dicts of a NetworkX `DiGraph`.
+
+    It has the parts of the NetworkX `DiGraph` API that POGG uses to convert and evaluate graphs
+    (`nodes`, `edges`, `successors`, `get_edge_data`, and `in_degree`), and keeps the same node, edge, and successor order
+    a `DiGraph` built by `POGGGraphUtil.build_graph` would have, so conversion gives the same result with either.
+    Node and edge data are the same dicts a `DiGraph` would have, with their keys and string values interned so graphs share them.
+
+    A `POGGGraph` can't be changed once it's built. Use `to_networkx` to get a NetworkX `DiGraph` (e.g. for writing `.dot` or `.png` files).
+    """
+    __slots__ = ("_node_names", "_node_indices", "_node_data", "_edge_parents", "_edge_children", "_edge_data",
+                 "_successor_ptr", "_successor_edges")
+
+    def __init__(self, node_names, node_data, edges):
+        """
+        Initialize the `POGGGraph` object. Usually created with `from_json` or `from_networkx` instead.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `node_names` | `list` of `str` | node names, in order |
+        | `node_data` | `list` of `dict` | data of each node in `node_names` |
+        | `edges` | `list` of (`str`, `str`, `dict`) | parent name, child name, and data of each edge, in order; if the same parent and child appear again, the data is merged into the first edge, as NetworkX does |
+        """
+        self._node_names = [self._intern(node_name) for node_name in node_names]
+        self._node_indices = {node_name: i for i, node_name in enumerate(self._node_names)}
+        self._node_data = [self._intern_data(data) for data in node_data]
+
+        self._edge_parents = array("I")
+        self._edge_children = array("I")
+        self._edge_data = []
+        # (parent index, child index) -> edge index, only needed while building
+        edge_indices = {}
+        for parent, child, data in edges:
+            parent_index = self._node_indices[parent]
+            child_index = self._node_indices[child]
+            edge_index = edge_indices.get((parent_index, child_index))
+            if edge_index is not None:
+                self._edge_data[edge_index].update(self._intern_data(data))
+                continue
+            edge_indices[(parent_index, child_index)] = len(self._edge_data)
+            self._edge_parents.append(parent_index)
+            self._edge_children.append(child_index)
+            self._edge_data.append(self._intern_data(data))
+
+        # CSR-style adjacency: the outgoing edges of node i are _successor_edges[_successor_ptr[i]:_successor_ptr[i + 1]],
+        # in the order they were added, which is the order NetworkX gives successors in
+        out_degrees = [0] * len(self._node_names)
+        for parent_index in self._edge_parents:
+            out_degrees[parent_index] += 1
+        self._successor_ptr = array("I", [0])
+        for out_degree in out_degrees:
+            self._successor_ptr.append(self._successor_ptr[-1] + out_degree)
+        next_positions = list(self._successor_ptr[:-1])
+        self._successor_edges = array("I", bytes(4 * len(self._edge_data)))
+        for edge_index, parent_index in enumerate(self._edge_parents):
+            self._successor_edges[next_positions[parent_index]] = edge_index
+            next_positions[parent_index] += 1
+
+    @staticmethod
+    def _intern(value):
+        return sys.intern(value) if isinstance(value, str) else value
+
+    @staticmethod
+    def _intern_data(data):
+        return {POGGGraph._intern(key): POGGGraph._intern(val) for key, val in data.items()}
+
+    @staticmethod
+    def from_json(graph_json):
+        """
+        Build a `POGGGraph` from a JSON object in the POGG format, the same way `POGGGraphUtil.build_graph` builds a NetworkX `DiGraph`.
+        Unlike `POGGGraphUtil.build_graph`, the JSON object isn't changed.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_json` | `JSON` | JSON object containing the graph data |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraph` | graph of the data from the JSON object |
+        """
+        node_names = []
+        node_data = []
+        for node_name, node_info in graph_json["nodes"].items():
+            data = dict(node_info.get("node_properties", {}))
+            # if lexicon_key isn't set, just use the node name
+            data["lexicon_key"] = node_info.get("lexicon_key", node_name)
+            node_names.append(node_name)
+            node_data.append(data)
+
+        listed_nodes = set(node_names)
+        edges = []
+        for edge_info in graph_json["edges"]:
+            # parent and child nodes that aren't listed in "nodes" are added with their name as the lexicon key
+            for node_name in (edge_info["parent_node"], edge_info["child_node"]):
+                if node_name not in listed_nodes:
+                    listed_nodes.add(node_name)
+                    node_names.append(node_name)
+                    node_data.append({"lexicon_key": node_name})
+
+            data = {"label": edge_info["edge_name"]}
+            data.update(edge_info.get("edge_properties", {}))
+            # if lexicon_key isn't set, just use the edge name
+            data["lexicon_key"] = edge_info.get("lexicon_key", edge_info["edge_name"])
+            edges.append((edge_info["parent_node"], edge_info["child_node"], data))
+
+        return POGGGraph(node_names, node_data, edges)
+
+    @staticmethod
+    def from_networkx(graph):
+        """
+        Build a `POGGGraph` from a NetworkX `DiGraph`.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph` | NetworkX `DiGraph` | graph to copy |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraph` | graph with the same nodes, edges, and data |
+        """
+        node_names, node_data = zip(*graph.nodes(data=True)) if len(graph) else ((), ())
+        return POGGGraph(node_names, [dict(data) for data in node_data],
+                         [(parent, child, dict(data)) for parent, child, data in graph.edges(data=True)])
+
+    def to_networkx(self):
+        """
+        Build a NetworkX `DiGraph` with the same nodes, edges, and data, in the same order.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | NetworkX `DiGraph` | copy of the graph |
+        """
+        graph = nx.DiGraph()
+        for node_name, data in zip(self._node_names, self._node_data):
+            graph.add_node(node_name, **data)
+        # edges are added in the order they were first added here, so each node's successors keep their order
+        for edge_index in range(len(self._edge_data)):
+            graph.add_edge(self._node_names[self._edge_parents[edge_index]], self._node_names[self._edge_children[edge_index]],
+                           **self._edge_data[edge_index])
+        return graph
+
+    @property
+    def nodes(self):
+        """view of the nodes, used like the NetworkX node view (`graph.nodes(data=True)`, `graph.nodes[name]`, `name in graph.nodes`)"""
+        return _POGGNodeView(self)
+
+    @property
+    def edges(self):
+        """view of the edges, used like the NetworkX edge view (`graph.edges(data=True)`, `len(graph.edges())`)"""
+        return _POGGEdgeView(self)
+
+    def _iter_edges(self):
+        # grouped by parent, in node order, as NetworkX gives them
+        for parent_index, parent in enumerate(self._node_names):
+            for i in range(self._successor_ptr[parent_index], self._successor_ptr[parent_index + 1]):
+                edge_index = self._successor_edges[i]
+                yield parent, self._node_names[self._edge_children[edge_index]], self._edge_data[edge_index]
+
+    def successors(self, node_name):
+        """
+        Get the children of a node.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `node_name` | `str` | name of the parent node |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | iterator of `str` | names of the child nodes, in the order their edges were added |
+        """
+        node_index = self._node_indices[node_name]
+        return (self._node_names[self._edge_children[self._successor_edges[i]]]
+                for i in range(self._successor_ptr[node_index], self._successor_ptr[node_index + 1]))
+
+    def get_edge_data(self, parent, child, default=None):
+        """
+        Get the data of the edge from `parent` to `child`.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `parent` | `str` | name of the parent node | -- |
+        | `child` | `str` | name of the child node | -- |
+        | `default` | any | value returned if there's no such edge | `None` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | data of the edge, or `default` if there's no such edge |
+        """
+        parent_index = self._node_indices.get(parent)
+        child_index = self._node_indices.get(child)
+        if parent_index is None or child_index is None:
+            return default
+        # nodes have few children, so a scan is cheaper than keeping an index of every edge
+        for i in range(self._successor_ptr[parent_index], self._successor_ptr[parent_index + 1]):
+            edge_index = self._successor_edges[i]
+            if self._edge_children[edge_index] == child_index:
+                return self._edge_data[edge_index]
+        return default
+
+    def _get_in_degrees(self):
+        in_degrees = [0] * len(self._node_names)
+        for child_index in self._edge_children:
+            in_degrees[child_index] += 1
+        return in_degrees
+
+    def in_degree(self):
+        """
+        Get the number of edges into each node.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | (node name, in-degree) tuples, in node order |
+        """
+        return list(zip(self._node_names, self._get_in_degrees()))
+
+    def topological_sort(self):
+        """
+        Sort the nodes so that every parent comes before its children, in the same order as `networkx.topological_sort`.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `list` | node names in topological order, or `None` if the graph has cycles |
+        """
+        in_degrees = self._get_in_degrees()
+        # one generation at a time, starting with the nodes with no in-edges, as NetworkX does
+        generation = [node_index for node_index, in_degree in enumerate(in_degrees) if in_degree == 0]
+        order = []
+        while generation:
+            order.extend(generation)
+            next_generation = []
+            for node_index in generation:
+                for i in range(self._successor_ptr[node_index], self._successor_ptr[node_index + 1]):
+                    child_index = self._edge_children[self._successor_edges[i]]
+                    in_degrees[child_index] -= 1
+                    if in_degrees[child_index] == 0:
+                        next_generation.append(child_index)
+            generation = next_generation
+
+        if len(order) < len(self._node_names):
+            return None
+        return [self._node_names[node_index] for node_index in order]
+
+    def is_weakly_connected(self):
+        """
+        Check whether every node can be reached from every other node when edge direction is ignored.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `bool` | `True` if the graph is weakly connected |
+        """
+        if not self._node_names:
+            raise ValueError("Graph has no nodes, connectivity is undefined")
+        neighbors = [[] for _ in self._node_names]
+        for parent_index, child_index in zip(self._edge_parents, self._edge_children):
+            neighbors[parent_index].append(child_index)
+            neighbors[child_index].append(parent_index)
+        seen = {0}
+        stack = [0]
+        while stack:
+            for neighbor_index in neighbors[stack.pop()]:
+                if neighbor_index not in seen:
+                    seen.add(neighbor_index)
+                    stack.append(neighbor_index)
+        return len(seen) == len(self._node_names)
+
+    def __contains__(self, node_name):
+        return node_name in self._node_indices
+
+    def __iter__(self):
+        return iter(self._node_names)
+
+    def __len__(self):
+        return len(self._node_names)
@@ -2,6 +2,8 @@ from pogg.evaluation._evaluation import POGGEvaluation, POGGGraphEvaluation, POG
 from pogg.evaluation._evaluation_reporting import POGGDatasetReporting, POGGGraphReporting
 from pogg.evaluation._diff import POGGEvaluationDiffConfig
 from pogg.evaluation._diff_reporting import POGGDatasetDiffReporting
+from pogg.evaluation._result_cache import POGGEvaluationCache
+from pogg.evaluation._checkpoint import POGGRunCheckpoint
 
 __all__ = [
     "POGGEvaluation",
@@ -12,4 +14,6 @@ __all__ = [
     "POGGGraphReporting",
     "POGGEvaluationDiffConfig",
     "POGGDatasetDiffReporting",
+    "POGGEvaluationCache",
+    "POGGRunCheckpoint",
 ]
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+The `checkpoint` module contains the `POGGRunCheckpoint` class, which appends each graph's evaluation to a file
+as soon as it's finished so a run that stops partway through can be resumed instead of started over.
+"""
+import os
+import json
+from pathlib import Path
+
+from pogg.evaluation._evaluation import POGGGraphEvaluation
+
+
+class POGGRunCheckpoint:
+    """
+    A `POGGRunCheckpoint` object writes one JSON line per finished graph to a checkpoint file.
+
+    Lines are only ever appended, so if the run is killed the file holds every graph finished before that,
+    plus at most one partly written line, which is skipped when the checkpoint is read.
+    """
+    def __init__(self, checkpoint_path):
+        """
+        Initialize the `POGGRunCheckpoint` object.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `checkpoint_path` | `str` or `Path` | path of the checkpoint file |
+        """
+        self.checkpoint_path = Path(checkpoint_path)
+        # open checkpoint file while a run is writing to it
+        self._file = None
+
+    def read(self):
+        """
+        Read the graphs finished so far from the checkpoint file.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | graph names mapped to their checkpoint entry (`cache_key`, `metrics`, and `text_outputs`); empty if there's no checkpoint file |
+        """
+        entries = {}
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # partly written line from a run that was killed
+                        continue
+                    # a graph that was run again has a later line, which replaces the earlier one
+                    entries[entry["graph_name"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @staticmethod
+    def create_graph_evaluation(entry, graph_info):
+        """
+        Create a `POGGGraphEvaluation` object from a checkpoint entry (see `read`).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `entry` | `dict` | checkpoint entry for the graph |
+        | `graph_info` | `dict` | graph information from the `POGGDataSplit` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraphEvaluation` | evaluation object for the graph |
+        """
+        return POGGGraphEvaluation.create_from_json(entry["graph_name"], graph_info,
+                                                    entry["metrics"], entry["text_outputs"])
+
+    def open(self, resume=False):
+        """
+        Open the checkpoint file for writing.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `resume` | `bool` | whether to keep the graphs already in the checkpoint file; if `False` the file is started over | `False` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            self._file = open(self.checkpoint_path, "w")
+            return
+
+        self._file = open(self.checkpoint_path, "a+")
+        # end a partly written last line, so the next entry starts on its own line
+        if self._file.tell() > 0:
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def add(self, graph_name, cache_key, graph_evaluation):
+        """
+        Append a finished graph's evaluation to the checkpoint file.
+
+        The line is flushed right away, so it's kept even if the run is killed before the next graph finishes.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph |
+        | `cache_key` | `str` | result cache key of the graph (see `POGGEvaluationCache.make_key`), to check neither the graph nor anything else its result depends on has changed when resuming |
+        | `graph_evaluation` | `POGGGraphEvaluation` | evaluation object for the graph |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        entry = {
+            "graph_name": graph_name,
+            "cache_key": cache_key,
+            "metrics": graph_evaluation.get_POGG_metrics_dict(),
+            "text_outputs": graph_evaluation.get_text_outputs_dict(),
+        }
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """
+        Close the checkpoint file. The file itself is kept.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -8,9 +8,10 @@ import os
 from pathlib import Path
 from typing import Dict
 import json
+from collections import Counter
 import networkx as nx
 from pogg_semantics.my_delphin import sementcodecs
-from pogg.data_handling import POGGGraphUtil
+from pogg.data_handling import POGGGraphUtil, POGGGraphAnalysis
 
 # data class ?
 class POGGNodeEvaluation:
@@ -239,7 +240,7 @@ class POGGGraphEvaluation:
         **Parameters**
         | Parameter | Type | Description | Example |
         | --------- | ---- | ----------- | ------- |
-        | `graph` | NetworkX `digraph` | graph object | |
+        | `graph` | NetworkX `digraph` or `POGGGraph` | graph object | |
         | `graph_name` | `str` | name of the graph | `vanilla_cake` |
 
 
@@ -277,11 +278,16 @@ class POGGGraphEvaluation:
         self.graph_json = graph_info["graph_json"]
         self.gold_outputs = graph_info["gold_outputs"]
 
+        # cycle and root information about the graph, computed on first use (see graph_analysis)
+        self._graph_analysis = None
+
         # initialize self.node_evaluations (list of node evaluation objects)
         self.node_evaluations = {}
         self.create_node_evaluations()
         # initialize self.edge_evaluations (list of edge evaluation objects)
         self.edge_evaluations = []
+        # (parent name, child name, edge name) -> edge evaluation object, for get_edge_evaluation
+        self._edge_evaluation_index = {}
         self.create_edge_evaluations()
 
         # calculations made over the graph
@@ -296,9 +302,9 @@ class POGGGraphEvaluation:
         self.edge_coverage = None
         self.edge_inclusion = None
 
-        # functions called during generation
-        self.sem_alg_fxns_used = {}
-        self.sem_comp_fxns_used = {}
+        # functions called during generation, added up from the node and edge evaluations in calculate_metrics
+        self.sem_alg_fxns_used = Counter()
+        self.sem_comp_fxns_used = Counter()
 
         # gold output information
         self.generated_gold_outputs = set()
@@ -337,7 +343,28 @@ class POGGGraphEvaluation:
             "graph": POGGGraphUtil.build_graph(graph_json),
             "gold_outputs": set(outputs_json["gold_outputs"]),
         }
-        eval_obj = POGGGraphEvaluation(graph_name, graph_dict)
+        return cls.create_from_json(graph_name, graph_dict, metrics_json, outputs_json)
+
+    @classmethod
+    def create_from_json(cls, graph_name, graph_info, metrics_json, outputs_json):
+        """
+        Create a `POGGGraphEvaluation` object from its JSON representation
+        (see `get_POGG_metrics_dict` and `get_text_outputs_dict`) and the graph it belongs to.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph |
+        | `graph_info` | `dict` | graph information, including the `graph`, `graph_json` and `gold_outputs` |
+        | `metrics_json` | `dict` | output of `get_POGG_metrics_dict` |
+        | `outputs_json` | `dict` | output of `get_text_outputs_dict` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraphEvaluation` | evaluation object with the stored information |
+        """
+        eval_obj = POGGGraphEvaluation(graph_name, graph_info)
 
         # set outputs attributes
         eval_obj.generated_gold_outputs = set(outputs_json["generated_gold_outputs"])
@@ -349,6 +376,12 @@ class POGGGraphEvaluation:
                 eval_obj._create_node_evaluations_from_json(val)
             elif key == "edges":
                 eval_obj._create_edge_evaluations_from_json(val)
+            # keep the given name (the stored evaluation may be for the same graph under another name)
+            elif key == "graph_name":
+                continue
+            # totals for the graph are added up from the nodes and edges again by calculate_metrics below
+            elif key == "sem_alg_fxns_used" or key == "sem_comp_fxns_used":
+                continue
             else:
                 setattr(eval_obj, key, val)
 
@@ -375,6 +408,7 @@ class POGGGraphEvaluation:
         self.edge_evaluations = []
         for edge_json in edges_json:
             self.edge_evaluations.append(POGGEdgeEvaluation.create_from_json(edge_json))
+        self._index_edge_evaluations()
 
 
     def create_node_evaluations(self):
@@ -410,6 +444,15 @@ class POGGGraphEvaluation:
                 edge_name = edge[2]['label']
                 props = edge[2]
                 self.edge_evaluations.append(POGGEdgeEvaluation(edge_name, props, parent, child))
+        self._index_edge_evaluations()
+
+    def _index_edge_evaluations(self):
+        # the list keeps the order used when writing the evaluation out, the index is just for lookups
+        self._edge_evaluation_index = {}
+        for edge_eval in self.edge_evaluations:
+            # keep the first one, same as scanning the list
+            self._edge_evaluation_index.setdefault(
+                (edge_eval.parent_node_name, edge_eval.child_node_name, edge_eval.edge_name), edge_eval)
 
     def set_SEMENT(self, sement):
         """
@@ -471,6 +514,34 @@ class POGGGraphEvaluation:
         else:
             pass
 
+    def release_SEMENTs(self):
+        """
+        Drop the `SEMENT` objects held by this evaluation object and its node and edge evaluations, keeping their string encodings.
+
+        Used to free memory once a graph is finished; metrics and reports only need the strings.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self.generated_SEMENT = None
+        self.collapsed_SEMENT = None
+        self.prepped_SEMENT = None
+        for node_eval in self.node_evaluations.values():
+            node_eval.generated_SEMENT = None
+        for edge_eval in self.edge_evaluations:
+            edge_eval.generated_SEMENT = None
+
+    @property
+    def graph_analysis(self):
+        """
+        `POGGGraphAnalysis` of the graph, computed the first time it's needed and shared by conversion and inclusion checking.
+        """
+        if self._graph_analysis is None:
+            self._graph_analysis = POGGGraphAnalysis(self.graph)
+        return self._graph_analysis
+
     def get_node_evaluation(self, node_name):
         """
         Get the `POGGNodeEvaluation` object for a node given its name.
@@ -507,14 +578,19 @@ class POGGGraphEvaluation:
         | `POGGEdgeEvaluation` | evaluation object associated with the given edge information |
         """
         edge_name = edge_data['label']
-        for edge_eval in self.edge_evaluations:
-            if edge_name == edge_eval.edge_name and parent_name == edge_eval.parent_node_name and child_name == edge_eval.child_node_name:
-                return edge_eval
+        key = (parent_name, child_name, edge_name)
+        edge_eval = self._edge_evaluation_index.get(key)
+        if edge_eval is None:
+            # edge_evaluations may have been changed directly, so rebuild the index before giving up
+            self._index_edge_evaluations()
+            edge_eval = self._edge_evaluation_index.get(key)
+        if edge_eval is not None:
+            return edge_eval
         raise KeyError("{} with parent {} and child {} not an edge in graph".format(edge_name, parent_name, child_name))
 
     def determine_inclusion(self, root, ancestor_inclusion):
         """
-        Recursively determine the inclusion of each element in the graph in the final generated SEMENT.
+        Determine the inclusion of each element in the graph in the final generated SEMENT with a depth-first traversal from the root.
 
         Once all nodes and edges are marked for coverage, inclusion must be marked on every node and edge.
         This is done *after* all nodes and edges are marked for coverage because inclusion is impacted by the coverage of related elements in the graph.
@@ -534,66 +610,69 @@ class POGGGraphEvaluation:
         """
 
         # check if the graph has cycles, if it does just return
-        try:
-            nx.find_cycle(self.graph)
+        if not self.graph_analysis.acyclic:
             return
-        except nx.exception.NetworkXNoCycle:
-            pass
 
         if root is None:
-            # returns it as a tuple so get the first element which is just the name
-            try:
-                root = POGGGraphUtil.find_root(self.graph)[0]
-            # if we get here then the graph has no distinct root (which is already stored in the generation comment) so just return
-            except ValueError:
+            # if there's no root then the graph has no distinct root (which is already stored in the generation comment) so just return
+            if self.graph_analysis.root is None:
                 return
+            # stored as a tuple so get the first element which is just the name
+            root = self.graph_analysis.root[0]
 
-        root_eval = self.get_node_evaluation(root)
-
-        # comment should reflect the first point of failure
-        # that is, if the node is not covered, use that as the comment
-        # but if it is covered, and it's a successor of a failed element, use that
-        if root_eval.node_covered:
-            # None case for first call of function
-            if ancestor_inclusion or ancestor_inclusion is None:
-                ancestor_inclusion = True
-                root_eval.node_included = True
-            else:
-                ancestor_inclusion = False
-                root_eval.node_included = False
-                root_eval.inclusion_comment = "Successor of failed element"
-        else:
-            ancestor_inclusion = False
-            root_eval.node_included = False
-            root_eval.inclusion_comment = "No SEMENT generated for this node"
-
-        for child in self.graph.successors(root):
-            # determine if edge is included
-            edge_data = self.graph.get_edge_data(root, child)
-            edge_eval = self.get_edge_evaluation(root, child, edge_data)
+        # walk the graph with an explicit stack instead of recursing on each child, so deep graphs don't hit the recursion limit
+        # children are pushed in reverse so they're visited in the same order as a recursive depth-first traversal
+        stack = [(root, ancestor_inclusion)]
+        while stack:
+            root, ancestor_inclusion = stack.pop()
+            root_eval = self.get_node_evaluation(root)
 
             # comment should reflect the first point of failure
             # that is, if the node is not covered, use that as the comment
             # but if it is covered, and it's a successor of a failed element, use that
-            if edge_eval.edge_covered:
-                if ancestor_inclusion:
-                    # descendants of this child may be included
-                    descendant_inclusion = True
-                    edge_eval.edge_included = True
+            if root_eval.node_covered:
+                # None case for first call of function
+                if ancestor_inclusion or ancestor_inclusion is None:
+                    ancestor_inclusion = True
+                    root_eval.node_included = True
+                else:
+                    ancestor_inclusion = False
+                    root_eval.node_included = False
+                    root_eval.inclusion_comment = "Successor of failed element"
+            else:
+                ancestor_inclusion = False
+                root_eval.node_included = False
+                root_eval.inclusion_comment = "No SEMENT generated for this node"
+
+            children = []
+            for child in self.graph.successors(root):
+                # determine if edge is included
+                edge_data = self.graph.get_edge_data(root, child)
+                edge_eval = self.get_edge_evaluation(root, child, edge_data)
+
+                # comment should reflect the first point of failure
+                # that is, if the node is not covered, use that as the comment
+                # but if it is covered, and it's a successor of a failed element, use that
+                if edge_eval.edge_covered:
+                    if ancestor_inclusion:
+                        # descendants of this child may be included
+                        descendant_inclusion = True
+                        edge_eval.edge_included = True
+                    else:
+                        # descendants of this child will not be included
+                        descendant_inclusion = False
+                        edge_eval.edge_included = False
+                        edge_eval.inclusion_comment = "Successor of failed element"
                 else:
                     # descendants of this child will not be included
                     descendant_inclusion = False
                     edge_eval.edge_included = False
-                    edge_eval.inclusion_comment = "Successor of failed element"
-            else:
-                # descendants of this child will not be included
-                descendant_inclusion = False
-                edge_eval.edge_included = False
-                edge_eval.inclusion_comment = "No SEMENT generated for this edge"
+                    edge_eval.inclusion_comment = "No SEMENT generated for this edge"
 
+                children.append((child, descendant_inclusion))
 
-            # recurse down to child
-            self.determine_inclusion(child, descendant_inclusion)
+            # move down to children
+            stack.extend(reversed(children))
 
     def calculate_metrics(self):
         """
@@ -617,19 +696,18 @@ class POGGGraphEvaluation:
         self.node_count = len(self.graph.nodes())
         self.edge_count = len(self.graph.edges())
 
+        # start the function counts over, otherwise calling this twice counts every node and edge twice
+        self.sem_alg_fxns_used = Counter()
+        self.sem_comp_fxns_used = Counter()
+
         self.nodes_covered = 0
         self.nodes_included = 0
         for node in self.node_evaluations.keys():
             node_eval = self.node_evaluations[node]
 
-            # add the functions used to the set for the whole graph
-            self.sem_alg_fxns_used = {
-                k: self.sem_alg_fxns_used.get(k, 0) + node_eval.sem_alg_fxns_used.get(k, 0)
-                for k in self.sem_alg_fxns_used.keys() | node_eval.sem_alg_fxns_used.keys()}
-
-            self.sem_comp_fxns_used = {
-                k: self.sem_comp_fxns_used.get(k, 0) + node_eval.sem_comp_fxns_used.get(k, 0)
-                for k in self.sem_comp_fxns_used.keys() | node_eval.sem_comp_fxns_used.keys()}
+            # add the functions used to the counts for the whole graph
+            self.sem_alg_fxns_used.update(node_eval.sem_alg_fxns_used)
+            self.sem_comp_fxns_used.update(node_eval.sem_comp_fxns_used)
 
             # compute coverage / inclusion
             if node_eval.node_covered:
@@ -642,14 +720,9 @@ class POGGGraphEvaluation:
         self.edges_covered = 0
         self.edges_included = 0
         for edge_eval in self.edge_evaluations:
-            # add the functions used to the set for the whole graph
-            self.sem_alg_fxns_used = {
-                k: self.sem_alg_fxns_used.get(k, 0) + edge_eval.sem_alg_fxns_used.get(k, 0)
-                for k in self.sem_alg_fxns_used.keys() | edge_eval.sem_alg_fxns_used.keys()}
-
-            self.sem_comp_fxns_used = {
-                k: self.sem_comp_fxns_used.get(k, 0) + edge_eval.sem_comp_fxns_used.get(k, 0)
-                for k in self.sem_comp_fxns_used.keys() | edge_eval.sem_comp_fxns_used.keys()}
+            # add the functions used to the counts for the whole graph
+            self.sem_alg_fxns_used.update(edge_eval.sem_alg_fxns_used)
+            self.sem_comp_fxns_used.update(edge_eval.sem_comp_fxns_used)
 
             # compute coverage / inclusion
             if edge_eval.edge_covered:
@@ -756,8 +829,8 @@ class POGGGraphEvaluation:
         self.gold_output_generation_coverage = graph_evaluation_json['gold_output_generation_coverage']
 
         self.generated_results = graph_evaluation_json['generated_results']
-        self.sem_comp_fxns_used = graph_evaluation_json['sem_comp_fxns_used']
-        self.sem_alg_fxns_used = graph_evaluation_json['sem_alg_fxns_used']
+        self.sem_comp_fxns_used = Counter(graph_evaluation_json['sem_comp_fxns_used'])
+        self.sem_alg_fxns_used = Counter(graph_evaluation_json['sem_alg_fxns_used'])
 
         self.node_count = graph_evaluation_json['node_count']
         self.nodes_covered = graph_evaluation_json['nodes_covered']
@@ -779,6 +852,7 @@ class POGGGraphEvaluation:
         self.edge_evaluations = []
         for item in os.listdir(Path(evaluation_directory, "edges")):
             self.edge_evaluations.append(POGGEdgeEvaluation(None, None, None, None, Path(evaluation_directory, "edges", item)))
+        self._index_edge_evaluations()
 
 
 class POGGEvaluation:
@@ -826,38 +900,42 @@ class POGGEvaluation:
         self.lexicon = None
 
         # calculations made over all graphs
-        self.graph_count = None
-        self.graph_SEMENT_count = None
-        self.graph_SEMENT_coverage = None
+        # kept up to date as graphs are added and removed (see add_graph and remove_graph)
+        self.graph_count = 0
+        self.graph_SEMENT_count = 0
+        self.graph_SEMENT_coverage = 0
 
         # NOT number of results, but number that generated text
-        self.graphs_with_text_count = None
-        self.graphs_with_text_coverage = None
-        self.graphs_with_gold_text_count = None
-        self.graphs_with_complete_gold_text_count = None
-
-        self.graphs_with_gold_text_coverage = None
-        self.graphs_with_complete_gold_text_coverage = None
-
-        self.full_node_count = None
-        self.full_nodes_covered = None
-        self.full_nodes_included = None
-        self.full_node_coverage = None
-        self.full_node_inclusion = None
-        self.full_edge_count = None
-        self.full_edges_covered = None
-        self.full_edges_included = None
-        self.full_edge_coverage = None
-        self.full_edge_inclusion = None
-
-        self.sem_alg_fxns_available = set(),
-        self.sem_comp_fxns_available = set(),
+        self.graphs_with_text_count = 0
+        self.graphs_with_text_coverage = 0
+        self.graphs_with_gold_text_count = 0
+        self.graphs_with_complete_gold_text_count = 0
 
-        self.sem_alg_fxns_used = {}
-        self.sem_alg_fxns_used_coverage = None
+        self.graphs_with_gold_text_coverage = 0
+        self.graphs_with_complete_gold_text_coverage = 0
 
-        self.sem_comp_fxns_used = {}
-        self.sem_comp_fxns_used_coverage = None
+        self.full_node_count = 0
+        self.full_nodes_covered = 0
+        self.full_nodes_included = 0
+        self.full_node_coverage = 0
+        self.full_node_inclusion = 0
+        self.full_edge_count = 0
+        self.full_edges_covered = 0
+        self.full_edges_included = 0
+        self.full_edge_coverage = 0
+        self.full_edge_inclusion = 0
+
+        self.sem_alg_fxns_available = set()
+        self.sem_comp_fxns_available = set()
+
+        self.sem_alg_fxns_used = Counter()
+        self.sem_alg_fxns_used_coverage = 0
+
+        self.sem_comp_fxns_used = Counter()
+        self.sem_comp_fxns_used_coverage = 0
+
+        # names of the graphs whose metrics are included in the calculations above
+        self._graphs_in_totals = set()
 
         # metadata about the run itself for reporting/comparing evaluations between runs
         self.run_id = None
@@ -900,11 +978,14 @@ class POGGEvaluation:
         """
         Create a graph evaluation object given a graph and add it to the dictionary of graph evaluation objects.
 
+        If an evaluation object with calculated metrics is given, the dataset metrics are updated right away.
+        If the graph already has an evaluation object, it's replaced (see `replace_graph`).
+
          **Parameters**
         | Parameter | Type | Description |
         | --------- | ---- | ----------- |
-        | `graph` | NetworkX `digraph` | graph to add an evaluation object for |
         | `graph_name` | `str` | name of the graph |
+        | `graph_info` | `dict` or `POGGGraphEvaluation` | graph information from the `POGGDataSplit`, or an evaluation object for the graph |
 
         **Returns**
         | Type | Description |
@@ -914,9 +995,61 @@ class POGGEvaluation:
 
         # create graph evaluation object
         if isinstance(graph_info, POGGGraphEvaluation):
-            self.graph_evaluations[graph_name] = graph_info
+            graph_evaluation = graph_info
         else:
-            self.graph_evaluations[graph_name] = POGGGraphEvaluation(graph_name, graph_info)
+            graph_evaluation = POGGGraphEvaluation(graph_name, graph_info)
+
+        # take out the old evaluation first; assigning below keeps the graph's place in graph_evaluations
+        if graph_name in self._graphs_in_totals:
+            self._add_graph_totals(self.graph_evaluations[graph_name], -1)
+            self._graphs_in_totals.discard(graph_name)
+
+        self.graph_evaluations[graph_name] = graph_evaluation
+
+        # a new evaluation object has no metrics yet, it's counted once calculate_metrics is called
+        if graph_evaluation.node_count is not None:
+            self._add_graph_totals(graph_evaluation, 1)
+            self._graphs_in_totals.add(graph_name)
+        self._calculate_coverage()
+
+    def remove_graph(self, graph_name):
+        """
+        Remove the evaluation object for a graph and take its metrics out of the dataset metrics.
+
+         **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph to remove the evaluation object for |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraphEvaluation` | evaluation object that was removed |
+        """
+        try:
+            graph_evaluation = self.graph_evaluations.pop(graph_name)
+        except KeyError:
+            raise KeyError("No evaluation object for a graph named '{}'".format(graph_name))
+
+        if graph_name in self._graphs_in_totals:
+            self._add_graph_totals(graph_evaluation, -1)
+            self._graphs_in_totals.discard(graph_name)
+            self._calculate_coverage()
+
+        return graph_evaluation
+
+    def get_progress_summary(self):
+        """
+        Get a short summary of the dataset metrics so far, for progress messages while an experiment is running.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | summary of the dataset metrics |
+        """
+        return (f"{self.graph_SEMENT_count}/{self.graph_count} graphs with a SEMENT, "
+                f"{self.graphs_with_text_count}/{self.graph_count} with text, "
+                f"node inclusion {self.full_node_inclusion:.1%}, edge inclusion {self.full_edge_inclusion:.1%}")
 
     def get_graph_evaluation(self, graph_name):
         """
@@ -947,8 +1080,7 @@ class POGGEvaluation:
         | ---- | ----------- |
         | `None` | -- |
         """
-        self.graph_count = len(self.graph_evaluations)
-
+        self.graph_count = 0
         self.graph_SEMENT_count = 0
         self.graphs_with_text_count = 0
         self.graphs_with_gold_text_count = 0
@@ -960,36 +1092,65 @@ class POGGEvaluation:
         self.full_edges_covered = 0
         self.full_edges_included = 0
 
-        self.sem_alg_fxns_used_coverage = 0
-        self.sem_comp_fxns_used_coverage = 0
+        # start the function counts over too, otherwise calling this twice counts every graph twice
+        self.sem_alg_fxns_used = Counter()
+        self.sem_comp_fxns_used = Counter()
 
         for graph_name in self.graph_evaluations.keys():
-            graph_eval = self.graph_evaluations[graph_name]
-
-            self.sem_alg_fxns_used = {
-                k: self.sem_alg_fxns_used.get(k, 0) + graph_eval.sem_alg_fxns_used.get(k, 0)
-                for k in self.sem_alg_fxns_used.keys() | graph_eval.sem_alg_fxns_used.keys()}
-
-            self.sem_comp_fxns_used = {
-                k: self.sem_comp_fxns_used.get(k, 0) + graph_eval.sem_comp_fxns_used.get(k, 0)
-                for k in self.sem_comp_fxns_used.keys() | graph_eval.sem_comp_fxns_used.keys()}
-
-            if graph_eval.generated_SEMENT is not None:
-                self.graph_SEMENT_count += 1
-            if len(graph_eval.generated_results) > 0:
-                self.graphs_with_text_count += 1
-            if len(graph_eval.generated_gold_outputs) > 0:
-                self.graphs_with_gold_text_count += 1
-            if graph_eval.gold_output_generation_coverage == 1:
-                self.graphs_with_complete_gold_text_count += 1
-
-            self.full_node_count += graph_eval.node_count
-            self.full_nodes_covered += graph_eval.nodes_covered
-            self.full_nodes_included += graph_eval.nodes_included
-            self.full_edge_count += graph_eval.edge_count
-            self.full_edges_covered += graph_eval.edges_covered
-            self.full_edges_included += graph_eval.edges_included
+            self._add_graph_totals(self.graph_evaluations[graph_name], 1)
+        self._graphs_in_totals = set(self.graph_evaluations.keys())
+
+        self._calculate_coverage()
 
+    def replace_graph(self, graph_name, graph_evaluation):
+        """
+        Replace (or add) the evaluation object for a graph, updating the dataset metrics (see `add_graph`).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_name` | `str` | name of the graph |
+        | `graph_evaluation` | `POGGGraphEvaluation` | new evaluation object for the graph, with its metrics already calculated |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraphEvaluation` | evaluation object that was replaced, or `None` if the graph didn't have one |
+        """
+        previous_graph_evaluation = self.graph_evaluations.get(graph_name)
+        self.add_graph(graph_name, graph_evaluation)
+        return previous_graph_evaluation
+
+    def _add_graph_totals(self, graph_eval, sign):
+        # add (sign = 1) or subtract (sign = -1) a single graph's contribution to the dataset totals
+        self.graph_count += sign
+
+        if sign > 0:
+            self.sem_alg_fxns_used.update(graph_eval.sem_alg_fxns_used)
+            self.sem_comp_fxns_used.update(graph_eval.sem_comp_fxns_used)
+        else:
+            # -= also drops functions no graph uses anymore, so they don't show up with a count of 0
+            self.sem_alg_fxns_used -= Counter(graph_eval.sem_alg_fxns_used)
+            self.sem_comp_fxns_used -= Counter(graph_eval.sem_comp_fxns_used)
+
+        # the string is kept even after release_SEMENTs
+        if graph_eval.generated_SEMENT_string is not None:
+            self.graph_SEMENT_count += sign
+        if len(graph_eval.generated_results) > 0:
+            self.graphs_with_text_count += sign
+        if len(graph_eval.generated_gold_outputs) > 0:
+            self.graphs_with_gold_text_count += sign
+        if graph_eval.gold_output_generation_coverage == 1:
+            self.graphs_with_complete_gold_text_count += sign
+
+        self.full_node_count += sign * graph_eval.node_count
+        self.full_nodes_covered += sign * graph_eval.nodes_covered
+        self.full_nodes_included += sign * graph_eval.nodes_included
+        self.full_edge_count += sign * graph_eval.edge_count
+        self.full_edges_covered += sign * graph_eval.edges_covered
+        self.full_edges_included += sign * graph_eval.edges_included
+
+    def _calculate_coverage(self):
         self.graph_SEMENT_coverage = self.graph_count and self.graph_SEMENT_count / self.graph_count
         self.graphs_with_text_coverage = self.graph_count and self.graphs_with_text_count / self.graph_count
         self.graphs_with_gold_text_coverage = self.graph_count and self.graphs_with_gold_text_count / self.graph_count
@@ -1000,8 +1161,8 @@ class POGGEvaluation:
         self.full_edge_coverage = self.full_edge_count and self.full_edges_covered / self.full_edge_count
         self.full_edge_inclusion = self.full_edge_count and self.full_edges_included / self.full_edge_count
 
-        self.sem_alg_fxns_used_coverage = len([x for x in self.sem_alg_fxns_used if self.sem_alg_fxns_used[x] > 0]) / len(self.sem_alg_fxns_available)
-        self.sem_comp_fxns_used_coverage = len([x for x in self.sem_comp_fxns_used if self.sem_comp_fxns_used[x] > 0]) / len(self.sem_comp_fxns_available)
+        self.sem_alg_fxns_used_coverage = len(self.sem_alg_fxns_available) and len([x for x in self.sem_alg_fxns_used if self.sem_alg_fxns_used[x] > 0]) / len(self.sem_alg_fxns_available)
+        self.sem_comp_fxns_used_coverage = len(self.sem_comp_fxns_available) and len([x for x in self.sem_comp_fxns_used if self.sem_comp_fxns_used[x] > 0]) / len(self.sem_comp_fxns_available)
 
     def get_POGG_metrics_dict(self):
         return {
@@ -476,7 +476,7 @@ class POGGDatasetReporting:
         | Attribute | Description |
         | --------- | ----------- |
         | `graph_name` | name of the graph |
-        | whether `generated_SEMENT` is `None` | whether there's a SEMENT associated with the graph |
+        | whether `generated_SEMENT_string` is `None` | whether there's a SEMENT associated with the graph |
         | length of `generated_results` | number of text results generated |
         | `node_count` | number of nodes in the graph |
         | `node_coverage` | percentage of nodes that generated a SEMENT for the graph |
@@ -514,7 +514,7 @@ class POGGDatasetReporting:
             graph_eval = dataset_eval.graph_evaluations[graph_eval_key]
             graphs_summary_table.add_row([
                 graph_eval.graph_name,
-                (graph_eval.generated_SEMENT is not None),
+                (graph_eval.generated_SEMENT_string is not None),
                 len(graph_eval.generated_results),
                 graph_eval.node_count,
                 graph_eval.node_coverage,
@@ -0,0 +1,92 @@
+"""
+The `result_cache` module contains the `POGGEvaluationCache` class, which stores `POGGGraphEvaluation` objects on disk
+so a graph doesn't have to be converted and generated from again while nothing that affects its result has changed.
+"""
+import json
+import hashlib
+
+from pogg._json_file_cache import _POGGJSONFileCache
+from pogg.evaluation._evaluation import POGGGraphEvaluation
+
+
+class POGGEvaluationCache(_POGGJSONFileCache):
+    """
+    A `POGGEvaluationCache` object stores one JSON file per graph evaluation in a directory, named after a key that is
+    a hash of everything the result depends on (see `make_key`).
+    Since the key changes whenever any of those inputs change, old files are never overwritten or invalidated, just no longer used.
+    """
+    def __init__(self, cache_dir):
+        """
+        Initialize the `POGGEvaluationCache` object.
+
+        **Parameters / Instance Attributes**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `cache_dir` | `str` or `Path` | directory the cached evaluations are stored in; created if it doesn't exist |
+        """
+        super().__init__(cache_dir)
+
+    @staticmethod
+    def make_key(key_information):
+        """
+        Make a cache key from the information a graph's evaluation depends on.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `key_information` | `dict` | JSON-serializable information, e.g. the graph hash, lexicon entries, and grammar fingerprint |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `str` | SHA-256 hex digest of the information |
+        """
+        key_json = json.dumps(key_information, sort_keys=True, default=str)
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    def get(self, key, graph_name, graph_info):
+        """
+        Get the cached evaluation for a key, if there is one.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `key` | `str` | cache key (see `make_key`) |
+        | `graph_name` | `str` | name to give the evaluation object |
+        | `graph_info` | `dict` | graph information from the `POGGDataSplit` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraphEvaluation` | cached evaluation object, or `None` if the key isn't in the cache |
+        """
+        cached_json = self._read_json(key)
+        if cached_json is None:
+            # a file that can't be read is treated as missing and will be replaced
+            return None
+
+        return POGGGraphEvaluation.create_from_json(graph_name, graph_info,
+                                                    cached_json["metrics"], cached_json["text_outputs"])
+
+    def put(self, key, graph_evaluation):
+        """
+        Store an evaluation in the cache.
+
+        Other runs reading the cache never see a partly written file (see `_POGGJSONFileCache`).
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `key` | `str` | cache key (see `make_key`) |
+        | `graph_evaluation` | `POGGGraphEvaluation` | evaluation object to store |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        cached_json = {
+            "metrics": graph_evaluation.get_POGG_metrics_dict(),
+            "text_outputs": graph_evaluation.get_text_outputs_dict(),
+        }
+        self._write_json(key, cached_json)
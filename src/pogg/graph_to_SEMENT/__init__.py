@@ -1,3 +1,6 @@
 from pogg.graph_to_SEMENT._graph_to_SEMENT import POGGGraphConverter
+from pogg.graph_to_SEMENT._conversion_trace import POGGConversionTrace
+from pogg.graph_to_SEMENT._composition_registry import POGGCompositionRegistry, POGGCompositionParameter
+from pogg.graph_to_SEMENT._call_plan import POGGCallPlan
 
-__all__ = ["POGGGraphConverter"]
\ No newline at end of file
+__all__ = ["POGGGraphConverter", "POGGConversionTrace", "POGGCompositionRegistry", "POGGCompositionParameter", "POGGCallPlan"]
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+The `call_plan` module contains the `POGGCallPlan` class, a precompiled form of a lexicon entry that
+`POGGGraphConverter` can run without copying or re-reading the entry's parameters on every conversion.
+"""
+from typing import NamedTuple
+
+
+class POGGCallPlan(NamedTuple):
+    """
+    A `POGGCallPlan` describes a single composition function call: which function to call and where each of its
+    arguments comes from. Nested SEMENTs are described by nested `POGGCallPlan` objects.
+
+    Call plans are created with `POGGLexiconEntry.compile_call_plan` and run with `POGGGraphConverter.run_call_plan`.
+
+    **Fields**
+    | Field | Type | Description |
+    | ----- | ---- | ----------- |
+    | `composition_function_name` | `str` | name of the composition function to call |
+    | `arguments` | `tuple` | `(parameter name, source, value)` for each parameter of the function, in signature order |
+    | `edge_SEMENTs` | `tuple` | `(parameter name, POGGCallPlan)` for each SEMENT an edge entry introduces itself, built before the call |
+
+    The source of an argument is one of the following.
+
+    | Source | Value |
+    | ------ | ----- |
+    | `LITERAL` | the argument itself |
+    | `MUTABLE_LITERAL` | the argument itself, deep-copied for each call (e.g. a `dict` of variable properties) |
+    | `DEFAULT` | the parameter's default value |
+    | `NESTED` | `POGGCallPlan` for a nested SEMENT |
+    | `PARENT` / `CHILD` | -- (the parent or child SEMENT of the edge being converted) |
+    | `EDGE_SEMENT` | -- (the SEMENT built from `edge_SEMENTs` for this parameter) |
+    """
+    composition_function_name: str
+    arguments: tuple
+    edge_SEMENTs: tuple = ()
+
+    LITERAL = "literal"
+    MUTABLE_LITERAL = "mutable_literal"
+    DEFAULT = "default"
+    NESTED = "nested"
+    PARENT = "parent"
+    CHILD = "child"
+    EDGE_SEMENT = "edge_SEMENT"
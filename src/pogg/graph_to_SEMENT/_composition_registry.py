@@ -0,0 +1,78 @@
+"""
+The `composition_registry` module contains the `POGGCompositionRegistry` class, which introspects each
+`SemanticComposition` function once and keeps the information about its parameters for later lookups.
+"""
+import inspect
+
+from pogg_semantics.semantic_composition import SemanticComposition
+
+
+class POGGCompositionParameter:
+    """
+    A `POGGCompositionParameter` object stores the information about one parameter of a composition function
+    that the graph converter and lexicon entries need.
+    """
+    __slots__ = ("name", "kind", "default", "optional", "annotation_name", "is_SEMENT")
+
+    def __init__(self, parameter):
+        """
+        Initialize the `POGGCompositionParameter` object from an `inspect.Parameter`.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `parameter` | `inspect.Parameter` | parameter from the composition function's signature |
+
+        **Instance Attributes**
+        | Attribute | Description |
+        | --------- | ----------- |
+        | `name` | name of the parameter |
+        | `kind` | kind of the parameter (e.g. `inspect.Parameter.POSITIONAL_OR_KEYWORD`) |
+        | `default` | default value of the parameter, or `inspect.Parameter.empty` if it has none |
+        | `optional` | whether the parameter has a default value |
+        | `annotation_name` | name of the parameter's type annotation, e.g. `"SEMENT"` or `"dict"` |
+        | `is_SEMENT` | whether the parameter is of type `SEMENT` |
+        """
+        self.name = parameter.name
+        self.kind = parameter.kind
+        self.default = parameter.default
+        self.optional = parameter.default is not inspect.Parameter.empty
+        # string annotations don't have a __name__
+        self.annotation_name = getattr(parameter.annotation, "__name__", parameter.annotation)
+        self.is_SEMENT = self.annotation_name == "SEMENT"
+
+
+class POGGCompositionRegistry:
+    """
+    Provides static functions for looking up the parameters of `SemanticComposition` functions.
+
+    Each function's signature is only inspected the first time it's looked up.
+    """
+    # composition function name -> dict of parameter name -> POGGCompositionParameter
+    _parameters = {}
+
+    @staticmethod
+    def get_parameters(comp_fxn_name):
+        """
+        Get the parameters of a `SemanticComposition` function, not including `self`.
+
+        **Parameters**
+        | Parameter | Type | Description | Example |
+        | --------- | ---- | ----------- | ------- |
+        | `comp_fxn_name` | `str` | name of the composition function | `compound_noun` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `dict` | parameter names mapped to `POGGCompositionParameter` objects, in signature order |
+
+        Raises an `AttributeError` if `SemanticComposition` has no function with the given name.
+        """
+        parameters = POGGCompositionRegistry._parameters.get(comp_fxn_name)
+        if parameters is None:
+            comp_fxn_obj = getattr(SemanticComposition, comp_fxn_name)
+            parameters = {name: POGGCompositionParameter(parameter)
+                          for name, parameter in inspect.signature(comp_fxn_obj).parameters.items()
+                          if name != 'self'}
+            POGGCompositionRegistry._parameters[comp_fxn_name] = parameters
+        return parameters
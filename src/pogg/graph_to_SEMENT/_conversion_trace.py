@@ -0,0 +1,97 @@
+"""
+The `conversion_trace` module contains the `POGGConversionTrace` class, which collects the semantic algebra and
+semantic composition functions called while converting a single node or edge.
+"""
+import threading
+from collections import Counter
+
+from pogg_semantics.semantic_composition import SemCompTracer, SemAlgTracer
+
+
+class POGGConversionTrace:
+    """
+    A `POGGConversionTrace` object collects function call counts for one node or edge conversion.
+
+    `SemCompTracer` and `SemAlgTracer` count calls in class-level state, so the reset-compose-read sequence
+    is done under a lock shared by every trace. The counts are then copied into the trace object itself,
+    so conversions running in other threads or tasks can't overwrite or reset them before they're stored.
+    """
+    _tracer_lock = threading.RLock()
+
+    def __init__(self):
+        """
+        Initialize an empty `POGGConversionTrace` object.
+
+        **Instance Attributes**
+        | Attribute | Description |
+        | --------- | ----------- |
+        | `sem_alg_fxns_used` | `Counter` of semantic algebra functions called during the traced calls |
+        | `sem_comp_fxns_used` | `Counter` of semantic composition functions called during the traced calls |
+        """
+        self.sem_alg_fxns_used = Counter()
+        self.sem_comp_fxns_used = Counter()
+
+    def call(self, fxn, *args, **kwargs):
+        """
+        Call a function and add the semantic algebra and semantic composition functions it called to the trace.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `fxn` | `callable` | function to call, e.g. `POGGGraphConverter.get_SEMENT` |
+        | `*args`, `**kwargs` | -- | arguments passed to `fxn` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | -- | whatever `fxn` returns |
+        """
+        with self._tracer_lock:
+            SemCompTracer.reset_fxns_called()
+            SemAlgTracer.reset_fxns_called()
+
+            result = fxn(*args, **kwargs)
+
+            self.sem_alg_fxns_used.update(SemAlgTracer.fxns_called)
+            self.sem_comp_fxns_used.update(SemCompTracer.fxns_called)
+
+        return result
+
+    def add_trace(self, trace):
+        """
+        Add the function counts collected by another trace to this one.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `trace` | `POGGConversionTrace` | trace whose counts are added |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self.sem_alg_fxns_used.update(trace.sem_alg_fxns_used)
+        self.sem_comp_fxns_used.update(trace.sem_comp_fxns_used)
+
+    def add_to_evaluation(self, element_evaluation):
+        """
+        Add the traced function counts to a `POGGNodeEvaluation` or `POGGEdgeEvaluation` object.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `element_evaluation` | `POGGNodeEvaluation` or `POGGEdgeEvaluation` | evaluation object to update |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        element_evaluation.sem_alg_fxns_used = {
+            k: element_evaluation.sem_alg_fxns_used.get(k, 0) + self.sem_alg_fxns_used.get(k, 0)
+            for k in element_evaluation.sem_alg_fxns_used.keys() | self.sem_alg_fxns_used.keys()}
+
+        element_evaluation.sem_comp_fxns_used = {
+            k: element_evaluation.sem_comp_fxns_used.get(k, 0) + self.sem_comp_fxns_used.get(k, 0)
+            for k in element_evaluation.sem_comp_fxns_used.keys() | self.sem_comp_fxns_used.keys()}
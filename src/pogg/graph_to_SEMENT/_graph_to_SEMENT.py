@@ -4,25 +4,48 @@ The `graph_to_SEMENT` module contains the `POGGGraphConverter` class used to con
 [See usage examples here.](project:/usage_nbs/pogg/graph_to_SEMENT/POGGGraphConverter_usage.ipynb)
 """
 
+import re
 import copy
-import inspect
 import networkx as nx
 from pathlib import Path
 
 
 from pogg_semantics.pogg_config import POGGCompositionConfig
-from pogg_semantics.my_delphin import SEMENT
-from pogg_semantics.semantic_composition import SemanticComposition, SemCompTracer, SemAlgTracer
+from pogg_semantics.my_delphin import SEMENT, sementcodecs
+from pogg_semantics.semantic_composition import SemanticComposition
 
-from pogg.data_handling import POGGGraphUtil
+from pogg.data_handling import POGGGraphAnalysis
+from pogg.graph_to_SEMENT._conversion_trace import POGGConversionTrace
+from pogg.graph_to_SEMENT._composition_registry import POGGCompositionRegistry
+from pogg.graph_to_SEMENT._call_plan import POGGCallPlan
 # from pogg.lexicon import POGGLexiconEntry
 
+
+class _POGGConversionFrame:
+    # one node on the stack used by POGGGraphConverter.convert_graph_to_SEMENT
+    __slots__ = ("node_name", "sement", "children", "child")
+
+    def __init__(self, node_name, sement, children):
+        # SEMENT built so far for the subgraph rooted at this node
+        self.node_name = node_name
+        self.sement = sement
+        # iterator over the node's successors and the successor currently being converted
+        self.children = children
+        self.child = None
+
+
 class POGGGraphConverter:
     """
     A `POGGGraphConverter` object has `SemanticComposition` and `POGGDataset` objects as instance attributes and
     has instance methods for converting graphs in the dataset to SEMENTs.
     """
-    def __init__(self, composition_config, lexicon=None):
+    # variables in copies made by _decode_with_fresh_variables are numbered from here up, far above the numbers
+    # the semantic algebra hands out, so a copy never shares a variable with a SEMENT the algebra builds later
+    fresh_variable_start = 1000000000
+    # a variable in an encoded SEMENT (e.g. x4 or h12), or a quoted string (e.g. a CARG value) that's left alone
+    _variable_pattern = re.compile(r'"(?:[^"\\]|\\.)*"|\b([hexiup])(\d+)\b')
+
+    def __init__(self, composition_config, lexicon=None, memoize_subgraphs=False, cache_node_SEMENTs=False):
         """
         Initialize the `POGGGraphConverter` object.
 
@@ -33,6 +56,8 @@ class POGGGraphConverter:
         | --------- | ---- | ----------- |
         | `semantic_composition` | `SemanticComposition` | `SemanticComposition` object that has functions for creating and composing SEMENTs |
         | `dataset` | `POGGLexicon` | `POGGLexicon` object that is consulted during conversions |
+        | `memoize_subgraphs` | `bool` | convert the subgraph under each node only once per graph, even if the node has several parents (see `convert_graph_to_SEMENT`) |
+        | `cache_node_SEMENTs` | `bool` | reuse the SEMENT built for a lexicon key in earlier graphs instead of running the composition again (see `convert_node_to_SEMENT`) |
         """
 
         self.semantic_composition = SemanticComposition(composition_config)
@@ -44,6 +69,16 @@ class POGGGraphConverter:
             self.composition_config = self.semantic_composition.composition_config
 
         self.lexicon = lexicon
+        self.memoize_subgraphs = memoize_subgraphs
+        # number of the next variable in a copy from _decode_with_fresh_variables
+        self._next_fresh_variable = self.fresh_variable_start
+        self.cache_node_SEMENTs = cache_node_SEMENTs
+
+        # lexicon key -> (lexicon version, lexicon entry, encoded SEMENT, POGGConversionTrace) for node SEMENTs built so far
+        self._node_SEMENT_cache = {}
+
+        # composition function name -> bound method of self.semantic_composition
+        self._comp_fxns = {}
 
     def get_SEMENT(self, comp_fxn_name, given_parameters):
         """
@@ -61,17 +96,17 @@ class POGGGraphConverter:
         | `SEMENT` | SEMENT produced by calling the composition function |
         """
 
-        comp_fxn_obj = getattr(self.semantic_composition, comp_fxn_name)
+        comp_fxn_obj = self._get_comp_fxn(comp_fxn_name)
 
         # get parameters for the comp_fxn
-        defined_parameter_keys = inspect.signature(comp_fxn_obj).parameters
+        defined_parameter_keys = POGGCompositionRegistry.get_parameters(comp_fxn_name)
 
         parameters_to_pass = {}
         for key in defined_parameter_keys:
             if key in given_parameters:
                 # if the parameter calls for type SEMENT
-                if defined_parameter_keys[key].annotation.__name__ == "SEMENT":
-                    optional_param = defined_parameter_keys[key].default is not inspect.Parameter.empty
+                if defined_parameter_keys[key].is_SEMENT:
+                    optional_param = defined_parameter_keys[key].optional
                     param_val = given_parameters[key]
 
                     # if it's NOT optional or optional and HAS a value
@@ -92,7 +127,7 @@ class POGGGraphConverter:
                     parameters_to_pass[key] = given_parameters[key]
             else:
                 # if the parameter isn't in the lexicon entry but the function has a default value, just use that
-                if defined_parameter_keys[key].default is not inspect.Parameter.empty:
+                if defined_parameter_keys[key].optional:
                     parameters_to_pass[key] = defined_parameter_keys[key].default
                 else:
                     raise KeyError(f"The parameter '{key}' is not defined in the lexicon entry; {given_parameters}")
@@ -101,15 +136,67 @@ class POGGGraphConverter:
 
         return sement
 
-    def convert_node_to_SEMENT(self, node, node_evaluation=None):
+    def run_call_plan(self, call_plan, parent=None, child=None, edge_SEMENTs=None):
+        """
+        Get a SEMENT object by running a compiled `POGGCallPlan` (see `POGGLexiconEntry.compile_call_plan`).
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `call_plan` | `POGGCallPlan` | call plan to run | -- |
+        | `parent` | `SEMENT` | SEMENT passed for `"parent"` arguments of an edge plan | `None` |
+        | `child` | `SEMENT` | SEMENT passed for `"child"` arguments of an edge plan | `None` |
+        | `edge_SEMENTs` | `dict` | SEMENTs built from the plan's `edge_SEMENTs`, keyed by parameter name | `None` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `SEMENT` | SEMENT produced by calling the composition function |
+        """
+        parameters_to_pass = {}
+        for key, source, val in call_plan.arguments:
+            if source == POGGCallPlan.NESTED:
+                parameters_to_pass[key] = self.run_call_plan(val)
+            elif source == POGGCallPlan.MUTABLE_LITERAL:
+                # the composition function may change it or anything nested in it, so hand it a deep copy
+                parameters_to_pass[key] = copy.deepcopy(val)
+            elif source == POGGCallPlan.PARENT:
+                parameters_to_pass[key] = parent
+            elif source == POGGCallPlan.CHILD:
+                parameters_to_pass[key] = child
+            elif source == POGGCallPlan.EDGE_SEMENT:
+                parameters_to_pass[key] = edge_SEMENTs[key]
+            else:
+                # literal or default value
+                parameters_to_pass[key] = val
+
+        return self._get_comp_fxn(call_plan.composition_function_name)(**parameters_to_pass)
+
+    def _get_comp_fxn(self, comp_fxn_name):
+        comp_fxn_obj = self._comp_fxns.get(comp_fxn_name)
+        if comp_fxn_obj is None:
+            comp_fxn_obj = getattr(self.semantic_composition, comp_fxn_name)
+            self._comp_fxns[comp_fxn_name] = comp_fxn_obj
+        return comp_fxn_obj
+
+    def convert_node_to_SEMENT(self, node, node_evaluation=None, trace=None, use_SEMENT_cache=False):
         """
         Convert a node from a directed graph to a SEMENT
 
+        If `use_SEMENT_cache` is set, the first successful conversion of each lexicon key is stored along with the
+        functions it called. Later conversions of the same key get a copy of the stored SEMENT with fresh variables and
+        handles (see `fresh_variable_start`) and the stored function counts instead of running the composition again.
+        Copies never share a variable with each other or with SEMENTs the algebra builds, so any node can use the cache,
+        including several nodes with the same key in one graph.
+        The stored SEMENT is dropped when the lexicon entry changes (see `POGGLexicon.version`).
+
         **Parameters**
         | Parameter | Type | Description | Default | Example |
         | --------- | ---- | ----------- | ------- | ------- |
         | `node` | tuple of `str` and `dict` | node to convert  | -- | `('cake1', {'lexicon_key': 'cake'})` |
         | `node_evaluation` | `POGGNodeEvaluation` | evaluation object associated with the node | `None` | |
+        | `trace` | `POGGConversionTrace` | trace that collects the functions called for this node; a new one is used if not given | `None` | |
+        | `use_SEMENT_cache` | `bool` | reuse (and store) the SEMENT for the node's lexicon key | `False` | |
 
         **Returns**
         | Type | Description |
@@ -120,15 +207,12 @@ class POGGGraphConverter:
         # comes in as a tuple from the NetworkX NodeView
         node_name, node_props = node[0], node[1]
 
-        # reset the tracers
-        SemCompTracer.reset_fxns_called()
-        SemAlgTracer.reset_fxns_called()
+        if trace is None:
+            trace = POGGConversionTrace()
 
         # try to get the comp_fxn
         try:
-            # get the comp_fxn
-            comp_fxn_name = self.lexicon.node_entries[node_props['lexicon_key']].composition_function_name
-            param_vals = copy.deepcopy(self.lexicon.node_entries[node_props['lexicon_key']].parameters)
+            call_plan = self.lexicon.get_call_plan("node", node_props['lexicon_key'])
         except KeyError:
             comment = f"'{node_props['lexicon_key']}' not in lexicon's node entries"
             if node_evaluation:
@@ -136,30 +220,55 @@ class POGGGraphConverter:
                 node_evaluation.generation_comment = comment
             return None
 
+        node_trace = trace
+        if use_SEMENT_cache:
+            entry = self.lexicon.node_entries[node_props['lexicon_key']]
+            cached = self._node_SEMENT_cache.get(node_props['lexicon_key'])
+            # only use the stored SEMENT if it was built from the current entry
+            if cached is not None and cached[0] == self.lexicon.version and cached[1] is entry:
+                sement = self._decode_with_fresh_variables(cached[2])
+                trace.add_trace(cached[3])
+
+                if node_evaluation:
+                    node_evaluation.node_covered = True
+                    node_evaluation.set_SEMENT(sement)
+                    # add fxns used (when the stored SEMENT was built) to the evaluation
+                    trace.add_to_evaluation(node_evaluation)
+
+                return sement
+
+            # trace this conversion on its own so its counts can be stored with the SEMENT
+            node_trace = POGGConversionTrace()
+
+        # entries that couldn't be compiled are converted from their parameters directly
+        if call_plan is None:
+            comp_fxn_name = self.lexicon.node_entries[node_props['lexicon_key']].composition_function_name
+            param_vals = copy.deepcopy(self.lexicon.node_entries[node_props['lexicon_key']].parameters)
 
         # try to do the conversion
         try:
-            sement = self.get_SEMENT(comp_fxn_name, param_vals)
+            if call_plan is not None:
+                sement = node_trace.call(self.run_call_plan, call_plan)
+            else:
+                sement = node_trace.call(self.get_SEMENT, comp_fxn_name, param_vals)
+
+            if use_SEMENT_cache:
+                # store it encoded, since compositions with this node may change the SEMENT returned here
+                self._node_SEMENT_cache[node_props['lexicon_key']] = (
+                    self.lexicon.version, entry, sementcodecs.encode(sement), node_trace)
+                trace.add_trace(node_trace)
 
             if node_evaluation:
                 node_evaluation.node_covered = True
                 node_evaluation.set_SEMENT(sement)
-                # add fxn to list of fxns used
-                # node_evaluation.sem_comp_fxns_used.add(comp_fxn_name)
-                # node_evaluation.sem_alg_fxns_used.update(SemAlgTracer.fxns_called)
-                # node_evaluation.sem_alg_fxns_used.update(SemAlgTracer.fxns_called)
-
-                node_evaluation.sem_alg_fxns_used = {
-                    k: node_evaluation.sem_alg_fxns_used.get(k, 0) + SemAlgTracer.fxns_called.get(k, 0)
-                    for k in node_evaluation.sem_alg_fxns_used.keys() | SemAlgTracer.fxns_called.keys()}
-
-                node_evaluation.sem_comp_fxns_used = {
-                    k: node_evaluation.sem_comp_fxns_used.get(k, 0) + SemCompTracer.fxns_called.get(k, 0)
-                    for k in node_evaluation.sem_comp_fxns_used.keys() | SemCompTracer.fxns_called.keys()}
-
+                # add fxns used to the evaluation
+                trace.add_to_evaluation(node_evaluation)
 
             return sement
         except Exception as err:
+            if node_trace is not trace:
+                trace.add_trace(node_trace)
+
             # if some unforeseen error occurs just leave it in the comment
             comment = err.args[0]
 
@@ -170,7 +279,7 @@ class POGGGraphConverter:
 
 
 
-    def convert_edge_to_SEMENT(self, edge, parent, child, edge_evaluation=None):
+    def convert_edge_to_SEMENT(self, edge, parent, child, edge_evaluation=None, trace=None):
         """
         Convert an edge from a directed graph to a SEMENT
 
@@ -181,6 +290,7 @@ class POGGGraphConverter:
         | `parent` | `SEMENT` | SEMENT object produced for parent node | -- | |
         | `child` | `SEMENT` | SEMENT object produced for child node | -- |
         | `edge_evaluation` | `POGGEdgeEvaluation` | evaluation object associated with the edge | `None` | |
+        | `trace` | `POGGConversionTrace` | trace that collects the functions called for this edge; a new one is used if not given | `None` | |
 
         **Returns**
         | Type | Description |
@@ -188,9 +298,8 @@ class POGGGraphConverter:
         | `SEMENT` | SEMENT produced with the given edge information |
         """
 
-        # reset the tracers
-        SemAlgTracer.reset_fxns_called()
-        SemCompTracer.reset_fxns_called()
+        if trace is None:
+            trace = POGGConversionTrace()
 
         # check if one of the SEMENTs to compose is None
         if parent is None:
@@ -205,9 +314,7 @@ class POGGGraphConverter:
             return parent
 
         try:
-            # get comp_fxn
-            comp_fxn_name = self.lexicon.edge_entries[edge['lexicon_key']].composition_function_name
-            param_vals = copy.deepcopy(self.lexicon.edge_entries[edge['lexicon_key']].parameters)
+            call_plan = self.lexicon.get_call_plan("edge", edge['lexicon_key'])
         except KeyError:
             if edge_evaluation:
                 edge_evaluation.edge_covered = False
@@ -215,6 +322,32 @@ class POGGGraphConverter:
             # return the parent SEMENT (if the edge fails then anything contributed from child etc doesn't matter)
             return parent
 
+        if call_plan is not None:
+            # build any SEMENTs the edge introduces itself, then run the plan with the parent and child SEMENTs
+            edge_SEMENTs = {key: trace.call(self.run_call_plan, nested_plan)
+                            for key, nested_plan in call_plan.edge_SEMENTs}
+            try:
+                sement = trace.call(self.run_call_plan, call_plan, parent, child, edge_SEMENTs)
+            except Exception as err:
+                if edge_evaluation:
+                    edge_evaluation.generation_comment = f"Error during execution ({err})"
+                    edge_evaluation.edge_covered = False
+                # just return the parent, i.e. the SEMENT before attempting to compose
+                return parent
+
+            if edge_evaluation:
+                # add fxns used to the evaluation
+                trace.add_to_evaluation(edge_evaluation)
+
+                edge_evaluation.edge_covered = True
+                edge_evaluation.set_SEMENT(sement)
+
+            return sement
+
+        # entries that couldn't be compiled are converted from their parameters directly
+        comp_fxn_name = self.lexicon.edge_entries[edge['lexicon_key']].composition_function_name
+        param_vals = copy.deepcopy(self.lexicon.edge_entries[edge['lexicon_key']].parameters)
+
         # swap out 'parent' and 'child' in param_vals for the SEMENTs themselves
         for key in param_vals.keys():
             if param_vals[key] == 'parent':
@@ -224,7 +357,7 @@ class POGGGraphConverter:
             # if there's a parameter that introduces its own SEMENT, build it and insert it as the value
             # TODO: this is rancid but i'm getting circular import problems and the only reason i even import this class is for this check...
             elif str(type(param_vals[key])) == "<class 'pogg.lexicon._lexicon_entry.POGGLexiconEntry'>":
-                param_vals[key] = self.get_SEMENT(param_vals[key].composition_function_name, param_vals[key].parameters)
+                param_vals[key] = trace.call(self.get_SEMENT, param_vals[key].composition_function_name, param_vals[key].parameters)
             else:
                 # I don't think I should raise an error?
                 # If there's some other edge parameter, just leave it alone
@@ -232,7 +365,7 @@ class POGGGraphConverter:
 
         # if some other unforeseen error occurs, leave it in the comment and proceed
         try:
-            sement = self.get_SEMENT(comp_fxn_name, param_vals)
+            sement = trace.call(self.get_SEMENT, comp_fxn_name, param_vals)
         except Exception as err:
             if edge_evaluation:
                 edge_evaluation.generation_comment = f"Error during execution ({err})"
@@ -241,18 +374,8 @@ class POGGGraphConverter:
             return parent
 
         if edge_evaluation:
-            # add fxn to list of fxns used
-            # edge_evaluation.sem_comp_fxns_used.add(comp_fxn_name)
-            # edge_evaluation.sem_comp_fxns_used.update(SemCompTracer.fxns_called)
-            # edge_evaluation.sem_alg_fxns_used.update(SemAlgTracer.fxns_called)
-
-            edge_evaluation.sem_alg_fxns_used = {
-                k: edge_evaluation.sem_alg_fxns_used.get(k, 0) + SemAlgTracer.fxns_called.get(k, 0)
-                for k in edge_evaluation.sem_alg_fxns_used.keys() | SemAlgTracer.fxns_called.keys()}
-
-            edge_evaluation.sem_comp_fxns_used = {
-                k: edge_evaluation.sem_comp_fxns_used.get(k, 0) + SemCompTracer.fxns_called.get(k, 0)
-                for k in edge_evaluation.sem_comp_fxns_used.keys() | SemCompTracer.fxns_called.keys()}
+            # add fxns used to the evaluation
+            trace.add_to_evaluation(edge_evaluation)
 
             edge_evaluation.edge_covered = True
             edge_evaluation.set_SEMENT(sement)
@@ -260,16 +383,26 @@ class POGGGraphConverter:
         return sement
 
 
-    def convert_graph_to_SEMENT(self, graph, graph_evaluation=None, root=None):
+    def convert_graph_to_SEMENT(self, graph, graph_evaluation=None, root=None, graph_analysis=None, subgraph_SEMENTs=None):
         """
         Convert a directed graph to a SEMENT.
 
+        If `memoize_subgraphs` is set, the subgraph under a node with several parents is only converted (and its
+        evaluation objects only updated) the first time it's reached. Every later parent gets its own copy of that
+        SEMENT with fresh variables and handles (see `fresh_variable_start`), so the copies are composed like
+        separately converted subgraphs; only the variable numbers differ.
+
+        If `cache_node_SEMENTs` is set, nodes get a copy of the SEMENT already built for their lexicon key, in this graph
+        or an earlier one, with fresh variables and handles (see `convert_node_to_SEMENT`).
+
         **Parameters**
         | Parameter | Type | Description | Default | Example |
         | --------- | ---- | ----------- | ------- | ------- |
-        | `graph` | `DiGraph` | NetworkX directed graph | -- | |
+        | `graph` | `DiGraph` or `POGGGraph` | NetworkX directed graph, or the compact `POGGGraph` | -- | |
         | `graph_evaluation` | `SEMENT` | SEMENT object produced for child node | None | |
         | `root` | tuple of `str` and `dict` | root of the (sub)graph | None | `('cake1', {'lexicon_key': 'cake'})` |
+        | `graph_analysis` | `POGGGraphAnalysis` | cycle and root information for the graph; taken from `graph_evaluation` or computed if not given | None | |
+        | `subgraph_SEMENTs` | `dict` | encoded SEMENTs already produced for subgraphs in this graph, keyed by node name; only used if `memoize_subgraphs` is set | None | |
 
         **Returns**
         | Type | Description |
@@ -277,25 +410,27 @@ class POGGGraphConverter:
         | `SEMENT` | SEMENT produced for the given graph |
         """
 
+        # analyze the graph once and pass the analysis down to every subgraph
+        if graph_analysis is None:
+            if graph_evaluation is not None and graph_evaluation.graph is graph:
+                graph_analysis = graph_evaluation.graph_analysis
+            else:
+                graph_analysis = POGGGraphAnalysis(graph)
+
         # first check for cycles, skip the graph if there are any
-        try:
-            nx.find_cycle(graph)
+        if not graph_analysis.acyclic:
             if graph_evaluation is not None:
                 # mark all nodes and edges as not covered
                 graph_evaluation.mark_all_uncovered()
                 graph_evaluation.generation_comment = "Cycle found in graph, skipping"
             return None
-        except nx.exception.NetworkXNoCycle:
-            pass
 
 
         # try to find the root if it's not passed in
         if root is None:
-            try:
-                root = POGGGraphUtil.find_root(graph)
-            except ValueError as err:
-                graph_evaluation.generation_comment = err.args[0]
-                root = None
+            root = graph_analysis.root
+            if graph_analysis.root_error is not None:
+                graph_evaluation.generation_comment = graph_analysis.root_error
         # if it's STILL none...
         if root is None:
             # mark all nodes and edges as not covered
@@ -305,33 +440,83 @@ class POGGGraphConverter:
         # root comes in as a tuple with name first and properties second: ('cake', {'lexicon_key: 'cake'})
         root_name = root[0]
 
-        # get SEMENT for root
+        if self.memoize_subgraphs:
+            if subgraph_SEMENTs is None:
+                subgraph_SEMENTs = {}
+            # subgraph was already converted for another parent, just hand out a copy
+            elif root_name in subgraph_SEMENTs:
+                return self._decode_with_fresh_variables(subgraph_SEMENTs[root_name])
+
+        # walk the graph with an explicit stack instead of recursing on each child, so deep graphs don't hit the recursion limit
+        # each node is converted when it's pushed, and each edge is composed once the child's subgraph is finished,
+        # so conversions and compositions happen in the same order as a recursive depth-first traversal
+        stack = [self._start_conversion_frame(graph, graph_evaluation, root)]
+        while True:
+            frame = stack[-1]
+            child = next(frame.children, None)
+
+            if child is not None:
+                frame.child = child
+                if self.memoize_subgraphs and child in subgraph_SEMENTs:
+                    # subgraph was already converted for another parent, just compose a copy
+                    child_sement = self._decode_with_fresh_variables(subgraph_SEMENTs[child])
+                    self._compose_child_SEMENT(graph, graph_evaluation, frame, child_sement)
+                else:
+                    # get node properties for child and convert to tuple
+                    child_with_props = (child, graph.nodes[child])
+                    stack.append(self._start_conversion_frame(graph, graph_evaluation, child_with_props))
+                continue
+
+            # every child of this node has been composed, so its subgraph is finished
+            stack.pop()
+            if self.memoize_subgraphs:
+                # store it encoded, since the parent's composition may change the SEMENT returned here
+                subgraph_SEMENTs[frame.node_name] = sementcodecs.encode(frame.sement) if frame.sement is not None else None
+
+            if not stack:
+                return frame.sement
+
+            # perform composition between parent and the finished child subgraph
+            self._compose_child_SEMENT(graph, graph_evaluation, stack[-1], frame.sement)
+
+    def _start_conversion_frame(self, graph, graph_evaluation, node):
+        # get SEMENT for the node that roots this subgraph
         if graph_evaluation is not None:
-            node_evaluation = graph_evaluation.get_node_evaluation(root_name)
+            node_evaluation = graph_evaluation.get_node_evaluation(node[0])
         else:
             node_evaluation = None
 
         # attempt to convert node to SEMENT
-        latest_sement = self.convert_node_to_SEMENT(root, node_evaluation)
-
-        # recurse on each child
-        for child in graph.successors(root_name):
-            # get node properties for child
-            child_properties = graph.nodes[child]
-            # convert to tuple
-            child_with_props = (child, child_properties)
-            # get SEMENT for child by recursing on it as a subgraph
-            child_sement = self.convert_graph_to_SEMENT(graph, graph_evaluation, child_with_props)
-            # get edge information between current root (parent) and child
-            edge_data = graph.get_edge_data(root_name, child)
-
-            # perform composition between parent and child
-            if graph_evaluation is not None:
-                edge_evaluation = graph_evaluation.get_edge_evaluation(root_name, child, edge_data)
-            else:
-                edge_evaluation = None
+        sement = self.convert_node_to_SEMENT(node, node_evaluation, use_SEMENT_cache=self.cache_node_SEMENTs)
+        return _POGGConversionFrame(node[0], sement, iter(graph.successors(node[0])))
+
+    def _compose_child_SEMENT(self, graph, graph_evaluation, frame, child_sement):
+        # get edge information between current parent and child
+        edge_data = graph.get_edge_data(frame.node_name, frame.child)
+
+        if graph_evaluation is not None:
+            edge_evaluation = graph_evaluation.get_edge_evaluation(frame.node_name, frame.child, edge_data)
+        else:
+            edge_evaluation = None
+
+        frame.sement = self.convert_edge_to_SEMENT(edge_data, frame.sement, child_sement, edge_evaluation)
+
+    def _decode_with_fresh_variables(self, sement_str):
+        # decode an encoded SEMENT, renaming every variable and handle to one that no other SEMENT has
+        # the conversion of a subgraph can fail, in which case there's nothing to copy
+        if sement_str is None:
+            return None
 
-            latest_sement = self.convert_edge_to_SEMENT(edge_data, latest_sement, child_sement, edge_evaluation)
+        new_variables = {}
 
+        def rename(match):
+            if match.group(1) is None:
+                # quoted string
+                return match.group(0)
+            if match.group(0) not in new_variables:
+                # same type, new number
+                new_variables[match.group(0)] = f"{match.group(1)}{self._next_fresh_variable}"
+                self._next_fresh_variable += 1
+            return new_variables[match.group(0)]
 
-        return latest_sement
\ No newline at end of file
+        return sementcodecs.decode(self._variable_pattern.sub(rename, sement_str))
\ No newline at end of file
@@ -1,7 +1,7 @@
 import re
 import copy
-from itertools import permutations
 import json
+from concurrent.futures import ProcessPoolExecutor
 from delphin import ace, mrs
 
 from pogg_semantics.pogg_config import POGGCompositionConfig
@@ -9,10 +9,28 @@ from pogg_semantics.my_delphin import sementcodecs
 from pogg_semantics.semantic_composition import SemanticAlgebra, SEMENTUtil
 
 from pogg.graph_to_SEMENT import POGGGraphConverter
+from pogg.ace_processing import POGGACEPool, POGGACEUtil, POGGParseCache
 
 from pogg.lexicon._lexicon_entry import POGGLexiconEntry
 
 
+# auto filler held by each worker process when entries are matched in parallel (see POGGLexiconAutoFiller.auto_fill_entries)
+_worker_auto_filler = None
+
+
+def _initialize_auto_fill_worker(composition_config, templates_json):
+    global _worker_auto_filler
+    # the worker never parses, since the MRS strings are sent along with each entry
+    _worker_auto_filler = POGGLexiconAutoFiller(composition_config, [], [])
+    for template_key, template_json in templates_json.items():
+        _worker_auto_filler._add_template(template_key, template_json)
+
+
+def _match_templates_in_worker(entry_info):
+    to_parse, blocked_templates, attempted_templates, mrs_strings = entry_info
+    return _worker_auto_filler._match_templates(to_parse, blocked_templates, attempted_templates, {to_parse: mrs_strings})
+
+
 class POGGLexiconAutoFiller:
     def __init__(self, composition_config,
                  template_files,
@@ -20,8 +38,12 @@ class POGGLexiconAutoFiller:
                  auto_approve=False,
                  string_processing_fxn=None,
                  dump_file=None,
-                 auto_create_templates=False):
+                 auto_create_templates=False,
+                 parser_pool_size=1,
+                 parse_cache_dir=None):
 
+        # kept to set up worker processes (see auto_fill_entries)
+        self.composition_config_source = composition_config
         if isinstance(composition_config, POGGCompositionConfig):
             self.composition_config = composition_config
         else:
@@ -42,6 +64,23 @@ class POGGLexiconAutoFiller:
         self.dump_file = dump_file
         self.auto_create_templates = auto_create_templates
 
+        # ERG parser processes are started the first time a string is parsed and kept open for every entry after that
+        # call close() when done auto-filling to shut them down
+        self.parser_pool = POGGACEPool(self.composition_config.grammar_location, ace.ACEParser,
+                                       pool_size=parser_pool_size)
+        # parses from earlier runs, so strings that were already parsed with this grammar skip ACE
+        self.parse_cache = POGGParseCache(parse_cache_dir) if parse_cache_dir is not None else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        # shut down the ERG parser processes
+        self.parser_pool.close()
 
     def _read_templates_from_file(self, template_file: str):
         try:
@@ -56,14 +95,21 @@ class POGGLexiconAutoFiller:
             templates_json = {}
 
         for template_key in templates_json:
-            template  = {
-                "example": templates_json[template_key]["example"],
-                "lexical_entry_template": templates_json[template_key]["lexical_entry_template"],
-                "lexical_entry": POGGLexiconEntry(template_key, templates_json[template_key]["lexical_entry_template"]),
-                "placeholders": self._determine_template_placeholders(templates_json[template_key]["lexical_entry_template"], []),
-                # "SEMENT_str": templates_json[template_key]["SEMENT_str"]
-            }
-            self.templates[template_key] = template
+            self._add_template(template_key, templates_json[template_key])
+
+    def _add_template(self, template_key, template_json):
+        template  = {
+            "example": template_json["example"],
+            "lexical_entry_template": template_json["lexical_entry_template"],
+            "lexical_entry": POGGLexiconEntry(template_key, template_json["lexical_entry_template"]),
+            "placeholders": self._determine_template_placeholders(template_json["lexical_entry_template"], []),
+            # "SEMENT_str": templates_json[template_key]["SEMENT_str"]
+        }
+        # worker processes are sent the SEMENT and signature already built for the template (see auto_fill_entries)
+        for key in ("SEMENT_str", "structural_signature"):
+            if key in template_json:
+                template[key] = template_json[key]
+        self.templates[template_key] = template
 
     def _determine_template_placeholders(self, template_entry, placeholders_list):
         for key in template_entry.keys():
@@ -99,25 +145,67 @@ class POGGLexiconAutoFiller:
 
         return template_mrs
 
-    def _get_ERG_parse_MRSes(self, to_parse):
+    @staticmethod
+    def _get_structural_signature(sement):
+        # cheap summary of a SEMENT's shape that doesn't depend on predicate labels or variable names
+        # SEMENTs with different signatures can never be isomorphic: number of EPs, the argument roles of each EP,
+        # and number of handle constraints
+        # CARG is left out, since its value is a placeholder in the template and a string in the ERG parse
+        arg_roles = sorted(tuple(sorted(role for role in rel.args if role != "CARG")) for rel in sement.rels)
+        return len(sement.rels), tuple(arg_roles), len(sement.hcons)
+
+    def _get_template_signature(self, template):
+        # computed once per template and stored on it like SEMENT_str
+        if "structural_signature" not in template:
+            template["structural_signature"] = self._get_structural_signature(self._get_template_SEMENT(template))
+        return template["structural_signature"]
+
+    def _parse_strings(self, strings_to_parse):
+        # get the ERG parses of several strings at once, spread over the parser pool
+        # returns each string mapped to the MRS strings of its parses
+        strings_to_parse = list(strings_to_parse)
+        parsed_strings = {}
+        cache_keys = {}
+        if self.parse_cache is not None:
+            grammar_fingerprint = POGGACEUtil.grammar_fingerprint(self.composition_config.grammar_location)
+            for to_parse in strings_to_parse:
+                if to_parse in cache_keys:
+                    continue
+                cache_keys[to_parse] = POGGParseCache.make_key(to_parse, grammar_fingerprint, self.parser_pool.cmdargs)
+                mrs_strings = self.parse_cache.get(cache_keys[to_parse])
+                if mrs_strings is not None:
+                    parsed_strings[to_parse] = mrs_strings
+
+        # only strings that weren't in the cache go to ACE
+        strings_to_parse = [to_parse for to_parse in dict.fromkeys(strings_to_parse) if to_parse not in parsed_strings]
+        parser_responses = self.parser_pool.interact_batch(strings_to_parse)
+        for to_parse, parser_response in zip(strings_to_parse, parser_responses):
+            parsed_strings[to_parse] = [r['mrs'] for r in parser_response.results()]
+            # a parse that ran into an error (e.g. a timeout or memory limit) may work next time, so only cache clean ones
+            if self.parse_cache is not None and not parser_response.get('errors'):
+                self.parse_cache.put(cache_keys[to_parse], parsed_strings[to_parse])
+        return parsed_strings
+
+    def _get_ERG_parse_MRSes(self, to_parse, parsed_strings=None):
         # get the ERG parse for a node to attempt to match against a template
-        # just return the first result
-        with ace.ACEParser(self.composition_config.grammar_location) as parser:
-            parser_response = parser.interact(to_parse)
+        # use the parses from _parse_strings if the string was parsed ahead of time
+        if parsed_strings is None or to_parse not in parsed_strings:
+            parsed_strings = self._parse_strings([to_parse])
+        mrs_strings = parsed_strings[to_parse]
 
-            # if there's a parser issue, just skip it
-            try:
-                mrs_objs = [sementcodecs.decode(r['mrs']) for r in parser_response.results()]
-            except mrs._exceptions.MRSSyntaxError as e:
-                return []
-
-            for mrs_obj in mrs_objs:
-                # replace all quantifiers with abstract_q
-                # the generic quantifiers i use do not match the ERG output usually
-                for rel in mrs_obj.rels:
-                    if rel.predicate.endswith("_q"):
-                        rel.predicate = "abstract_q"
-            return mrs_objs
+        # if there's a parser issue, just skip it
+        try:
+            mrs_objs = [sementcodecs.decode(mrs_string) for mrs_string in mrs_strings]
+        except mrs._exceptions.MRSSyntaxError as e:
+            return []
+
+        for mrs_obj in mrs_objs:
+            # replace all quantifiers with abstract_q
+            # the generic quantifiers i use do not match the ERG output usually
+            for rel in mrs_obj.rels:
+                if rel.predicate.endswith("_q"):
+                    rel.predicate = "abstract_q"
+        return mrs_objs
 
     def _get_filler_candidates(self, erg_mrs):
         # look through the MRS for potential candidates that could fill in placeholders in the template
@@ -143,49 +231,101 @@ class POGGLexiconAutoFiller:
 
         return placeholder_candidates
 
-    def _get_filler_mapping_candidates(self, template, placeholder_filler_candidates):
-        # get a list of possible mappings e.g.
-        """[{
+    @staticmethod
+    def _get_pos(predicate_or_carg):
+        # part of speech label of a predicate (e.g. "n" in _cat_n_1), or None if there isn't one (e.g. CARG values)
+        try:
+            return re.match(r".*_([a-z])(_.+)", predicate_or_carg).group(1)
+        except AttributeError:
+            return None
+
+    @staticmethod
+    def _get_predicate_arg_roles(sement):
+        # predicate -> set of the argument roles (minus CARG) of each EP with that predicate
+        predicate_arg_roles = {}
+        for rel in sement.rels:
+            predicate_arg_roles.setdefault(rel.predicate, set()).add(
+                tuple(sorted(role for role in rel.args if role != "CARG")))
+        return predicate_arg_roles
+
+    def _get_filler_mapping_candidates(self, template, placeholder_filler_candidates, template_SEMENT=None, erg_mrs=None):
+        # generate the possible mappings one at a time, e.g.
+        """{
             "template_placeholder_1": "filler_candidate1"
             "template_placeholder_2": "filler_candidate2"
         },
         {
             "template_placeholder_1": "filler_candidate2"
             "template_placeholder_2": "filler_candidate1"
-        }]
+        }
         """
-        # create a list of acceptable mappings
-        mapping_candidates = []
-
-        # get permutations of placeholder_candidates where length matches the # of placeholders
-        placeholder_perms = permutations(placeholder_filler_candidates, len(template["placeholders"]))
-
-        for perm in placeholder_perms:
-            mapping = {}
-            for i, placeholder in enumerate(sorted(template["placeholders"])):
-                candidate_filler = perm[i]
-
-                # try to get pos labels
-                try:
-                    placeholder_pos = re.match(r".*_([a-z])(_.+)", placeholder).group(1)
-                except AttributeError:
-                    placeholder_pos = None
-
-                try:
-                    candidate_filler_pos = re.match(r".*_([a-z])(_.+)", candidate_filler).group(1)
-                except AttributeError:
-                    candidate_filler_pos = None
+        # each placeholder gets a different filler candidate with the same pos
+        # mappings come out in the same order as going through the permutations of the filler candidates would give them,
+        # but a placeholder is only ever tried with candidates that can fill it, so dead ends are cut off right away
+        # and the same mapping isn't generated twice when a candidate shows up more than once
+        placeholders = sorted(set(template["placeholders"]))
+        if not placeholders:
+            yield {}
+            return
 
-                # check that the candidate_filler from the permutation
-                # is legitimate for the placeholder in the template (i.e. pos should match)
-                if placeholder_pos == candidate_filler_pos:
-                    mapping[placeholder] = candidate_filler
-                else:
+        # if the SEMENTs are given, a placeholder used as a predicate can only be filled by a predicate
+        # that the ERG MRS has on EPs with the same argument roles, otherwise the filled SEMENT can't be isomorphic
+        placeholder_arg_roles = {}
+        erg_arg_roles = {}
+        if template_SEMENT is not None and erg_mrs is not None:
+            placeholder_arg_roles = self._get_predicate_arg_roles(template_SEMENT)
+            erg_arg_roles = self._get_predicate_arg_roles(erg_mrs)
+
+        # indices of the filler candidates that can fill each placeholder, in the order the candidates come in
+        candidate_indices = []
+        for placeholder in placeholders:
+            placeholder_pos = self._get_pos(placeholder)
+            indices = []
+            for i, candidate_filler in enumerate(placeholder_filler_candidates):
+                # check that the candidate_filler is legitimate for the placeholder in the template (i.e. pos should match)
+                if self._get_pos(candidate_filler) != placeholder_pos:
                     continue
-            if len(mapping.keys()) == len(template["placeholders"]):
-                mapping_candidates.append(mapping)
+                if placeholder in placeholder_arg_roles and not placeholder_arg_roles[placeholder] <= erg_arg_roles.get(candidate_filler, set()):
+                    continue
+                indices.append(i)
+            # no candidate for this placeholder, so no mapping at all
+            if not indices:
+                return
+            candidate_indices.append(indices)
+
+        # depth-first search over the placeholders in order, with an explicit stack
+        mapping = {}
+        used_indices = set()
+        # each stack entry is the position in the placeholder's candidate list to try next,
+        # and the candidates already tried for that placeholder (so repeated candidates aren't tried again)
+        stack = [[0, set()]]
+        while stack:
+            depth = len(stack) - 1
+            position, tried_fillers = stack[-1]
+            indices = candidate_indices[depth]
+
+            # undo the previous choice for this placeholder, if there was one
+            if placeholders[depth] in mapping:
+                used_indices.discard(mapping.pop(placeholders[depth])[1])
+
+            # find the next candidate for this placeholder
+            while position < len(indices) and (indices[position] in used_indices or
+                                               placeholder_filler_candidates[indices[position]] in tried_fillers):
+                position += 1
+            if position == len(indices):
+                stack.pop()
+                continue
 
-        return mapping_candidates
+            candidate_index = indices[position]
+            stack[-1][0] = position + 1
+            tried_fillers.add(placeholder_filler_candidates[candidate_index])
+            mapping[placeholders[depth]] = (placeholder_filler_candidates[candidate_index], candidate_index)
+            used_indices.add(candidate_index)
+
+            if depth + 1 == len(placeholders):
+                yield {placeholder: filler for placeholder, (filler, _) in mapping.items()}
+            else:
+                stack.append([0, set()])
 
     def _find_correct_placeholder_mapping(self, template, erg_mrs):
         if erg_mrs is not None:
@@ -195,11 +335,8 @@ class POGGLexiconAutoFiller:
 
                 placeholder_candidates = self._get_filler_candidates(erg_mrs)
 
-                # create a list of acceptable mappings
-                mapping_candidates = self._get_filler_mapping_candidates(template, placeholder_candidates)
-
-                # attempt full isomorphism with all mapping_candidates
-                for mapping in mapping_candidates:
+                # attempt full isomorphism with each acceptable mapping, stopping at the first one that works
+                for mapping in self._get_filler_mapping_candidates(template, placeholder_candidates, template_SEMENT, erg_mrs):
                     altered_template_SEMENT = self._fill_placeholders(template_SEMENT, mapping)
 
                     # ignore var props
@@ -227,40 +364,136 @@ class POGGLexiconAutoFiller:
 
         return filled_in_template
 
-    def _find_and_fill_template(self, lexicon_entry):
+    def _find_and_fill_template(self, lexicon_entry, parsed_strings=None):
+        # returns the name of the template used to fill the entry, or None if no template matched
+        match = self._match_templates(lexicon_entry.string_to_parse, lexicon_entry.blocked_templates,
+                                      lexicon_entry.attempted_templates, parsed_strings)
+        return self._apply_template_match(lexicon_entry, match)
 
-        erg_MRSes = self._get_ERG_parse_MRSes(lexicon_entry.string_to_parse)
+    def _match_templates(self, to_parse, blocked_templates, attempted_templates, parsed_strings=None):
+        # find the first template that matches an ERG parse of the string, without changing the lexicon entry
+        # returns the template name and filled in template (both None if no template matched)
+        # and the templates that were attempted, to be added to the entry by _apply_template_match
+        erg_MRSes = self._get_ERG_parse_MRSes(to_parse, parsed_strings)
+        erg_MRS_signatures = [self._get_structural_signature(erg_MRS) for erg_MRS in erg_MRSes]
 
+        newly_attempted = []
         for template_name, template in self.templates.items():
-            for erg_MRS in erg_MRSes:
+            for erg_MRS, erg_MRS_signature in zip(erg_MRSes, erg_MRS_signatures):
 
                 # skip blocked/already attempted templates
-                if template_name in lexicon_entry.blocked_templates or template_name in lexicon_entry.attempted_templates:
+                if template_name in blocked_templates or template_name in attempted_templates:
+                    continue
+
+                # only run the isomorphism checks against parses with the same shape as the template
+                if erg_MRS_signature != self._get_template_signature(template):
                     continue
 
                 mapping = self._find_correct_placeholder_mapping(template, erg_MRS)
 
                 if mapping is not None:
-                    print(f"AUTO FILLING {lexicon_entry.key} with {template_name}...")
-                    filled_template = self._fill_template(template, mapping)
-                    lexicon_entry.entry_in_dict_format = filled_template
-                    lexicon_entry.template_used = template_name
-                    lexicon_entry.auto_filled = True
-                    lexicon_entry.validate_entry()
-                    lexicon_entry.check_entry_completion()
-
-                    if self.auto_approve:
-                        print(f"...... auto-approve ON ... approved {lexicon_entry.key}...")
-                        lexicon_entry.approved = True
-
                     # add as an attempt when it works
-                    lexicon_entry.attempted_templates.add(template_name)
-                    return
+                    newly_attempted.append(template_name)
+                    return template_name, self._fill_template(template, mapping), newly_attempted
 
             # add template to attempted templates
-            lexicon_entry.attempted_templates.add(template_name)
+            newly_attempted.append(template_name)
+        return None, None, newly_attempted
+
+    def _apply_template_match(self, lexicon_entry, match):
+        # fill in the lexicon entry with the result of _match_templates and return the name of the template used
+        template_name, filled_template, newly_attempted = match
+        if template_name is not None:
+            lexicon_entry.entry_in_dict_format = filled_template
+            lexicon_entry.template_used = template_name
+            lexicon_entry.auto_filled = True
+            lexicon_entry.validate_entry()
+            lexicon_entry.check_entry_completion()
+
+            if self.auto_approve:
+                lexicon_entry.approved = True
+
+        lexicon_entry.attempted_templates.update(newly_attempted)
+        return template_name
+
+    def auto_fill_entry(self, lexicon_entry: POGGLexiconEntry, progress_fxn=None):
+        self.auto_fill_entries([lexicon_entry], progress_fxn=progress_fxn)
+
+    def auto_fill_entries(self, lexicon_entries, workers=1, progress_fxn=None):
+        # auto fill several entries, parsing all their strings up front so they're spread over the parser pool
+        # with workers > 1, template matching for different entries runs in a pool of processes,
+        # each with its own copy of the templates, and the matches are applied to the entries in the order given
+        # progress_fxn is called with a progress event (see _create_progress_event) as each entry finishes
+        if progress_fxn is None:
+            progress_fxn = self.print_progress
+
+        lexicon_entries = list(lexicon_entries)
+        completed = 0
+        entries_to_fill = []
+        for lexicon_entry in lexicon_entries:
+            if self._prepare_entry(lexicon_entry):
+                entries_to_fill.append(lexicon_entry)
+            else:
+                completed += 1
+                progress_fxn(self._create_progress_event(lexicon_entry, "skipped", None, completed, len(lexicon_entries)))
+        if not entries_to_fill:
+            return
+
+        parsed_strings = self._parse_strings(lexicon_entry.string_to_parse for lexicon_entry in entries_to_fill)
 
-    def auto_fill_entry(self, lexicon_entry: POGGLexiconEntry):
+        if workers > 1:
+            # template SEMENTs and signatures are built the first time they're needed and stored on the template,
+            # so build them all once here and send them to the workers instead of building them in every worker
+            templates_json = {}
+            for template_key, template in self.templates.items():
+                self._get_template_signature(template)
+                templates_json[template_key] = {key: template[key] for key in
+                                                ("example", "lexical_entry_template", "SEMENT_str", "structural_signature")}
+
+            entry_infos = [(lexicon_entry.string_to_parse, lexicon_entry.blocked_templates, lexicon_entry.attempted_templates,
+                            parsed_strings[lexicon_entry.string_to_parse]) for lexicon_entry in entries_to_fill]
+            chunksize = max(1, len(entry_infos) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_auto_fill_worker,
+                                     initargs=(self.composition_config_source, templates_json)) as executor:
+                # map yields results in submission order, so the entries are filled in the order given
+                matches = executor.map(_match_templates_in_worker, entry_infos, chunksize=chunksize)
+                for lexicon_entry, match in zip(entries_to_fill, matches):
+                    template_name = self._apply_template_match(lexicon_entry, match)
+                    completed += 1
+                    progress_fxn(self._create_progress_event(lexicon_entry, "auto_filled" if template_name else "not_filled",
+                                                             template_name, completed, len(lexicon_entries)))
+        else:
+            for lexicon_entry in entries_to_fill:
+                template_name = self._find_and_fill_template(lexicon_entry, parsed_strings)
+                completed += 1
+                progress_fxn(self._create_progress_event(lexicon_entry, "auto_filled" if template_name else "not_filled",
+                                                         template_name, completed, len(lexicon_entries)))
+
+    @staticmethod
+    def _create_progress_event(lexicon_entry, status, template_name, completed, total):
+        # status is "skipped" (all templates blocked or attempted), "auto_filled", or "not_filled" (no template matched)
+        return {
+            "lexicon_key": lexicon_entry.key,
+            "status": status,
+            "template": template_name,
+            "approved": lexicon_entry.approved,
+            "completed": completed,
+            "total": total,
+        }
+
+    @staticmethod
+    def print_progress(progress_event):
+        # default progress_fxn, prints the same messages as before along with how many entries are done
+        progress = f"[{progress_event['completed']}/{progress_event['total']}]"
+        if progress_event["status"] == "skipped":
+            print(f"{progress} All templates blocked or attempted for '{progress_event['lexicon_key']}'... skipping...")
+        elif progress_event["status"] == "auto_filled":
+            print(f"{progress} AUTO FILLING {progress_event['lexicon_key']} with {progress_event['template']}...")
+            if progress_event["approved"]:
+                print(f"...... auto-approve ON ... approved {progress_event['lexicon_key']}...")
+
+    def _prepare_entry(self, lexicon_entry):
+        # returns False if the entry should be skipped, otherwise sets the string to parse and returns True
         # skip if "blocked_templates" says "all"
         # or skip if all templates have been marked as blocked or attempted
         blocked_and_attempted = copy.copy(lexicon_entry.blocked_templates)
@@ -273,8 +506,7 @@ class POGGLexiconAutoFiller:
         if ("all" in lexicon_entry.blocked_templates or
                 (lexicon_entry.template_used != "" and lexicon_entry.template_used not in lexicon_entry.blocked_templates)
                 or len(blocked_and_attempted) == len(self.templates)):
-            print(f"All templates blocked or attempted for '{lexicon_entry.key}'... skipping...")
-            return
+            return False
 
         # if a string is already provided in the entry, use that
         if lexicon_entry.string_to_parse == "":
@@ -282,8 +514,7 @@ class POGGLexiconAutoFiller:
                 lexicon_entry.string_to_parse = self.string_processing_fxn(lexicon_entry.key)
             else:
                 lexicon_entry.string_to_parse = lexicon_entry.key
-
-        self._find_and_fill_template(lexicon_entry)
+        return True
 
 
     def _compare_lexical_entry_structures(self, template_entry, new_entry_dict):
@@ -30,6 +30,11 @@ class POGGLexicon:
         # approved entries only
         self.node_entries = {}
         self.edge_entries = {}
+        # increases whenever update_lexicon_files changes the approved entries, so anything built from them can tell it's stale
+        self.version = 0
+        # compiled call plans for approved entries, stored with the entry they were compiled from (see get_call_plan)
+        self._node_call_plans = {}
+        self._edge_call_plans = {}
 
         self.auto_filler = auto_filler
 
@@ -47,6 +52,15 @@ class POGGLexicon:
         # read in information from directory (which already existed or was just initialized)
         self._read_from_directory()
 
+    def __getstate__(self):
+        # the dataset and auto filler are only needed to build and update the lexicon files,
+        # so leave them out when the lexicon is sent to a worker process
+        state = self.__dict__.copy()
+        state["dataset"] = None
+        state["top_data_split"] = None
+        state["auto_filler"] = None
+        return state
+
     def _initialize_lexicon_directory(self):
         # make lexicon dirs
         Path(self.directory).mkdir(parents=True, exist_ok=True)
@@ -159,6 +173,8 @@ class POGGLexicon:
         self.node_entries = approved_entries_dict["node_entries"]
         self.edge_entries = approved_entries_dict["edge_entries"]
 
+        self.compile_call_plans()
+
     def _import_lexicons(self):
         imported_node_entries = {}
         imported_edge_entries = {}
@@ -169,7 +185,30 @@ class POGGLexicon:
         return imported_node_entries, imported_edge_entries
 
 
-    def update_lexicon_files(self):
+    def update_lexicon_files(self, workers=1, progress_fxn=None):
+        """
+        Move completed entries from the workspace to the approved entries, try to fill in the rest, and write
+        the lexicon files.
+
+        Entries are filled in by the `auto_filler`, if there is one. With more than one worker, template matching
+        for different entries runs in parallel; the entries are still merged back in workspace order, so the lexicon files
+        are the same either way.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `workers` | `int` | number of worker processes to auto fill entries with | `1` |
+        | `progress_fxn` | `function` | called with a progress event `dict` (`lexicon_key`, `status`, `template`, `approved`, `completed`, and `total`) as each entry is auto filled; if `None`, progress is printed | `None` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `set` | lexicon keys of the approved node and edge entries that were added, removed, or replaced (see `POGGExperiment.rerun_affected`) |
+        """
+        approved_before = (dict(self.node_entries), dict(self.edge_entries))
+
+        # workspace entries that aren't approved yet
+        unapproved_node_entries = {}
         for node_key, node_entry in copy.deepcopy(self.workspace_node_entries).items():
             # if it's already approved, move it
             if node_entry.approved:
@@ -188,10 +227,15 @@ class POGGLexicon:
                 new_entry.blocked_templates = node_entry.blocked_templates
                 new_entry.attempted_templates = node_entry.attempted_templates
                 node_entry = new_entry
+            unapproved_node_entries[node_key] = node_entry
 
-            # if not, try auto filling
-            if self.auto_filler:
-                self.auto_filler.auto_fill_entry(node_entry)
+        # if not, try auto filling
+        # all the entries are parsed at once so the parses are spread over the auto filler's parser pool
+        if self.auto_filler:
+            self.auto_filler.auto_fill_entries(unapproved_node_entries.values(), workers, progress_fxn)
+
+        # merged back in workspace order, no matter what order the entries were filled in
+        for node_key, node_entry in unapproved_node_entries.items():
             # if it wasn't auto filled, expand it
             if not node_entry.auto_filled:
                 node_entry.expand_entry()
@@ -220,6 +264,64 @@ class POGGLexicon:
         self._dump_to_file(self.workspace_node_entries, self.workspace_edge_entries, self.workspace_file)
         self._dump_to_file(self.node_entries, self.edge_entries, self.approved_entries_file)
 
+        # approved entries are replaced with new objects when they change
+        changed_keys = set()
+        for entries, entries_before in zip((self.node_entries, self.edge_entries), approved_before):
+            changed_keys.update(entries.keys() ^ entries_before.keys())
+            changed_keys.update(key for key in entries.keys() & entries_before.keys()
+                                if entries[key] is not entries_before[key])
+        if changed_keys:
+            self.version += 1
+
+        self.compile_call_plans()
+
+        return changed_keys
+
+    def compile_call_plans(self):
+        """
+        Compile every approved entry into a `POGGCallPlan` (see `POGGLexiconEntry.compile_call_plan`).
+
+        This is done when the lexicon is read and after `update_lexicon_files`.
+        Entries that are replaced some other way are compiled the next time `get_call_plan` is called for them.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `None` | -- |
+        """
+        self._node_call_plans = {key: (entry, entry.compile_call_plan()) for key, entry in self.node_entries.items()}
+        self._edge_call_plans = {key: (entry, entry.compile_call_plan()) for key, entry in self.edge_entries.items()}
+
+    def get_call_plan(self, entry_type, lexicon_key):
+        """
+        Get the compiled `POGGCallPlan` for an approved entry.
+
+        **Parameters**
+        | Parameter | Type | Description | Example |
+        | --------- | ---- | ----------- | ------- |
+        | `entry_type` | `str` | `"node"` or `"edge"` | `"node"` |
+        | `lexicon_key` | `str` | key of the approved entry | `"cake"` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGCallPlan` | call plan for the entry, or `None` if the entry can't be compiled |
+
+        Raises a `KeyError` if there's no approved entry for the key.
+        """
+        if entry_type == "node":
+            entries, call_plans = self.node_entries, self._node_call_plans
+        else:
+            entries, call_plans = self.edge_entries, self._edge_call_plans
+
+        entry = entries[lexicon_key]
+        compiled = call_plans.get(lexicon_key)
+        # recompile if the entry was replaced since it was last compiled
+        if compiled is None or compiled[0] is not entry:
+            compiled = (entry, entry.compile_call_plan())
+            call_plans[lexicon_key] = compiled
+        return compiled[1]
+
     def _dump_to_file(self, node_entries, edge_entries, file):
         json_only = {
             "node_entries": {},
@@ -249,14 +351,15 @@ class POGGLexicon:
             "edge_entries": {}
         }
 
-        # start with given split
-        working_split = copy.deepcopy(split)
+        # start with given split's keys (only the keys are needed, so the split and its graphs aren't copied)
+        working_node_keys = set(split.node_keys)
+        working_edge_keys = set(split.edge_keys)
         if removal_splits:
             for removal_split in removal_splits:
-                working_split.node_keys = working_split.node_keys.difference(removal_split.node_keys)
-                working_split.edge_keys = working_split.edge_keys.difference(removal_split.edge_keys)
+                working_node_keys.difference_update(removal_split.node_keys)
+                working_edge_keys.difference_update(removal_split.edge_keys)
 
-        for node in working_split.node_keys:
+        for node in working_node_keys:
             # if already approved, skip
             if node in self.node_entries:
                 continue
@@ -264,7 +367,7 @@ class POGGLexicon:
                 new_workspace["node_entries"][node] = self.workspace_node_entries[node]
             else:
                 new_workspace["node_entries"][node] = self.all_node_entries[node]
-        for edge in working_split.edge_keys:
+        for edge in working_edge_keys:
             # if already approved, skip
             if edge in self.edge_entries:
                 continue
@@ -1,7 +1,6 @@
 import copy
-import inspect
 
-from pogg_semantics.semantic_composition import SemanticComposition
+from pogg.graph_to_SEMENT import POGGCompositionRegistry, POGGCallPlan
 
 class POGGLexiconEntry:
     def __init__(self, lexicon_key, entry_information=None):
@@ -136,8 +135,7 @@ class POGGLexiconEntry:
             node_entry.pop("failure_msg")
 
         try:
-            comp_fxn_obj = getattr(SemanticComposition, comp_fxn_name)
-            parameters = inspect.signature(comp_fxn_obj).parameters
+            parameters = POGGCompositionRegistry.get_parameters(comp_fxn_name)
 
             # check that the parameters in the node_entry are legitimate
             for key in node_entry.keys():
@@ -147,7 +145,7 @@ class POGGLexiconEntry:
                         raise KeyError(node_entry["failure_msg"], node_entry)
 
                     # if it is legitimate AND the type is SEMENT, validation needs to recurse
-                    elif parameters[key].annotation.__name__ == "SEMENT":
+                    elif parameters[key].is_SEMENT:
                         self._validate_node_entry(node_entry[key])
 
 
@@ -210,8 +208,7 @@ class POGGLexiconEntry:
             return True
 
         try:
-            comp_fxn_obj = getattr(SemanticComposition, comp_fxn_name)
-            parameters = inspect.signature(comp_fxn_obj).parameters
+            parameters = POGGCompositionRegistry.get_parameters(comp_fxn_name)
 
             # check that the parameters in the edge_entry are legitimate
             for key in edge_entry.keys():
@@ -221,7 +218,7 @@ class POGGLexiconEntry:
                         raise KeyError(edge_entry["failure_msg"], edge_entry)
 
                     # if it is legitimate AND the type is SEMENT, then the value should either be "parent" or "child"
-                    elif parameters[key].annotation.__name__ == "SEMENT":
+                    elif parameters[key].is_SEMENT:
                         # if the value is empty, it's not complete so just continue
                         if edge_entry[key] == "":
                             continue
@@ -285,27 +282,25 @@ class POGGLexiconEntry:
             return False
 
         # get parameters for the comp_fxn
-        comp_fxn_obj = getattr(SemanticComposition, comp_fxn_name)
-        parameters = inspect.signature(comp_fxn_obj).parameters
+        parameters = POGGCompositionRegistry.get_parameters(comp_fxn_name)
 
         # go through each parameter and check that it's (1) in the entry and (2) has a value
         for param_name in parameters.keys():
             # param_information includes the type of the parameter
             param_information = parameters[param_name]
 
-            # skip 'self' and optional parameters that AREN'T SEMENTs
+            # skip optional parameters that AREN'T SEMENTs ('self' isn't included in the parameters)
             # "advanced" users can use them if they want
             # TODO: way to turn this on or off?
-            if param_name == 'self' or (
-                    param_information.annotation.__name__ != "SEMENT" and param_information.default is not inspect.Parameter.empty):
+            if not param_information.is_SEMENT and param_information.optional:
                 continue
 
             # if the parameter from the signature is in the node entry...
             if param_name in node_entry.keys():
                 # recurse for SEMENT parameters
-                if param_information.annotation.__name__ == "SEMENT":
+                if param_information.is_SEMENT:
                     # if the SEMENT type parameter is optional and the value is set to None, keep going
-                    if param_information.default is not inspect.Parameter.empty and node_entry[param_name] is None:
+                    if param_information.optional and node_entry[param_name] is None:
                         continue
                     # if the SEMENT type parameter is NOT optional and has no value, entry is not complete
                     elif not self._check_node_entry_completion(node_entry[param_name]):
@@ -359,28 +354,22 @@ class POGGLexiconEntry:
             return False
 
         # get parameters for the comp_fxn
-        comp_fxn_obj = getattr(SemanticComposition, comp_fxn_name)
-        parameters = inspect.signature(comp_fxn_obj).parameters
+        parameters = POGGCompositionRegistry.get_parameters(comp_fxn_name)
 
         # go through each parameter and check that it's (1) in the entry and (2) has a value
         for param_name in parameters.keys():
             # param_information includes the type of the parameter
             param_information = parameters[param_name]
 
-            # skip 'self' and parameters with default values that AREN'T SEMENTs (e.g. intrinsic_variable_properties dict)
-            # 'advanced' users can add them if they want
+            # 'self' isn't included in the parameters, so every parameter is checked
+            # (including parameters with default values that AREN'T SEMENTs, e.g. intrinsic_variable_properties dict)
             # TODO: toggle?
-            # if param_name == 'self' or (param_information.annotation.__name__ != "SEMENT" and param_information.default is not inspect.Parameter.empty):
-            if param_name == 'self':
-                continue
-
             if param_name in edge_entry.keys():
                 # if it's empty
                 if edge_entry[param_name] == "":
                     return False
                 # if it's a SEMENT type parameter with a default value and the lexicon says "None" then keep going
-                elif (param_information.annotation.__name__ == "SEMENT" and param_information.default is not inspect.Parameter.empty
-                    and edge_entry[param_name] is None):
+                elif param_information.is_SEMENT and param_information.optional and edge_entry[param_name] is None:
                     continue
                 # if it introduces its own SEMENT
                 elif isinstance(edge_entry[param_name], dict):
@@ -457,26 +446,21 @@ class POGGLexiconEntry:
             return node_entry
 
         # get parameters for the comp_fxn
-        comp_fxn_obj = getattr(SemanticComposition, comp_fxn_name)
-        parameters = inspect.signature(comp_fxn_obj).parameters
+        parameters = POGGCompositionRegistry.get_parameters(comp_fxn_name)
 
         # expand entry using parameters
         for param_name in parameters.keys():
             # param_information includes the type of the parameter
             param_information = parameters[param_name]
 
-            # skip 'self' and optional parameters that aren't SEMENTs (e.g. intrinsic_variable_properties dict)
-            # if param_name == 'self' or (param_information.annotation.__name__ != "SEMENT" and param_information.default is not inspect.Parameter.empty):
-            # EDIT: putting optional ones back
-            if param_name == 'self':
-                continue
+            # optional parameters are included too ('self' isn't included in the parameters)
             # if the param_name is not in the entry, add it with an appropriate "empty" value for the user to fill in
-            elif param_name not in node_entry:
+            if param_name not in node_entry:
                 # if parameter's type is SEMENT then it requires its own composition
-                if param_information.annotation.__name__ == "SEMENT":
+                if param_information.is_SEMENT:
                     node_entry[param_name] = {"comp_fxn": ""}
                 # if parameter's type is dict insert empty dict
-                elif param_information.annotation.__name__ == "dict":
+                elif param_information.annotation_name == "dict":
                     node_entry[param_name] = {}
                 # otherwise insert empty string
                 else:
@@ -486,7 +470,7 @@ class POGGLexiconEntry:
             # e.g., if the top level comp_fxn is "prenominal_adjective"
             # then the parameters (adjective_sement, nominal_sement) will themselves to be expanded with comp_fxn info
             else:
-                if param_information.annotation.__name__ == "SEMENT":
+                if param_information.is_SEMENT:
                     self._expand_node_entry(node_entry[param_name])
                 else:
                     pass
@@ -558,26 +542,21 @@ class POGGLexiconEntry:
             return edge_entry
 
         # get parameters for the comp_fxn
-        comp_fxn_obj = getattr(SemanticComposition, comp_fxn_name)
-        parameters = inspect.signature(comp_fxn_obj).parameters
+        parameters = POGGCompositionRegistry.get_parameters(comp_fxn_name)
 
         # expand entry using parameters
         for param_name in parameters.keys():
             # param_information includes the type of the parameter
             param_information = parameters[param_name]
 
-            # skip 'self' and optional parameters that aren't SEMENTs (e.g. intrinsic_variable_properties dict)
-            # if param_name == 'self' or (param_information.annotation.__name__ != "SEMENT" and param_information.default is not inspect.Parameter.empty):
-            # EDIT: putting optional parameters back
-            if param_name == 'self':
-                continue
+            # optional parameters are included too ('self' isn't included in the parameters)
             # if the param_name is not in the entry, add it with an appropriate "empty" value for the user to fill in
-            elif param_information.annotation.__name__ == "dict":
+            if param_information.annotation_name == "dict":
                 edge_entry[param_name] = {}
             elif param_name not in edge_entry:
                 edge_entry[param_name] = ""
             # if it is in the entry, the type is SEMENT, and the value is not "parent" or "child", recurse down for further expansion
-            elif (param_information.annotation.__name__ == "SEMENT"
+            elif (param_information.is_SEMENT
                   and not (edge_entry[param_name] == "parent" or edge_entry[param_name] == "child")):
                 self._expand_edge_entry(edge_entry[param_name])
             else:
@@ -585,6 +564,64 @@ class POGGLexiconEntry:
 
         return edge_entry
 
+    def compile_call_plan(self):
+        """
+        Compile the entry into a `POGGCallPlan` that `POGGGraphConverter` can run without copying the entry's parameters.
+
+        For edge entries, `"parent"` and `"child"` values are resolved to the parent and child SEMENTs when the plan runs.
+        If the entry can't be compiled (e.g. it's incomplete or invalid), `None` is returned and the converter
+        uses the entry's parameters directly, so the same errors are reported as before.
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGCallPlan` | call plan for the entry, or `None` if the entry can't be compiled |
+        """
+        try:
+            return self._compile_call_plan(self.composition_function_name, self.parameters, self.entry_type == "edge")
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
+    def _compile_call_plan(self, comp_fxn_name, given_parameters, edge):
+        # raises an AttributeError if comp_fxn_name is not a composition function
+        defined_parameters = POGGCompositionRegistry.get_parameters(comp_fxn_name)
+
+        # SEMENTs an edge introduces itself are built before the edge's own comp_fxn is called (in the entry's order)
+        edge_SEMENTs = []
+        if edge:
+            for key, val in given_parameters.items():
+                if isinstance(val, POGGLexiconEntry):
+                    edge_SEMENTs.append((key, self._compile_call_plan(val.composition_function_name, val.parameters, False)))
+
+        arguments = []
+        for key, param_information in defined_parameters.items():
+            if key not in given_parameters:
+                # if the parameter isn't in the entry but the function has a default value, just use that
+                if param_information.optional:
+                    arguments.append((key, POGGCallPlan.DEFAULT, param_information.default))
+                    continue
+                raise KeyError(f"The parameter '{key}' is not defined in the lexicon entry")
+
+            val = given_parameters[key]
+            if edge and isinstance(val, str) and val == "parent":
+                arguments.append((key, POGGCallPlan.PARENT, None))
+            elif edge and isinstance(val, str) and val == "child":
+                arguments.append((key, POGGCallPlan.CHILD, None))
+            elif edge and isinstance(val, POGGLexiconEntry):
+                arguments.append((key, POGGCallPlan.EDGE_SEMENT, None))
+            # SEMENT parameters that are required or have a value must be built by a nested comp_fxn
+            elif param_information.is_SEMENT and (not param_information.optional or val):
+                if not isinstance(val, POGGLexiconEntry):
+                    raise ValueError(f"The parameter '{key}' of {comp_fxn_name} has no comp_fxn to build its SEMENT")
+                arguments.append((key, POGGCallPlan.NESTED,
+                                  self._compile_call_plan(val.composition_function_name, val.parameters, False)))
+            elif isinstance(val, (dict, list, set)):
+                arguments.append((key, POGGCallPlan.MUTABLE_LITERAL, val))
+            else:
+                arguments.append((key, POGGCallPlan.LITERAL, val))
+
+        return POGGCallPlan(comp_fxn_name, tuple(arguments), tuple(edge_SEMENTs))
+
     def _convert_dict_format_to_POGGLexiconEntry_objects(self, dict_key=None, dict_entry=None):
 
         if dict_key is None:
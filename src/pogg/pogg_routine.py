@@ -8,6 +8,8 @@ import copy
 import os
 from typing import List
 import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util as mp_util
 from pathlib import Path
 import json
 import re
@@ -19,8 +21,9 @@ from pogg_semantics.semantic_composition import SemanticAlgebra, SemanticComposi
 
 from pogg.lexicon import POGGLexicon, POGGLexiconAutoFiller
 from pogg.data_handling import POGGDataset, POGGDataSplit, POGGGraphUtil
-from pogg.evaluation import POGGEvaluation, POGGGraphEvaluation, POGGGraphReporting, POGGDatasetReporting
+from pogg.evaluation import POGGEvaluation, POGGGraphEvaluation, POGGGraphReporting, POGGDatasetReporting, POGGEvaluationCache, POGGRunCheckpoint
 from pogg.graph_to_SEMENT import POGGGraphConverter
+from pogg.ace_processing import POGGACEPool, POGGACEUtil
 
 
 #
@@ -114,7 +117,32 @@ from pogg.graph_to_SEMENT import POGGGraphConverter
 
 
 
+# converter and ACE pool held by each worker process when graphs are run in parallel (see POGGExperiment.run_experiment)
+_worker_graph_converter = None
+_worker_generator_pool = None
+
+
+def _initialize_graph_worker(composition_config, lexicon, memoize_subgraphs, cache_node_SEMENTs,
+                             generator_cmdargs, generator_pool_size):
+    global _worker_graph_converter, _worker_generator_pool
+    _worker_graph_converter = POGGGraphConverter(POGGCompositionConfig(composition_config), lexicon,
+                                                 memoize_subgraphs, cache_node_SEMENTs)
+    _worker_generator_pool = POGGACEPool(_worker_graph_converter.composition_config.grammar_location,
+                                         ace.ACEGenerator, generator_cmdargs, generator_pool_size)
+    # close the worker's ACE processes when the worker shuts down
+    mp_util.Finalize(None, _worker_generator_pool.close, exitpriority=10)
+
+
+def _run_graph_in_worker(graph_item):
+    graph_name, graph_dict = graph_item
+    return POGGExperiment.convert_and_generate_graph(_worker_graph_converter, _worker_generator_pool,
+                                                     graph_name, graph_dict)
+
+
 class POGGExperiment:
+    # flags passed to ACE when generating from a prepped SEMENT
+    generator_cmdargs = ['-r', 'root_frag']
+
     def __init__(self,
                  lexicon: POGGLexicon,
                  data_split: POGGDataSplit,
@@ -125,7 +153,9 @@ class POGGExperiment:
         self.data_split = data_split
         self.lexicon = lexicon
 
-        self.composition_config = POGGCompositionConfig(experiment_dict["composition_config"])
+        # kept as given so it can be passed to worker processes
+        self.composition_config_source = experiment_dict["composition_config"]
+        self.composition_config = POGGCompositionConfig(self.composition_config_source)
 
         self.experiment_name = experiment_dict["experiment_name"]
         self.SEMENT_processing = experiment_dict["SEMENT_processing"]
@@ -143,30 +173,153 @@ class POGGExperiment:
             self.graph_json_dir = Path(split_info["graph_json_dir"])
             self.graph_png_dir = Path(split_info["graph_png_dir"])
 
-        self.graph_converter = POGGGraphConverter(self.composition_config, self.lexicon)
+        # convert shared subgraphs only once (see POGGGraphConverter.convert_graph_to_SEMENT)
+        self.memoize_subgraphs = experiment_dict.get("memoize_subgraphs", False)
+        # reuse node SEMENTs across graphs (see POGGGraphConverter.convert_node_to_SEMENT)
+        self.cache_node_SEMENTs = experiment_dict.get("cache_node_SEMENTs", False)
+        self.graph_converter = POGGGraphConverter(self.composition_config, self.lexicon,
+                                                  self.memoize_subgraphs, self.cache_node_SEMENTs)
         self.evaluation = POGGEvaluation(self.experiment_name)
 
         self.sub_experiments = sub_experiments
 
-    def run_POGG_data_to_text_single_graph(self, graph_name, graph_dict):
-        graph_obj = graph_dict["graph"]
-        gold_outputs = graph_dict["gold_outputs"]
+        # pool of ACE generator processes, only open while run_experiment is running
+        self.generator_pool = None
+        self.generator_pool_size = experiment_dict.get("ace_generator_processes", 1)
+
+        # evaluations from earlier runs, reused while the graph, its lexicon entries, and the grammar are unchanged
+        self.result_cache = None
+        if experiment_dict.get("result_cache_dir"):
+            self.result_cache = POGGEvaluationCache(experiment_dict["result_cache_dir"])
+        # the parts of the cache key that are the same for every graph (see _get_result_cache_key)
+        self._result_cache_key_settings = None
+
+        # every finished graph is appended here, so a run that stops partway through can be resumed
+        # each entry holds the graph's result cache key, which hashes the graph's lexicon entries and JSON, so this costs
+        # a key per graph even without a result cache; "checkpoint": false turns it off for runs that won't be resumed
+        self.checkpoint = None
+        if experiment_dict.get("checkpoint", True):
+            self.checkpoint = POGGRunCheckpoint(Path(self.output_dir, f"{self.full_data_split_name}_eval", "run_checkpoint.jsonl"))
+        # graph name -> checkpoint entry for graphs finished before the run was resumed (see run_experiment)
+        self._checkpointed_entries = {}
+        # drop SEMENT objects once a graph is finished, only their strings are kept (see POGGGraphEvaluation.release_SEMENTs)
+        self.release_SEMENTs = experiment_dict.get("release_SEMENTs", False)
+
+    def create_generator_pool(self, pool_size=None):
+        """
+        Create a pool of long-lived ACE generator processes for this experiment's grammar.
+
+        Experiments that share a grammar can share the same pool (see `POGGExperimentsConfig.run_all_experiments`).
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `pool_size` | `int` | maximum number of ACE processes to keep open; uses the experiment's `ace_generator_processes` setting if not given | `None` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGACEPool` | pool of ACE generator processes |
+        """
+        if pool_size is None:
+            pool_size = self.generator_pool_size
+        return POGGACEPool(self.composition_config.grammar_location, ace.ACEGenerator,
+                           self.generator_cmdargs, pool_size)
 
+    def _find_sub_experiment_evaluation(self, graph_name, graph_dict):
         # try to find evaluation information from subexperiment
         if self.sub_experiments:
+            graph_hash = POGGDataSplit.get_graph_hash(graph_dict)
+            json_digest = POGGDataSplit.get_graph_json_digest(graph_dict)
             for sub_experiment in self.sub_experiments:
-                for sub_exp_graph_key, sub_exp_graph in sub_experiment.data_split.graphs.items():
-                    if graph_dict["graph_json"] == sub_exp_graph["graph_json"]:
+                # the hash finds the candidates, but only a graph with the same JSON (order included) gets the same result
+                for sub_exp_graph_key in sub_experiment.data_split.get_graph_names_by_hash(graph_hash):
+                    sub_exp_graph = sub_experiment.data_split.graphs[sub_exp_graph_key]
+                    if POGGDataSplit.get_graph_json_digest(sub_exp_graph) == json_digest:
                         print(
                             f"Found evaluation for {graph_name} in subexperiment {sub_experiment.full_data_split_name} ({sub_exp_graph_key})... copying...")
-                        graph_evaluation = sub_experiment.evaluation.graph_evaluations[sub_exp_graph_key]
-                        return graph_evaluation
+                        return sub_experiment.evaluation.graph_evaluations[sub_exp_graph_key]
+        return None
+
+    def _get_result_cache_key(self, graph_dict):
+        if self._result_cache_key_settings is None:
+            composition_config_source = self.composition_config_source
+            if isinstance(composition_config_source, (str, Path)) and os.path.isfile(composition_config_source):
+                # a path to the config file, so the contents matter rather than the path
+                composition_config_source = POGGACEUtil.grammar_fingerprint(composition_config_source)
+
+            self._result_cache_key_settings = {
+                "composition_config": composition_config_source,
+                "grammar": POGGACEUtil.grammar_fingerprint(self.composition_config.grammar_location),
+                "SEMI": POGGACEUtil.grammar_fingerprint(self.composition_config.SEMI_location),
+                "generator_cmdargs": self.generator_cmdargs,
+                "SEMENT_processing": self.SEMENT_processing,
+                "result_processing": self.result_processing,
+                # these change variable numbering in the SEMENT strings
+                "memoize_subgraphs": self.memoize_subgraphs,
+                "cache_node_SEMENTs": self.cache_node_SEMENTs,
+            }
+
+        # only the approved entries this graph uses affect its result
+        graph = graph_dict["graph"]
+        node_keys = sorted(set(props["lexicon_key"] for _, props in graph.nodes(data=True)))
+        edge_keys = sorted(set(props["lexicon_key"] for _, _, props in graph.edges(data=True)))
+        node_entries = {key: self.lexicon.node_entries[key].entry_in_dict_format if key in self.lexicon.node_entries else None
+                        for key in node_keys}
+        edge_entries = {key: self.lexicon.edge_entries[key].entry_in_dict_format if key in self.lexicon.edge_entries else None
+                        for key in edge_keys}
+
+        return POGGEvaluationCache.make_key({
+            "graph_hash": POGGDataSplit.get_graph_hash(graph_dict),
+            # the hash ignores the order of the nodes and edges, which decides the order the graph is converted in
+            "json_digest": POGGDataSplit.get_graph_json_digest(graph_dict),
+            "node_entries": node_entries,
+            "edge_entries": edge_entries,
+            **self._result_cache_key_settings,
+        })
+
+    def _find_existing_evaluation(self, graph_name, graph_dict):
+        # find an evaluation for the graph from the checkpoint of a resumed run, a sub-experiment, or the result cache
+        # also returns the graph's result cache key (if it was needed) so a new evaluation can be stored under it
+        if graph_name in self._checkpointed_entries:
+            print(f"Found {graph_name} in checkpoint... resuming...")
+            return POGGRunCheckpoint.create_graph_evaluation(self._checkpointed_entries[graph_name], graph_dict), None
+
+        graph_evaluation = self._find_sub_experiment_evaluation(graph_name, graph_dict)
+        if graph_evaluation is not None or self.result_cache is None:
+            return graph_evaluation, None
+
+        cache_key = self._get_result_cache_key(graph_dict)
+        graph_evaluation = self.result_cache.get(cache_key, graph_name, graph_dict)
+        if graph_evaluation is not None:
+            print(f"Found cached evaluation for {graph_name}... copying...")
+        return graph_evaluation, cache_key
+
+    @staticmethod
+    def convert_and_generate_graph(graph_converter, generator_pool, graph_name, graph_dict):
+        """
+        Convert a single graph to a SEMENT, generate text from it, and calculate the graph's evaluation metrics.
 
-        # if evaluation from a subexperiment was not found, proceed with conversion
+        Only uses the objects that are passed in, so it can run in a worker process with its own converter and ACE pool.
+
+        **Parameters**
+        | Parameter | Type | Description |
+        | --------- | ---- | ----------- |
+        | `graph_converter` | `POGGGraphConverter` | converter used for the graph-to-SEMENT conversion |
+        | `generator_pool` | `POGGACEPool` | pool of ACE generator processes; if `None`, a one-off generator process is started |
+        | `graph_name` | `str` | name of the graph |
+        | `graph_dict` | `dict` | graph information from the `POGGDataSplit` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGGraphEvaluation` | evaluation object with results of running the data-to-text algorithm on the given graph |
+        """
+        graph_obj = graph_dict["graph"]
         graph_evaluation = POGGGraphEvaluation(graph_name, graph_dict)
 
         # Perform graph -> SEMENT conversion and save result to evaluation object
-        sement = self.graph_converter.convert_graph_to_SEMENT(graph_obj, graph_evaluation, None)
+        sement = graph_converter.convert_graph_to_SEMENT(graph_obj, graph_evaluation, None)
         graph_evaluation.set_SEMENT(sement)
 
         # If SEMENT is created, perform English text generation
@@ -175,12 +328,16 @@ class POGGExperiment:
             collapsed_sement = SEMENTUtil.overwrite_eqs(sement)
             graph_evaluation.set_collapsed_SEMENT(collapsed_sement)
 
-            final_sement = self.graph_converter.semantic_algebra.prepare_for_generation(sement)
+            final_sement = graph_converter.semantic_algebra.prepare_for_generation(sement)
             graph_evaluation.set_prepped_SEMENT(final_sement)
 
-            with ace.ACEGenerator(self.graph_converter.composition_config.grammar_location, ['-r', 'root_frag']) as generator:
-                response = generator.interact(graph_evaluation.prepped_SEMENT_string)
-                results = response.results()
+            if generator_pool is not None:
+                response = generator_pool.interact(graph_evaluation.prepped_SEMENT_string)
+            else:
+                # one-off call outside of run_experiment
+                with ace.ACEGenerator(graph_converter.composition_config.grammar_location, list(POGGExperiment.generator_cmdargs)) as generator:
+                    response = generator.interact(graph_evaluation.prepped_SEMENT_string)
+            results = response.results()
 
             # Store results in evaluation object
             for r in results:
@@ -191,13 +348,205 @@ class POGGExperiment:
 
         return graph_evaluation
 
+    def run_POGG_data_to_text_single_graph(self, graph_name, graph_dict):
+        graph_evaluation, cache_key = self._find_existing_evaluation(graph_name, graph_dict)
+        if graph_evaluation is not None:
+            return graph_evaluation
+
+        # if evaluation from a subexperiment or the cache was not found, proceed with conversion
+        graph_evaluation = self.convert_and_generate_graph(self.graph_converter, self.generator_pool, graph_name, graph_dict)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, graph_evaluation)
+        return graph_evaluation
 
-    def run_experiment(self):
+    def _run_graphs_in_this_process(self, generator_pool, graph_items):
+        owns_generator_pool = generator_pool is None
+        self.generator_pool = generator_pool if generator_pool is not None else self.create_generator_pool()
+
+        try:
+            for i, graph_tuple in enumerate(graph_items):
+                graph_name = graph_tuple[0]
+                graph_dict = graph_tuple[1]
+                print(f"Converting {graph_name} (graph {i + 1} of {len(graph_items)}; so far {self.evaluation.get_progress_summary()})...")
+
+                # convert graph, get eval obj back
+                graph_evaluation = self.run_POGG_data_to_text_single_graph(graph_name, graph_dict)
+
+                self._add_graph_evaluation(graph_name, graph_dict, graph_evaluation)
+        finally:
+            # only close the pool if it was opened for this run
+            if owns_generator_pool:
+                self.generator_pool.close()
+            self.generator_pool = None
+
+    def _run_graphs_in_worker_processes(self, workers, graph_items):
+        graph_evaluations = {}
+
+        # index in graph_items of the next graph to add to POGGEvaluation
+        next_graph = 0
+
+        # reuse sub-experiment and cached results here, only send the rest to the workers
+        graphs_to_convert = []
+        cache_keys = {}
+        for graph_name, graph_dict in graph_items:
+            graph_evaluation, cache_key = self._find_existing_evaluation(graph_name, graph_dict)
+            if graph_evaluation is not None:
+                graph_evaluations[graph_name] = graph_evaluation
+            else:
+                graphs_to_convert.append((graph_name, graph_dict))
+                cache_keys[graph_name] = cache_key
+
+        next_graph = self._add_graph_evaluations_in_order(graph_items, graph_evaluations, next_graph)
+
+        if graphs_to_convert:
+            chunksize = max(1, len(graphs_to_convert) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_graph_worker,
+                                     initargs=(self.composition_config_source, self.lexicon, self.memoize_subgraphs,
+                                               self.cache_node_SEMENTs, self.generator_cmdargs, self.generator_pool_size)) as executor:
+                # map yields results in submission order, so the merge below is deterministic
+                worker_results = executor.map(_run_graph_in_worker, graphs_to_convert, chunksize=chunksize)
+                for i, ((graph_name, graph_dict), graph_evaluation) in enumerate(zip(graphs_to_convert, worker_results)):
+                    # point back at this process's graph objects instead of the copies sent back by the worker
+                    graph_evaluation.graph = graph_dict["graph"]
+                    graph_evaluation.graph_json = graph_dict["graph_json"]
+                    graph_evaluations[graph_name] = graph_evaluation
+                    if cache_keys[graph_name] is not None:
+                        self.result_cache.put(cache_keys[graph_name], graph_evaluation)
+
+                    next_graph = self._add_graph_evaluations_in_order(graph_items, graph_evaluations, next_graph)
+                    print(f"Converted {graph_name} (graph {i + 1} of {len(graphs_to_convert)} sent to {workers} workers; so far {self.evaluation.get_progress_summary()})...")
+
+        # add whatever is left, i.e. reused results after the last converted graph
+        self._add_graph_evaluations_in_order(graph_items, graph_evaluations, next_graph)
+
+    def _add_graph_evaluations_in_order(self, graph_items, graph_evaluations, next_graph):
+        # add finished evaluations in data split order
+        # stops at the first graph that isn't finished yet and returns its index, so adding can pick up there later
+        while next_graph < len(graph_items) and graph_items[next_graph][0] in graph_evaluations:
+            graph_name, graph_dict = graph_items[next_graph]
+            self._add_graph_evaluation(graph_name, graph_dict, graph_evaluations.pop(graph_name))
+            next_graph += 1
+        return next_graph
+
+    def _add_graph_evaluation(self, graph_name, graph_dict, graph_evaluation):
+        # graphs resumed from the checkpoint are already in it
+        if self.checkpoint is not None and graph_name not in self._checkpointed_entries:
+            self.checkpoint.add(graph_name, self._get_result_cache_key(graph_dict), graph_evaluation)
+        if self.release_SEMENTs:
+            graph_evaluation.release_SEMENTs()
+
+        # add to POGGEvaluation, replacing the graph's old evaluation when rerunning
+        self.evaluation.add_graph(graph_name, graph_evaluation)
+
+    def _open_checkpoint(self, resume):
+        self._checkpointed_entries = {}
+        if self.checkpoint is None:
+            if resume:
+                print(f"Checkpointing is turned off for {self.experiment_name}... running every graph...")
+            return
+        if resume:
+            for graph_name, entry in self.checkpoint.read().items():
+                # only reuse graphs whose content, lexicon entries, and run settings haven't changed since they were checkpointed
+                if graph_name in self.data_split.graphs and \
+                        entry.get("cache_key") == self._get_result_cache_key(self.data_split.graphs[graph_name]):
+                    self._checkpointed_entries[graph_name] = entry
+            print(f"Resuming with {len(self._checkpointed_entries)} of {len(self.data_split.graphs)} graphs already finished...")
+        self.checkpoint.open(resume)
+
+    def _close_checkpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        self._checkpointed_entries = {}
+
+    def run_experiment(self, generator_pool: POGGACEPool = None, workers: int = 1, resume: bool = False):
         """
         Run the POGG data-to-text algorithm on a dataset.
+
+        If no `generator_pool` is given, one is opened for this run and closed when the run finishes.
+        If `workers` is more than 1, graphs are converted in a pool of worker processes,
+        each with its own `POGGGraphConverter` and ACE generator processes.
+
+        Each graph is appended to a checkpoint file (`run_checkpoint.jsonl` in the experiment's evaluation directory) as soon as it's finished.
+        With `resume`, graphs already in the checkpoint file are read from it instead of being run again,
+        as long as neither the graph nor the lexicon entries and run settings its result depends on have changed since.
+        Checking that means working out each graph's result cache key, so an experiment with `"checkpoint": false`
+        skips the checkpoint file and the keys (unless it has a `result_cache_dir`), and can't be resumed.
+
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `generator_pool` | `POGGACEPool` | shared pool of ACE generator processes to use | `None` |
+        | `workers` | `int` | number of worker processes to convert graphs in | `1` |
+        | `resume` | `bool` | whether to continue from the checkpoint of an earlier run that didn't finish | `False` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGEvaluation` | evaluation object with results for every graph in the data split |
+        """
+
+        self._set_run_metadata()
+
+        self._open_checkpoint(resume)
+        try:
+            if workers > 1:
+                self._run_graphs_in_worker_processes(workers, list(self.data_split.graphs.items()))
+            else:
+                # a view, so each graph is only loaded when its turn comes
+                self._run_graphs_in_this_process(generator_pool, self.data_split.graphs.items())
+        finally:
+            self._close_checkpoint()
+
+        # Calculate metrics for full dataset
+        self.evaluation.calculate_metrics()
+        return self.evaluation
+
+    def rerun_affected(self, previous_evaluation: POGGEvaluation, changed_keys,
+                       generator_pool: POGGACEPool = None, workers: int = 1):
         """
+        Rerun only the graphs that use lexicon entries that changed since `previous_evaluation` was made,
+        and update its dataset metrics for the new results (see `POGGEvaluation.add_graph`) instead of recalculating them over every graph.
+
+        Graphs in the data split that `previous_evaluation` has no evaluation for are run as well.
+        For an experiment with sub-experiments, rerun the sub-experiments first, since graph evaluations are copied from them.
 
-        # 0. store run metadata
+        **Parameters**
+        | Parameter | Type | Description | Default |
+        | --------- | ---- | ----------- | ------- |
+        | `previous_evaluation` | `POGGEvaluation` | evaluation from an earlier run of this experiment, e.g. `experiment.evaluation` or one read with `POGGEvaluation.read_from_directory`; it is updated in place |
+        | `changed_keys` | iterable of `str` | node and edge lexicon keys whose entries changed, e.g. as returned by `POGGLexicon.update_lexicon_files` | -- |
+        | `generator_pool` | `POGGACEPool` | shared pool of ACE generator processes to use | `None` |
+        | `workers` | `int` | number of worker processes to convert graphs in | `1` |
+
+        **Returns**
+        | Type | Description |
+        | ---- | ----------- |
+        | `POGGEvaluation` | `previous_evaluation`, updated with the results of the rerun graphs |
+        """
+        affected_graph_names = set(self.data_split.get_graphs_using_lexicon_keys(changed_keys))
+        # only the graphs that are rerun are loaded
+        graph_items = [(graph_name, self.data_split.graphs[graph_name]) for graph_name in self.data_split.graphs
+                       if graph_name in affected_graph_names or graph_name not in previous_evaluation.graph_evaluations]
+
+        self.evaluation = previous_evaluation
+        self._set_run_metadata()
+
+        print(f"Rerunning {len(graph_items)} of {len(self.data_split.graphs)} graphs affected by changed lexicon entries...")
+        # the rerun graphs are appended to the checkpoint; when it's read, their new lines replace the old ones
+        if self.checkpoint is not None:
+            self.checkpoint.open(resume=True)
+        try:
+            if workers > 1:
+                self._run_graphs_in_worker_processes(workers, graph_items)
+            elif graph_items:
+                self._run_graphs_in_this_process(generator_pool, graph_items)
+        finally:
+            self._close_checkpoint()
+
+        return self.evaluation
+
+    def _set_run_metadata(self):
+        # store run metadata
         now = datetime.datetime.now()
         self.evaluation.run_id = now.strftime("%m%d%Y_%H%M%S")
         self.evaluation.dataset_location = self.data_dir
@@ -214,21 +563,6 @@ class POGGExperiment:
             [method_name for method_name in dir(SemanticComposition)
                 if callable(getattr(SemanticComposition, method_name)) and not re.match("__.*__", method_name)])
 
-        for i, graph_tuple in enumerate(self.data_split.graphs.items()):
-            graph_name = graph_tuple[0]
-            graph_dict = graph_tuple[1]
-            print(f"Converting {graph_name} (graph {i + 1} of {len(self.data_split.graphs)})...")
-
-            # convert graph, get eval obj back
-            graph_evaluation = self.run_POGG_data_to_text_single_graph(graph_name, graph_dict)
-
-            # add to POGGEvaluation
-            self.evaluation.add_graph(graph_name, graph_evaluation)
-
-        # Calculate metrics for full dataset
-        self.evaluation.calculate_metrics()
-        return self.evaluation
-
 
     def store_evaluation_report(self):
         """
@@ -345,7 +679,7 @@ class POGGExperiment:
             if graph_evaluation.edge_inclusion == 1.0:
                 graph_notes[graph_name]["tags"]["full_edge_inclusion"] = ""
 
-            if graph_evaluation.generated_SEMENT is None:
+            if graph_evaluation.generated_SEMENT_string is None:
                 graph_notes[graph_name]["tags"]["no_SEMENT"] = ""
             else:
                 graph_notes[graph_name]["tags"]["generated_SEMENT"] = ""
@@ -534,7 +868,7 @@ class POGGExperiment:
 
 
 class POGGExperimentsConfig:
-    def __init__(self, experiment_config_path: Path | str, run_name: str=None):
+    def __init__(self, experiment_config_path: Path | str, run_name: str=None, resume: bool=False):
         with open(experiment_config_path, "r") as f:
             config_json = json.load(f)
             # dump back to string and do EXPERIMENT_RUN_PLACEHOLDER replacement
@@ -545,7 +879,8 @@ class POGGExperimentsConfig:
             else:
                 anchor = config_json["evaluation_run_anchor"]
                 anchor = anchor.replace("EXPERIMENT_RUN_PLACEHOLDER", run_name)
-                if os.path.isdir(anchor):
+                # when resuming, the earlier run's directory is the one to use
+                if os.path.isdir(anchor) and not resume:
                     non_existent = False
                     counter = 1
                     while not non_existent:
@@ -663,10 +998,20 @@ class POGGExperimentsConfig:
         return experiments
 
 
-    def run_all_experiments(self):
+    def run_all_experiments(self, workers=1, resume=False):
         experiments = self.get_all_experiments()
 
-        for i, experiment in enumerate(experiments):
-            print(f"Running {experiment.full_data_split_name}__{experiment.experiment_name} (experiment {i + 1} of {len(experiments)})...")
-            experiment.run_experiment()
-            experiment.store_evaluation_report()
\ No newline at end of file
+        # experiments with the same grammar share one pool of ACE generator processes
+        generator_pools = {}
+        try:
+            for i, experiment in enumerate(experiments):
+                print(f"Running {experiment.full_data_split_name}__{experiment.experiment_name} (experiment {i + 1} of {len(experiments)})...")
+                pool_key = (experiment.composition_config.grammar_location, tuple(experiment.generator_cmdargs))
+                if pool_key not in generator_pools:
+                    generator_pools[pool_key] = experiment.create_generator_pool()
+
+                experiment.run_experiment(generator_pools[pool_key], workers, resume)
+                experiment.store_evaluation_report()
+        finally:
+            for generator_pool in generator_pools.values():
+                generator_pool.close()
\ No newline at end of file
@@ -0,0 +1,162 @@
+import re
+import itertools
+
+import networkx as nx
+
+from pogg_semantics.my_delphin import sementcodecs
+from pogg_semantics.semantic_composition import SEMENTUtil
+
+from pogg.graph_to_SEMENT import POGGGraphConverter, POGGCallPlan
+from pogg.graph_to_SEMENT import _graph_to_SEMENT
+
+
+class _FakeSemanticComposition:
+    # lets the converter be created without a composition config, nodes and edges are converted by the stand-ins below
+    def __init__(self, composition_config):
+        self.composition_config = composition_config
+        self.semantic_algebra = None
+
+
+def _diamond_graph():
+    # cake and frosting both contain butter, so butter has two parents
+    graph = nx.DiGraph()
+    for node in ["cake", "frosting", "batter", "butter"]:
+        graph.add_node(node, lexicon_key=node)
+    for parent, child in [("cake", "batter"), ("cake", "frosting"), ("batter", "butter"), ("frosting", "butter")]:
+        graph.add_edge(parent, child, lexicon_key=f"{parent}_{child}")
+    return graph
+
+
+class _FakeLexicon:
+    # every node key has an entry, and its call plan is just the key (see the run_call_plan stand-in below)
+    def __init__(self):
+        self.version = 0
+        self.node_entries = {}
+
+    def get_call_plan(self, entry_type, lexicon_key):
+        self.node_entries.setdefault(lexicon_key, object())
+        return lexicon_key
+
+
+def _get_variables(sement):
+    return set(re.findall(r"\b[hexiup]\d+\b", sementcodecs.encode(sement)))
+
+
+def _make_SEMENT(predicate_name, variable_numbers):
+    # numbers variables the way the semantic algebra does, counting up across every SEMENT it builds
+    label, index = next(variable_numbers), next(variable_numbers)
+    return sementcodecs.decode(f"[ TOP: h{label} INDEX: x{index} "
+                               f"RELS: < [ _{predicate_name}_n_1 LBL: h{label} ARG0: x{index} ] > ]")
+
+
+def _make_converter(monkeypatch, memoize_subgraphs):
+    monkeypatch.setattr(_graph_to_SEMENT, "SemanticComposition", _FakeSemanticComposition)
+    converter = POGGGraphConverter(None, memoize_subgraphs=memoize_subgraphs)
+    node_calls = []
+    composed = []
+    variable_numbers = itertools.count(1)
+
+    def convert_node_to_SEMENT(node, node_evaluation=None, use_SEMENT_cache=False):
+        node_calls.append(node[0])
+        return _make_SEMENT(node[0], variable_numbers)
+
+    def convert_edge_to_SEMENT(edge, parent_sement, child_sement, edge_evaluation=None):
+        # record what each edge composes, the parent's SEMENT stands in for the composition
+        composed.append((edge["lexicon_key"], child_sement))
+        return parent_sement
+
+    monkeypatch.setattr(converter, "convert_node_to_SEMENT", convert_node_to_SEMENT)
+    monkeypatch.setattr(converter, "convert_edge_to_SEMENT", convert_edge_to_SEMENT)
+    return converter, node_calls, composed
+
+
+def test_diamond_graph_converts_shared_node_per_parent(monkeypatch):
+    converter, node_calls, composed = _make_converter(monkeypatch, memoize_subgraphs=False)
+
+    converter.convert_graph_to_SEMENT(_diamond_graph())
+
+    assert node_calls == ["cake", "batter", "butter", "frosting", "butter"]
+    assert [edge for edge, _ in composed] == ["batter_butter", "cake_batter", "frosting_butter", "cake_frosting"]
+
+
+def test_diamond_graph_memoized_matches_unmemoized(monkeypatch):
+    converter, node_calls, composed = _make_converter(monkeypatch, memoize_subgraphs=False)
+    converter.convert_graph_to_SEMENT(_diamond_graph())
+    memo_converter, memo_node_calls, memo_composed = _make_converter(monkeypatch, memoize_subgraphs=True)
+    memo_converter.convert_graph_to_SEMENT(_diamond_graph())
+
+    # the shared node is only converted for its first parent
+    assert memo_node_calls == ["cake", "batter", "butter", "frosting"]
+
+    # every edge composes the same child SEMENT either way, apart from the variable names
+    assert [edge for edge, _ in memo_composed] == [edge for edge, _ in composed]
+    for (_, child_sement), (_, memo_child_sement) in zip(composed, memo_composed):
+        assert SEMENTUtil.is_sement_isomorphic(child_sement, memo_child_sement)
+
+    # the copy handed to the second parent shares no variables or handles with the first
+    butter_SEMENTs = [child_sement for edge, child_sement in memo_composed if edge.endswith("_butter")]
+    assert len(butter_SEMENTs) == 2
+    assert _get_variables(butter_SEMENTs[0]).isdisjoint(_get_variables(butter_SEMENTs[1]))
+
+
+def test_cached_node_SEMENTs_have_fresh_variables(monkeypatch):
+    monkeypatch.setattr(_graph_to_SEMENT, "SemanticComposition", _FakeSemanticComposition)
+    converter = POGGGraphConverter(None, _FakeLexicon(), cache_node_SEMENTs=True)
+    built = []
+    composed = []
+    variable_numbers = itertools.count(1)
+
+    def run_call_plan(call_plan):
+        built.append(call_plan)
+        return _make_SEMENT(call_plan, variable_numbers)
+
+    def convert_edge_to_SEMENT(edge, parent_sement, child_sement, edge_evaluation=None):
+        composed.append(child_sement)
+        return parent_sement
+
+    monkeypatch.setattr(converter, "run_call_plan", run_call_plan)
+    monkeypatch.setattr(converter, "convert_edge_to_SEMENT", convert_edge_to_SEMENT)
+
+    # butter is in both graphs, and twice in the second one
+    first_graph = nx.DiGraph()
+    first_graph.add_node("cake", lexicon_key="cake")
+    first_graph.add_node("butter", lexicon_key="butter")
+    first_graph.add_edge("cake", "butter", lexicon_key="contains")
+    second_graph = nx.DiGraph()
+    second_graph.add_node("frosting", lexicon_key="frosting")
+    for node in ["butter1", "butter2"]:
+        second_graph.add_node(node, lexicon_key="butter")
+        second_graph.add_edge("frosting", node, lexicon_key="contains")
+
+    converter.convert_graph_to_SEMENT(first_graph)
+    converter.convert_graph_to_SEMENT(second_graph)
+
+    # butter's SEMENT is only built once
+    assert built == ["cake", "butter", "frosting"]
+    # and each node gets a copy with its own variables and handles
+    assert len(composed) == 3
+    for i, sement in enumerate(composed):
+        assert SEMENTUtil.is_sement_isomorphic(sement, composed[0])
+        for other_sement in composed[i + 1:]:
+            assert _get_variables(sement).isdisjoint(_get_variables(other_sement))
+
+
+def test_call_plan_mutable_literals_are_deep_copied(monkeypatch):
+    monkeypatch.setattr(_graph_to_SEMENT, "SemanticComposition", _FakeSemanticComposition)
+    converter = POGGGraphConverter(None)
+    variable_properties = {"x": {"NUM": "sg"}}
+    passed = []
+
+    def add_property(properties):
+        # a composition function that changes what it's given
+        properties["x"]["NUM"] = "pl"
+        passed.append(properties)
+
+    monkeypatch.setattr(converter, "_get_comp_fxn", lambda comp_fxn_name: add_property)
+    call_plan = POGGCallPlan("add_property", (("properties", POGGCallPlan.MUTABLE_LITERAL, variable_properties),))
+    converter.run_call_plan(call_plan)
+    converter.run_call_plan(call_plan)
+
+    # the plan's value, nested dicts included, is the same for every call
+    assert variable_properties == {"x": {"NUM": "sg"}}
+    assert passed[0]["x"] is not passed[1]["x"]
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from pogg.data_handling import POGGDataSplit, POGGPackedSplit
+
+
+def _graph_json(node_name):
+    # lexicon keys are given, since the packed file fills in any that are left out
+    return {
+        "nodes": {
+            node_name: {"lexicon_key": node_name, "node_properties": {"node_type": "entity", "root": "root"}},
+            "red": {"lexicon_key": "red", "node_properties": {"node_type": "property"}},
+        },
+        "edges": [
+            {"edge_name": "color", "parent_node": node_name, "child_node": "red", "lexicon_key": "color",
+             "edge_properties": {"edge_type": "property"}},
+        ],
+        "gold_outputs": [f"red {node_name}"],
+    }
+
+
+def test_pack_directory_round_trip_keeps_graphs_with_the_same_name_prefix(tmp_path):
+    graph_dir = tmp_path / "graphs"
+    graph_dir.mkdir()
+    graph_jsons = {"a.json": _graph_json("car"), "a.v2.json": _graph_json("bike"), "b.json": _graph_json("bus")}
+    for file_name, graph_json in graph_jsons.items():
+        with open(graph_dir / file_name, "w") as f:
+            json.dump(graph_json, f)
+
+    pack_path = tmp_path / "graphs.poggpack"
+    assert POGGPackedSplit.pack_directory(graph_dir, pack_path) == 3
+
+    packed_split = POGGPackedSplit(pack_path)
+    try:
+        assert sorted(packed_split.get_graph_names()) == ["a", "a.v2", "b"]
+        for graph_name in packed_split.get_graph_names():
+            assert packed_split.get_graph_json(graph_name) == graph_jsons[f"{graph_name}.json"]
+    finally:
+        packed_split.close()
+
+    # a split reading the packed file names its graphs the same way as one reading the directory
+    assert list(POGGDataSplit("test", [pack_path]).graphs) == list(POGGDataSplit("test", [graph_dir]).graphs)
+
+
+def test_write_rejects_duplicate_graph_names(tmp_path):
+    with pytest.raises(ValueError):
+        POGGPackedSplit.write(tmp_path / "graphs.poggpack", [("a", _graph_json("car")), ("a", _graph_json("bike"))])
@@ -0,0 +1,104 @@
+import json
+from types import SimpleNamespace
+
+from pogg.pogg_routine import POGGExperiment
+from pogg.data_handling import POGGDataSplit
+from pogg.evaluation import POGGEvaluation, POGGGraphEvaluation, POGGEvaluationCache, POGGRunCheckpoint
+
+
+def _graph_json(edge_names):
+    nodes = {"car": {"lexicon_key": "car", "node_properties": {"node_type": "entity", "root": "root"}}}
+    edges = []
+    for edge_name in edge_names:
+        nodes[edge_name] = {"lexicon_key": edge_name, "node_properties": {"node_type": "property"}}
+        edges.append({"edge_name": edge_name, "parent_node": "car", "child_node": edge_name, "lexicon_key": edge_name,
+                      "edge_properties": {"edge_type": "property"}})
+    return {"nodes": nodes, "edges": edges, "gold_outputs": ["big red car"]}
+
+
+def _load_split(tmp_path, split_name, graph_json):
+    graph_dir = tmp_path / split_name
+    graph_dir.mkdir()
+    with open(graph_dir / "car.json", "w") as f:
+        json.dump(graph_json, f)
+    return POGGDataSplit(split_name, [graph_dir])
+
+
+def _load_graph(tmp_path, split_name, graph_json):
+    data_split = _load_split(tmp_path, split_name, graph_json)
+    graph_name = next(iter(data_split.graphs))
+    return graph_name, data_split.graphs[graph_name]
+
+
+def _make_experiment():
+    # only what _get_result_cache_key reads, with the per-experiment settings already worked out
+    experiment = POGGExperiment.__new__(POGGExperiment)
+    experiment.lexicon = SimpleNamespace(node_entries={}, edge_entries={})
+    experiment._result_cache_key_settings = {}
+    return experiment
+
+
+def test_reordered_edges_miss_the_result_cache(tmp_path):
+    experiment = _make_experiment()
+    graph_name, graph_dict = _load_graph(tmp_path, "first", _graph_json(["red", "big"]))
+    same_graph_name, same_graph_dict = _load_graph(tmp_path, "same", _graph_json(["red", "big"]))
+    reordered_graph_name, reordered_graph_dict = _load_graph(tmp_path, "reordered", _graph_json(["big", "red"]))
+    # the content hash can't tell them apart
+    assert POGGDataSplit.get_graph_hash(graph_dict) == POGGDataSplit.get_graph_hash(reordered_graph_dict)
+
+    result_cache = POGGEvaluationCache(tmp_path / "cache")
+    result_cache.put(experiment._get_result_cache_key(graph_dict), POGGGraphEvaluation(graph_name, graph_dict))
+
+    # the same JSON gets the cached evaluation, but the edges' order decides the conversion order, so reordering them doesn't
+    assert result_cache.get(experiment._get_result_cache_key(same_graph_dict), same_graph_name, same_graph_dict) is not None
+    assert result_cache.get(experiment._get_result_cache_key(reordered_graph_dict),
+                            reordered_graph_name, reordered_graph_dict) is None
+
+
+def _checkpoint_and_resume(tmp_path, graph_json):
+    # checkpoint the graph with red before big, then resume after its file is replaced with the given JSON
+    experiment = _make_experiment()
+    experiment.experiment_name = "test"
+    experiment.evaluation = POGGEvaluation("test")
+    experiment.release_SEMENTs = False
+    experiment.checkpoint = POGGRunCheckpoint(tmp_path / "run_checkpoint.jsonl")
+    experiment.data_split = _load_split(tmp_path, "split", _graph_json(["red", "big"]))
+    experiment._open_checkpoint(resume=False)
+    for graph_name, graph_dict in experiment.data_split.graphs.items():
+        experiment._add_graph_evaluation(graph_name, graph_dict, POGGGraphEvaluation(graph_name, graph_dict))
+    experiment._close_checkpoint()
+
+    with open(tmp_path / "split" / "car.json", "w") as f:
+        json.dump(graph_json, f)
+    experiment.data_split = POGGDataSplit("split", [tmp_path / "split"])
+    experiment._open_checkpoint(resume=True)
+    resumed = list(experiment._checkpointed_entries)
+    experiment._close_checkpoint()
+    return resumed
+
+
+def test_reordered_edges_are_not_resumed_from_the_checkpoint(tmp_path):
+    (tmp_path / "same").mkdir()
+    (tmp_path / "reordered").mkdir()
+    assert len(_checkpoint_and_resume(tmp_path / "same", _graph_json(["red", "big"]))) == 1
+    assert _checkpoint_and_resume(tmp_path / "reordered", _graph_json(["big", "red"])) == []
+
+
+def test_no_checkpoint_skips_the_cache_keys(tmp_path, monkeypatch):
+    experiment = _make_experiment()
+    experiment.experiment_name = "test"
+    experiment.evaluation = POGGEvaluation("test")
+    experiment.release_SEMENTs = False
+    experiment.checkpoint = None
+    experiment.data_split = _load_split(tmp_path, "split", _graph_json(["red", "big"]))
+
+    def get_result_cache_key(graph_dict):
+        raise AssertionError("no cache key is needed without a checkpoint or result cache")
+
+    monkeypatch.setattr(experiment, "_get_result_cache_key", get_result_cache_key)
+    experiment._open_checkpoint(resume=True)
+    for graph_name, graph_dict in experiment.data_split.graphs.items():
+        experiment._add_graph_evaluation(graph_name, graph_dict, POGGGraphEvaluation(graph_name, graph_dict))
+    experiment._close_checkpoint()
+
+    assert list(experiment.evaluation.graph_evaluations) == list(experiment.data_split.graphs)